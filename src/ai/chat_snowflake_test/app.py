@@ -26,7 +26,12 @@ setup_streamlit_app(
 )
 logger.info('setup completed')
 
-test_connection()
-test_chat_snowflake_connection()
+@st.cache_resource
+def run_connection_tests():
+    """Run the startup connection checks once per server process, not on every rerun (each one logs in)."""
+    test_connection()
+    test_chat_snowflake_connection()
+
+run_connection_tests()
 
 display_streamlit_chat(st)
\ No newline at end of file
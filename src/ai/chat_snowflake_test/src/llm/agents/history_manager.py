@@ -0,0 +1,119 @@
+import os
+import logging
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage, SystemMessage
+from src.startup.session_pool import get_session_pool
+from src.llm.model import get_model
+
+
+# Setup logging for module
+logger = logging.getLogger(__name__)
+
+# Context window settings - override with environment variables
+HISTORY_TOKEN_BUDGET = int(os.getenv('CHAT_HISTORY_TOKEN_BUDGET', '6000'))  # Target size of summary + kept messages
+HISTORY_SUMMARY_TRIGGER = float(os.getenv('CHAT_HISTORY_SUMMARY_TRIGGER', '1.0'))  # Summarize once history exceeds this share of the budget
+HISTORY_KEEP_TURNS = int(os.getenv('CHAT_HISTORY_KEEP_TURNS', '4'))  # Most recent turns always kept verbatim (if they fit the budget)
+HISTORY_SUMMARY_TOKENS = int(os.getenv('CHAT_HISTORY_SUMMARY_TOKENS', '500'))  # Length the summary is asked to stay under
+
+CHARACTERS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token) - avoids a COUNT_TOKENS round trip per message.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return len(text) // CHARACTERS_PER_TOKEN + 1 if text else 0
+
+
+def _message_text(message: BaseMessage) -> str:
+    return message.content if isinstance(message.content, str) else str(message.content)
+
+
+def _history_tokens(messages: list[BaseMessage]) -> int:
+    return sum(estimate_tokens(_message_text(message)) for message in messages)
+
+
+def _fold_start_index(messages: list[BaseMessage], summary_tokens: int) -> int:
+    """Index of the first message to keep verbatim.
+
+    Keeps the last HISTORY_KEEP_TURNS turns (a turn starts at a HumanMessage), then drops whole turns from the
+    front while the result is still over budget - but never the latest turn.
+
+    Args:
+        messages: Conversation messages, oldest first
+        summary_tokens: Estimated size of the summary that will sit in front of the kept messages
+
+    Returns:
+        Index into messages; everything before it is folded into the summary
+    """
+    turn_starts = [index for index, message in enumerate(messages) if isinstance(message, HumanMessage)]
+    if not turn_starts:
+        return 0
+    kept_turn_starts = turn_starts[-HISTORY_KEEP_TURNS:] if HISTORY_KEEP_TURNS > 0 else turn_starts[-1:]
+    while len(kept_turn_starts) > 1 and summary_tokens + _history_tokens(messages[kept_turn_starts[0]:]) > HISTORY_TOKEN_BUDGET:
+        kept_turn_starts = kept_turn_starts[1:]
+    return kept_turn_starts[0]
+
+
+def _update_summary(summary: str, folded_messages: list[BaseMessage]) -> str:
+    """Fold messages into the running summary (only the new messages are sent, not the whole history).
+
+    Args:
+        summary: Current summary, empty on the first fold
+        folded_messages: Messages leaving the verbatim history
+
+    Returns:
+        Updated summary
+    """
+    transcript = '\n'.join([f'{message.type}: {_message_text(message)}' for message in folded_messages])
+    instructions = (
+        f'You maintain a running summary of a conversation between a user and an AI assistant. '
+        f'Update the summary with the new messages below, keeping facts, decisions, open questions and user preferences. '
+        f'Reply with the updated summary only, in under {HISTORY_SUMMARY_TOKENS * CHARACTERS_PER_TOKEN} characters.'
+    )
+    with get_session_pool().session() as session:
+        output = get_model(session).invoke([
+            SystemMessage(instructions),
+            HumanMessage(f'Current summary:\n{summary or "(none)"}\n\nNew messages:\n{transcript}')
+        ])
+    return output.content
+
+
+def history_manager(state) -> dict:
+    """Keep the conversation within the token budget before the agents see it.
+
+    Once summary + messages exceed HISTORY_SUMMARY_TRIGGER * HISTORY_TOKEN_BUDGET, the turns before the kept
+    ones are folded into state['summary'] and removed from state['messages']. Each fold only summarizes the
+    previous summary plus the newly dropped messages, so the cost doesn't grow with conversation length.
+
+    Args:
+        state: Current graph state containing messages and the optional running summary
+
+    Returns:
+        State update (empty when the history is within budget)
+    """
+    messages = state['messages']
+    summary = state.get('summary', '')
+    summary_tokens = estimate_tokens(summary)
+    history_tokens = summary_tokens + _history_tokens(messages)
+    if history_tokens <= HISTORY_SUMMARY_TRIGGER * HISTORY_TOKEN_BUDGET:
+        return {}
+
+    fold_start_index = _fold_start_index(messages, max(summary_tokens, HISTORY_SUMMARY_TOKENS))
+    folded_messages = messages[:fold_start_index]
+    if not folded_messages:
+        return {}
+
+    summary = _update_summary(summary, folded_messages)
+    logger.info(
+        f'Folded {len(folded_messages)} messages into the summary: ~{history_tokens} -> '
+        f'~{estimate_tokens(summary) + _history_tokens(messages[fold_start_index:])} tokens'
+    )
+    return {
+        'summary': summary,
+        'messages': [RemoveMessage(id=message.id) for message in folded_messages]
+    }
@@ -1,9 +1,10 @@
+import time
 from langgraph.types import Command
 from typing import Literal
 from langchain_core.messages import AIMessage, SystemMessage
-from snowflake.snowpark import Session
-from src.startup.connections import *
+from src.startup.session_pool import get_session_pool
 from src.llm.model import get_model
+from src.llm.response_cache import get_response_cache
 
 
 def test_agent(state) -> Command[Literal['__end__']]:
@@ -15,14 +16,20 @@ def test_agent(state) -> Command[Literal['__end__']]:
     Returns:
         Command to end the graph with a test AI message
     """
-    model, session = get_model()
-
-    messages = [
-        SystemMessage('You are a helpful AI assistant'),
-        *state['messages']
-    ]
-    output = model.invoke(messages)
-    session.close()
+    messages = [SystemMessage('You are a helpful AI assistant')]
+    if state.get('summary'):
+        messages.append(SystemMessage(f"Summary of the earlier conversation:\n{state['summary']}"))
+    messages.extend(state['messages'])
+    response_cache = get_response_cache()
+    with get_session_pool().session() as session:
+        cached_response = response_cache.lookup(session, messages) if response_cache else None
+        if cached_response is not None:
+            output = AIMessage(cached_response)
+        else:
+            start_time = time.perf_counter()
+            output = get_model(session).invoke(messages)
+            if response_cache:
+                response_cache.store(session, messages, output.content, time.perf_counter() - start_time)
 
     return Command(
         goto='__end__',
@@ -1,8 +1,17 @@
 import os
-from langchain_core.messages import HumanMessage
+import logging
+import time
+from langchain_core.messages import AIMessageChunk, HumanMessage
 from src.llm.graph import graph
 
 
+# Setup logging for module
+logger = logging.getLogger(__name__)
+
+# Graph nodes whose model calls are internal (e.g. summarization) and must not reach the chat
+UNSTREAMED_NODES = ['history_manager']
+
+
 def _display_message_history(streamlit_instance):
     """Display all past messages in the chat interface.
     
@@ -14,11 +23,42 @@ def _display_message_history(streamlit_instance):
             streamlit_instance.write(message['content'])
 
 
+def _stream_response_tokens(graph_state: dict, final_state: dict):
+    """Run the graph in streaming mode and yield the assistant's text tokens as they arrive.
+
+    LangGraph's 'messages' mode surfaces the model's token chunks from inside the agent nodes, while
+    'values' mode carries the full graph state after each step - the last one is saved to final_state
+    so the caller can persist it exactly like a graph.invoke() result. Time to first token is logged.
+
+    Args:
+        graph_state: Graph input state
+        final_state: Dict that receives the final graph state under 'values'
+
+    Yields:
+        str: Text chunks of the assistant response
+    """
+    start_time = time.perf_counter()
+    first_token_seconds = None
+    for stream_mode, chunk in graph.stream(graph_state, stream_mode=['messages', 'values']):
+        if stream_mode == 'values':
+            final_state['values'] = chunk
+            continue
+        message_chunk, metadata = chunk
+        if metadata.get('langgraph_node') in UNSTREAMED_NODES:
+            continue
+        if isinstance(message_chunk, AIMessageChunk) and isinstance(message_chunk.content, str) and message_chunk.content:
+            if first_token_seconds is None:
+                first_token_seconds = time.perf_counter() - start_time
+                logger.info(f'Time to first token: {first_token_seconds:.3f}s')
+            yield message_chunk.content
+    logger.info(f'Response completed in {time.perf_counter() - start_time:.3f}s')
+
+
 def _accept_user_input(streamlit_instance):
     """Accept user input, process through graph, and display assistant response.
     
-    Handles adding user message to state, invoking the graph for processing,
-    extracting results, and displaying the assistant's response.
+    Handles adding user message to state, streaming the graph's response tokens into the chat,
+    and saving the final graph state and assistant message.
     
     Args:
         streamlit_instance: Streamlit instance
@@ -31,18 +71,23 @@ def _accept_user_input(streamlit_instance):
         with streamlit_instance.chat_message('user'):
             streamlit_instance.write(user_input)
 
-        # Query graph
-        with streamlit_instance.spinner('Processing question'):
-            graph_result = graph.invoke(streamlit_instance.session_state.graph_state)
+        # Query graph, streaming tokens as the model produces them
+        final_state = {}
+        with streamlit_instance.chat_message('assistant'):
+            streamed_response = streamlit_instance.write_stream(_stream_response_tokens(streamlit_instance.session_state.graph_state, final_state))
+            graph_result = final_state['values']
+            assistant_response = graph_result['messages'][-1].content
+
+            # Models that don't stream produce no chunks - show the final message instead
+            if not streamed_response:
+                streamlit_instance.write(assistant_response)
 
         # Save off persistent keys
-        persistent_keys = ['messages']
+        persistent_keys = ['messages', 'summary']
         for key in persistent_keys:
-            streamlit_instance.session_state.graph_state[key] = graph_result[key]
-        assistant_response = graph_result['messages'][-1].content
-        with streamlit_instance.chat_message('assistant'):
-            streamlit_instance.write(assistant_response)
-        
+            if key in graph_result:
+                streamlit_instance.session_state.graph_state[key] = graph_result[key]
+
         # Add assistant response to history
         streamlit_instance.session_state.messages.append({'role': 'assistant', 'content': assistant_response})
 
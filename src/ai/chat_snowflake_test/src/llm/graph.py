@@ -1,7 +1,14 @@
 import streamlit as st
 from langgraph.graph import StateGraph, MessagesState, START, END
+from src.llm.agents.history_manager import history_manager
 from src.llm.agents.test_agent import test_agent
 
+
+class ChatState(MessagesState):
+    """Messages plus the running summary of turns folded out of them by history_manager."""
+    summary: str
+
+
 @st.cache_resource
 def build_graph():
     """Build and compile the LangGraph state graph with all agents and edges.
@@ -12,14 +19,16 @@ def build_graph():
         Compiled StateGraph instance ready for invocation
     """
     # Nodes
-    builder = StateGraph(state_schema=MessagesState)
+    builder = StateGraph(state_schema=ChatState)
     for node_name, node_function in [
+        ('history_manager', history_manager),
         ('test_agent', test_agent)
     ]:
         builder.add_node(node_name, node_function)
     
     # Edges
-    builder.add_edge(START, 'test_agent')
+    builder.add_edge(START, 'history_manager')
+    builder.add_edge('history_manager', 'test_agent')
     
     graph = builder.compile()
     return graph
@@ -1,25 +1,22 @@
 from snowflake.snowpark import Session
 from langchain_snowflake import ChatSnowflake
-from src.startup.connections import get_connection_params
 
 
-def get_model() -> tuple:
+def get_model(session: Session) -> ChatSnowflake:
     """Create and return a ChatSnowflake model instance.
 
+    Building the model is cheap - the expensive part is the session, which callers take from the
+    session pool (src.startup.session_pool) instead of logging in per message.
+
     Args:
-        session: Snowflake session to use for the model
+        session: Snowflake session to use for the model (warehouse already active)
 
     Returns:
-        tuple of ChatSnowflake, Session
+        ChatSnowflake instance
     """
-    session = Session.builder.configs(get_connection_params()).create()
-
-    # Explicitly activate the warehouse for Cortex calls
-    session.sql("USE WAREHOUSE container_warehouse").collect()
-
     model = ChatSnowflake(
         session=session,
         model="CLAUDE-3-7-SONNET",
         temperature=0.1
     )
-    return model, session
\ No newline at end of file
+    return model
@@ -0,0 +1,378 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import streamlit as st
+from langchain_core.messages import BaseMessage, HumanMessage
+
+
+# Setup logging for module
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = 'snowflake-arctic-embed-m-v1.5'
+EMBEDDING_DIMENSIONS = 768
+
+
+@dataclass
+class CacheEntry:
+    """One cached model response.
+
+    Attributes:
+        cache_key: Hash of context_hash + normalized prompt (exact-match tier)
+        context_hash: Hash of the system prompts and earlier messages - entries only match within one context
+        prompt: Normalized user prompt
+        response: Model response text
+        latency_seconds: How long the original model call took (what a hit saves)
+        embedding: Prompt embedding for the similarity tier (None when that tier is off)
+        created_at: Epoch seconds the entry was stored
+    """
+    cache_key: str
+    context_hash: str
+    prompt: str
+    response: str
+    latency_seconds: float
+    embedding: list[float] | None = None
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class CacheMetrics:
+    """Counters for a ResponseCache.
+
+    Attributes:
+        lookups: Cache lookups
+        exact_hits: Lookups answered by the exact-match tier
+        similar_hits: Lookups answered by the embedding-similarity tier
+        misses: Lookups that went to the model
+        stores: Responses stored
+        saved_seconds: Sum of the original model latency of every hit
+    """
+    lookups: int = 0
+    exact_hits: int = 0
+    similar_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    saved_seconds: float = 0.0
+
+
+class InMemoryCacheBackend:
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float | None = 86400):
+        """Process-local LRU cache with an optional TTL, shared by all users of the process.
+
+        Args:
+            max_entries: Least recently used entries beyond this are evicted
+            ttl_seconds: Entries older than this are ignored and evicted (None keeps them until LRU eviction)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_expired(self, entry: CacheEntry) -> bool:
+        return self.ttl_seconds is not None and time.time() - entry.created_at > self.ttl_seconds
+
+    def get(self, cache_key: str, session=None) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            if self._is_expired(entry):
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return entry
+
+    def most_similar(self, context_hash: str, embedding: list[float], session=None) -> tuple[CacheEntry | None, float]:
+        """Entry of the same context with the highest cosine similarity to embedding."""
+        with self._lock:
+            candidates = [
+                entry for entry in self._entries.values()
+                if entry.context_hash == context_hash and entry.embedding is not None and not self._is_expired(entry)
+            ]
+        if not candidates:
+            return None, 0.0
+        matrix = np.array([entry.embedding for entry in candidates])
+        query = np.array(embedding)
+        similarities = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query) + 1e-12)
+        best_index = int(np.argmax(similarities))
+        with self._lock:
+            if candidates[best_index].cache_key in self._entries:
+                self._entries.move_to_end(candidates[best_index].cache_key)
+        return candidates[best_index], float(similarities[best_index])
+
+    def put(self, entry: CacheEntry, session=None) -> None:
+        with self._lock:
+            self._entries[entry.cache_key] = entry
+            self._entries.move_to_end(entry.cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SnowflakeTableCacheBackend:
+    def __init__(
+        self,
+        table_name: str = 'chat_response_cache',
+        max_entries: int = 10000,
+        ttl_seconds: float | None = 86400,
+        evict_every: int = 100
+    ):
+        """Cache persisted in a Snowflake table, shared across app instances and restarts (opt-in, see get_response_cache).
+
+        Similarity search runs in Snowflake (VECTOR_COSINE_SIMILARITY), so embeddings never leave the warehouse.
+        Expired entries are filtered on read, so they never match; the DELETE that removes them, together with the
+        least recently hit entries beyond max_entries, only runs on every evict_every-th store instead of each one.
+        The table can therefore briefly exceed max_entries by up to evict_every entries per app instance.
+
+        Args:
+            table_name: Cache table (created if missing, in the session's current database and schema)
+            max_entries: Least recently hit entries beyond this are deleted by the periodic eviction
+            ttl_seconds: Entries older than this are ignored and deleted (None keeps them until evicted)
+            evict_every: Run the eviction DELETE once per this many stores
+        """
+        assert evict_every > 0, 'evict_every must be positive'
+        self.table_name = table_name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evict_every = evict_every
+        self._table_created = False
+        self._stores_since_eviction = 0
+        self._lock = threading.Lock()
+
+    def _ensure_table(self, session) -> None:
+        if self._table_created:
+            return
+        session.sql(f"""
+        CREATE TABLE IF NOT EXISTS {self.table_name} (
+            cache_key STRING,
+            context_hash STRING,
+            prompt STRING,
+            response STRING,
+            latency_seconds FLOAT,
+            embedding VECTOR(FLOAT, {EMBEDDING_DIMENSIONS}),
+            created_at TIMESTAMP_NTZ DEFAULT SYSDATE(),
+            last_hit_at TIMESTAMP_NTZ DEFAULT SYSDATE()
+        )""").collect()
+        self._table_created = True
+
+    def _fresh_filter(self) -> str:
+        return f'created_at > DATEADD(second, -{int(self.ttl_seconds)}, SYSDATE())' if self.ttl_seconds is not None else '1 = 1'
+
+    def _touch(self, session, cache_key: str) -> None:
+        session.sql(f'UPDATE {self.table_name} SET last_hit_at = SYSDATE() WHERE cache_key = ?', params=[cache_key]).collect()
+
+    @staticmethod
+    def _to_entry(row) -> CacheEntry:
+        return CacheEntry(row['CACHE_KEY'], row['CONTEXT_HASH'], row['PROMPT'], row['RESPONSE'], row['LATENCY_SECONDS'])
+
+    def get(self, cache_key: str, session=None) -> CacheEntry | None:
+        self._ensure_table(session)
+        rows = session.sql(f"""
+        SELECT cache_key, context_hash, prompt, response, latency_seconds
+        FROM {self.table_name}
+        WHERE cache_key = ? AND {self._fresh_filter()}
+        LIMIT 1
+        """, params=[cache_key]).collect()
+        if not rows:
+            return None
+        self._touch(session, cache_key)
+        return self._to_entry(rows[0])
+
+    def most_similar(self, context_hash: str, embedding: list[float], session=None) -> tuple[CacheEntry | None, float]:
+        self._ensure_table(session)
+        rows = session.sql(f"""
+        SELECT cache_key, context_hash, prompt, response, latency_seconds,
+            VECTOR_COSINE_SIMILARITY(embedding, PARSE_JSON(?)::ARRAY::VECTOR(FLOAT, {EMBEDDING_DIMENSIONS})) AS similarity
+        FROM {self.table_name}
+        WHERE context_hash = ? AND embedding IS NOT NULL AND {self._fresh_filter()}
+        ORDER BY similarity DESC
+        LIMIT 1
+        """, params=[json.dumps(embedding), context_hash]).collect()
+        if not rows:
+            return None, 0.0
+        self._touch(session, rows[0]['CACHE_KEY'])
+        return self._to_entry(rows[0]), float(rows[0]['SIMILARITY'])
+
+    def put(self, entry: CacheEntry, session=None) -> None:
+        self._ensure_table(session)
+        session.sql(f"""
+        MERGE INTO {self.table_name} target
+        USING (
+            SELECT ? AS cache_key, ? AS context_hash, ? AS prompt, ? AS response, ? AS latency_seconds,
+                PARSE_JSON(?)::ARRAY::VECTOR(FLOAT, {EMBEDDING_DIMENSIONS}) AS embedding
+        ) source
+        ON target.cache_key = source.cache_key
+        WHEN MATCHED THEN UPDATE SET
+            response = source.response, latency_seconds = source.latency_seconds, embedding = source.embedding,
+            created_at = SYSDATE(), last_hit_at = SYSDATE()
+        WHEN NOT MATCHED THEN INSERT (cache_key, context_hash, prompt, response, latency_seconds, embedding)
+            VALUES (source.cache_key, source.context_hash, source.prompt, source.response, source.latency_seconds, source.embedding)
+        """, params=[
+            entry.cache_key, entry.context_hash, entry.prompt, entry.response, entry.latency_seconds,
+            json.dumps(entry.embedding) if entry.embedding is not None else None
+        ]).collect()
+
+        with self._lock:
+            self._stores_since_eviction += 1
+            evict = self._stores_since_eviction >= self.evict_every
+            if evict:
+                self._stores_since_eviction = 0
+        if evict:
+            self._evict(session)
+
+    def _evict(self, session) -> None:
+        """Delete expired and least recently hit entries."""
+        session.sql(f"""
+        DELETE FROM {self.table_name}
+        WHERE NOT ({self._fresh_filter()})
+        OR cache_key IN (
+            SELECT cache_key FROM {self.table_name}
+            QUALIFY ROW_NUMBER() OVER (ORDER BY last_hit_at DESC) > {int(self.max_entries)}
+        )""").collect()
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case, whitespace and trailing punctuation insensitive form of a prompt for the exact-match tier."""
+    return re.sub(r'\s+', ' ', prompt).strip().lower().rstrip('?!. ')
+
+
+def _message_text(message: BaseMessage) -> str:
+    return message.content if isinstance(message.content, str) else json.dumps(message.content, sort_keys=True)
+
+
+class ResponseCache:
+    def __init__(self, backend, similarity_threshold: float | None = None):
+        """Cache of model responses in front of model.invoke().
+
+        Two tiers: an exact match on the normalized last user prompt, and (when similarity_threshold is set) the
+        most similar earlier prompt by Cortex embedding, if its cosine similarity reaches the threshold. Both only
+        match entries with the same context - a hash of the system prompts (including the history summary) and
+        all earlier messages - so a cached answer is only reused where it was given to the same conversation
+        state, e.g. the opening question of any chat.
+
+        Args:
+            backend: InMemoryCacheBackend or SnowflakeTableCacheBackend
+            similarity_threshold: Minimum cosine similarity for the similarity tier (None disables it)
+        """
+        self.backend = backend
+        self.similarity_threshold = similarity_threshold
+        self._metrics = CacheMetrics()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _split(messages: list[BaseMessage]) -> tuple[str, str]:
+        """Context hash and normalized prompt of a model input ending in a HumanMessage."""
+        context = [f'{message.type}:{_message_text(message)}' for message in messages[:-1]]
+        context_hash = hashlib.sha256('\n'.join(context).encode()).hexdigest()
+        return context_hash, normalize_prompt(_message_text(messages[-1]))
+
+    @staticmethod
+    def _cache_key(context_hash: str, prompt: str) -> str:
+        return hashlib.sha256(f'{context_hash}\n{prompt}'.encode()).hexdigest()
+
+    @staticmethod
+    def _embed(session, prompt: str) -> list[float]:
+        row = session.sql(f"SELECT SNOWFLAKE.CORTEX.EMBED_TEXT_768('{EMBEDDING_MODEL}', ?) AS embedding", params=[prompt]).collect()[0]
+        embedding = row['EMBEDDING']
+        return json.loads(embedding) if isinstance(embedding, str) else list(embedding)
+
+    def _record_hit(self, entry: CacheEntry, tier: str) -> str:
+        with self._lock:
+            setattr(self._metrics, f'{tier}_hits', getattr(self._metrics, f'{tier}_hits') + 1)
+            self._metrics.saved_seconds += entry.latency_seconds
+        logger.info(f'Response cache {tier} hit (saved ~{entry.latency_seconds:.2f}s)')
+        return entry.response
+
+    def lookup(self, session, messages: list[BaseMessage]) -> str | None:
+        """Cached response for a model input, or None on a miss.
+
+        Args:
+            session: Snowflake session (for embeddings and the table backend)
+            messages: Model input, ending in the user's HumanMessage
+
+        Returns:
+            Cached response text or None
+        """
+        with self._lock:
+            self._metrics.lookups += 1
+        if not messages or not isinstance(messages[-1], HumanMessage):
+            with self._lock:
+                self._metrics.misses += 1
+            return None
+
+        context_hash, prompt = self._split(messages)
+        entry = self.backend.get(self._cache_key(context_hash, prompt), session)
+        if entry is not None:
+            return self._record_hit(entry, 'exact')
+
+        if self.similarity_threshold is not None:
+            entry, similarity = self.backend.most_similar(context_hash, self._embed(session, prompt), session)
+            if entry is not None and similarity >= self.similarity_threshold:
+                return self._record_hit(entry, 'similar')
+
+        with self._lock:
+            self._metrics.misses += 1
+        return None
+
+    def store(self, session, messages: list[BaseMessage], response: str, latency_seconds: float) -> None:
+        """Cache a model response.
+
+        Args:
+            session: Snowflake session (for embeddings and the table backend)
+            messages: Model input the response was generated for
+            response: Model response text
+            latency_seconds: Duration of the model call
+        """
+        if not messages or not isinstance(messages[-1], HumanMessage):
+            return
+        context_hash, prompt = self._split(messages)
+        embedding = self._embed(session, prompt) if self.similarity_threshold is not None else None
+        self.backend.put(CacheEntry(self._cache_key(context_hash, prompt), context_hash, prompt, response, latency_seconds, embedding), session)
+        with self._lock:
+            self._metrics.stores += 1
+
+    def metrics(self) -> dict:
+        """Counters plus hit rate."""
+        with self._lock:
+            metrics = asdict(self._metrics)
+        hits = metrics['exact_hits'] + metrics['similar_hits']
+        metrics['hit_rate'] = round(hits / metrics['lookups'], 4) if metrics['lookups'] else 0.0
+        metrics['saved_seconds'] = round(metrics['saved_seconds'], 2)
+        return metrics
+
+
+@st.cache_resource
+def get_response_cache() -> ResponseCache | None:
+    """Process-wide ResponseCache configured from environment variables (None when disabled).
+
+    CHAT_CACHE_BACKEND: 'memory' (default, process-local, no Snowflake round trips), 'snowflake' (opt-in shared
+        table) or 'off'
+    CHAT_CACHE_MAX_ENTRIES / CHAT_CACHE_TTL_SECONDS: eviction limits (TTL 0 disables expiry)
+    CHAT_CACHE_EVICT_EVERY: stores between eviction DELETEs for the snowflake backend
+    CHAT_CACHE_SIMILARITY_THRESHOLD: enables the embedding tier, e.g. 0.95
+    CHAT_CACHE_TABLE: table for the snowflake backend
+
+    Returns:
+        ResponseCache instance or None
+    """
+    backend_name = os.getenv('CHAT_CACHE_BACKEND', 'memory').lower()
+    if backend_name == 'off':
+        return None
+    ttl_seconds = float(os.getenv('CHAT_CACHE_TTL_SECONDS', '86400')) or None
+    similarity_threshold = os.getenv('CHAT_CACHE_SIMILARITY_THRESHOLD')
+    if backend_name == 'snowflake':
+        backend = SnowflakeTableCacheBackend(
+            os.getenv('CHAT_CACHE_TABLE', 'chat_response_cache'),
+            int(os.getenv('CHAT_CACHE_MAX_ENTRIES', '10000')),
+            ttl_seconds,
+            int(os.getenv('CHAT_CACHE_EVICT_EVERY', '100'))
+        )
+    else:
+        backend = InMemoryCacheBackend(int(os.getenv('CHAT_CACHE_MAX_ENTRIES', '1000')), ttl_seconds)
+    return ResponseCache(backend, float(similarity_threshold) if similarity_threshold else None)
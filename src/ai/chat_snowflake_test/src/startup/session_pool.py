@@ -0,0 +1,280 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+import streamlit as st
+from snowflake.snowpark import Session
+from src.startup.connections import get_connection_params
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATH = '/snowflake/session/token'
+
+
+@dataclass
+class PoolMetrics:
+    """Counters for a SessionPool, readable at any time via SessionPool.metrics().
+
+    Attributes:
+        created: Sessions created (logins)
+        reused: Acquires served by an idle pooled session
+        acquired: Total acquires
+        released: Total releases
+        discarded: Sessions closed because the caller reported them broken
+        evicted_idle: Sessions closed after sitting idle too long
+        health_check_failures: Pooled sessions that failed their health check
+        reauthenticated: Sessions replaced because the OAuth token rotated and the old session failed
+        acquire_timeouts: Acquires that gave up waiting for a free slot
+        total_acquire_wait_seconds: Time spent waiting for a session, summed over all acquires
+        max_acquire_wait_seconds: Longest single acquire
+    """
+    created: int = 0
+    reused: int = 0
+    acquired: int = 0
+    released: int = 0
+    discarded: int = 0
+    evicted_idle: int = 0
+    health_check_failures: int = 0
+    reauthenticated: int = 0
+    acquire_timeouts: int = 0
+    total_acquire_wait_seconds: float = 0.0
+    max_acquire_wait_seconds: float = 0.0
+
+
+@dataclass
+class _PooledSession:
+    session: Session
+    token_fingerprint: str | None
+    created_at: float
+    last_used_at: float
+    last_checked_at: float
+
+
+def _token_fingerprint() -> str | None:
+    """Hash of the current SPCS OAuth token (None for keypair auth), used to notice token rotation."""
+    if not os.path.exists(TOKEN_PATH):
+        return None
+    with open(TOKEN_PATH, 'rb') as token_file:
+        return hashlib.sha256(token_file.read()).hexdigest()
+
+
+class SessionPool:
+    def __init__(
+        self,
+        max_size: int = 4,
+        idle_timeout_seconds: float = 900,
+        health_check_interval_seconds: float = 60,
+        acquire_timeout_seconds: float = 30,
+        warehouse_name: str | None = 'container_warehouse'
+    ):
+        """Bounded, thread-safe pool of Snowpark sessions shared by all chat turns.
+
+        Sessions are created lazily up to max_size and handed back out on the next acquire, so a chat turn
+        only pays the login (and USE WAREHOUSE) round trip when no idle session is available. An idle session is
+        health checked with SELECT 1 before reuse when it hasn't been checked for health_check_interval_seconds,
+        or right away when /snowflake/session/token has rotated since the session logged in; sessions that fail
+        are replaced with a new login using the current token. Sessions idle longer than idle_timeout_seconds
+        are closed.
+
+        Args:
+            max_size: Maximum number of open sessions (in use + idle)
+            idle_timeout_seconds: Close sessions idle longer than this
+            health_check_interval_seconds: Re-check idle sessions older than this before reuse
+            acquire_timeout_seconds: How long acquire() waits for a free slot before raising TimeoutError
+            warehouse_name: Warehouse activated on each new session (Cortex calls need one), None to skip
+        """
+        assert max_size > 0, 'max_size must be positive'
+        self.max_size = max_size
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.health_check_interval_seconds = health_check_interval_seconds
+        self.acquire_timeout_seconds = acquire_timeout_seconds
+        self.warehouse_name = warehouse_name
+
+        self._condition = threading.Condition()
+        self._idle: deque[_PooledSession] = deque()
+        self._in_use: dict[int, _PooledSession] = {}
+        self._pending = 0  # Sessions being created or health checked outside the lock (they count toward max_size)
+        self._closed = False
+        self._metrics = PoolMetrics()
+
+    def _create(self) -> _PooledSession:
+        """Log in with freshly read connection params (the OAuth token is short lived)."""
+        token_fingerprint = _token_fingerprint()
+        session = Session.builder.configs(get_connection_params()).create()
+        if self.warehouse_name:
+            session.sql(f'USE WAREHOUSE {self.warehouse_name}').collect()
+        now = time.monotonic()
+        return _PooledSession(session, token_fingerprint, now, now, now)
+
+    @staticmethod
+    def _close_quietly(pooled: _PooledSession) -> None:
+        try:
+            pooled.session.close()
+        except Exception as e:
+            logger.warning(f'Error closing pooled session: {e}')
+
+    def _is_healthy(self, pooled: _PooledSession, token_fingerprint: str | None) -> bool:
+        """Check an idle session before reuse, only when it is due or the token has rotated."""
+        now = time.monotonic()
+        token_rotated = pooled.token_fingerprint != token_fingerprint
+        if not token_rotated and now - pooled.last_checked_at < self.health_check_interval_seconds:
+            return True
+        try:
+            pooled.session.sql('SELECT 1').collect()
+            pooled.last_checked_at = now
+            # Still valid under the new token - don't treat it as rotated (and re-check it) on every later acquire
+            pooled.token_fingerprint = token_fingerprint
+            return True
+        except Exception as e:
+            logger.info(f'Pooled session failed health check (token rotated: {token_rotated}): {e}')
+            with self._condition:
+                self._metrics.health_check_failures += 1
+                if token_rotated:
+                    self._metrics.reauthenticated += 1
+            return False
+
+    def _evict_idle(self) -> list[_PooledSession]:
+        """Remove sessions idle past idle_timeout_seconds (caller holds the lock and closes them)."""
+        cutoff = time.monotonic() - self.idle_timeout_seconds
+        expired = [pooled for pooled in self._idle if pooled.last_used_at < cutoff]
+        for pooled in expired:
+            self._idle.remove(pooled)
+        self._metrics.evicted_idle += len(expired)
+        return expired
+
+    def acquire(self) -> Session:
+        """Take an idle session or create one, waiting up to acquire_timeout_seconds when the pool is full.
+
+        Returns:
+            Session: Session to hand back with release()
+
+        Raises:
+            TimeoutError: If no session became available in time
+        """
+        start_time = time.monotonic()
+        token_fingerprint = _token_fingerprint()
+        while True:
+            with self._condition:
+                assert not self._closed, 'SessionPool is closed'
+                expired = self._evict_idle()
+                pooled = None
+                create_new = False
+                while pooled is None and not create_new:
+                    if self._idle:
+                        # Most recently used first - it is the most likely to still be warm
+                        pooled = self._idle.pop()
+                        self._pending += 1
+                    elif len(self._in_use) + self._pending < self.max_size:
+                        self._pending += 1
+                        create_new = True
+                    else:
+                        remaining = self.acquire_timeout_seconds - (time.monotonic() - start_time)
+                        if remaining <= 0 or not self._condition.wait(remaining):
+                            self._metrics.acquire_timeouts += 1
+                            raise TimeoutError(f'No Snowflake session available within {self.acquire_timeout_seconds}s (pool size {self.max_size})')
+                        expired += self._evict_idle()
+
+            for expired_session in expired:
+                self._close_quietly(expired_session)
+
+            if create_new:
+                try:
+                    pooled = self._create()
+                except Exception:
+                    with self._condition:
+                        self._pending -= 1
+                        self._condition.notify()
+                    raise
+            elif not self._is_healthy(pooled, token_fingerprint):
+                # Broken (e.g. expired after a token rotation) - drop it and retry, which logs in with the current token
+                self._close_quietly(pooled)
+                with self._condition:
+                    self._pending -= 1
+                    self._condition.notify()
+                continue
+
+            with self._condition:
+                self._pending -= 1
+                if create_new:
+                    self._metrics.created += 1
+                else:
+                    self._metrics.reused += 1
+                wait_seconds = time.monotonic() - start_time
+                self._in_use[id(pooled.session)] = pooled
+                self._metrics.acquired += 1
+                self._metrics.total_acquire_wait_seconds += wait_seconds
+                self._metrics.max_acquire_wait_seconds = max(self._metrics.max_acquire_wait_seconds, wait_seconds)
+            return pooled.session
+
+    def release(self, session: Session, discard: bool = False) -> None:
+        """Return a session to the pool.
+
+        Args:
+            session: Session from acquire()
+            discard: Close the session instead of pooling it (e.g. after a connection error)
+        """
+        with self._condition:
+            pooled = self._in_use.pop(id(session), None)
+            assert pooled is not None, 'Session was not acquired from this pool'
+            self._metrics.released += 1
+            if discard or self._closed:
+                self._metrics.discarded += int(discard)
+            else:
+                pooled.last_used_at = time.monotonic()
+                self._idle.append(pooled)
+                pooled = None
+            self._condition.notify()
+        if pooled is not None:
+            self._close_quietly(pooled)
+
+    @contextmanager
+    def session(self):
+        """Acquire a session for the duration of a with block; it is discarded if the block raises."""
+        session = self.acquire()
+        try:
+            yield session
+        except Exception:
+            self.release(session, discard=True)
+            raise
+        self.release(session)
+
+    def metrics(self) -> dict:
+        """Current counters plus pool occupancy."""
+        with self._condition:
+            metrics = asdict(self._metrics)
+            for key in ['total_acquire_wait_seconds', 'max_acquire_wait_seconds']:
+                metrics[key] = round(metrics[key], 4)
+            return {
+                **metrics,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'max_size': self.max_size
+            }
+
+    def close(self) -> None:
+        """Close all idle sessions and stop pooling; in-use sessions are closed when released."""
+        with self._condition:
+            self._closed = True
+            idle_sessions = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for pooled in idle_sessions:
+            self._close_quietly(pooled)
+
+
+@st.cache_resource
+def get_session_pool() -> SessionPool:
+    """Process-wide SessionPool, shared across Streamlit reruns and users.
+
+    Cached like the graph, so it is built once per server process. Size it with SNOWFLAKE_SESSION_POOL_SIZE.
+
+    Returns:
+        SessionPool instance
+    """
+    return SessionPool(max_size=int(os.getenv('SNOWFLAKE_SESSION_POOL_SIZE', '4')))
@@ -1,5 +1,7 @@
 import os
 import logging
+from src.startup.session_pool import get_session_pool
+from src.llm.response_cache import get_response_cache
 
 
 # Setup module for logging
@@ -55,6 +57,16 @@ def _setup_sidebar(streamlit_instance, app_information: str):
             streamlit_instance.session_state.graph_state = {'messages': []}
             streamlit_instance.rerun()
 
+        # Shared Snowflake session pool stats (acquires, reuses, logins, waits)
+        with streamlit_instance.expander('Session pool'):
+            streamlit_instance.json(get_session_pool().metrics())
+
+        # Response cache hit rate and model time saved
+        response_cache = get_response_cache()
+        if response_cache:
+            with streamlit_instance.expander('Response cache'):
+                streamlit_instance.json(response_cache.metrics())
+
 
 def _initialize_chat_history(streamlit_instance):
     """Initialize chat-specific session state.
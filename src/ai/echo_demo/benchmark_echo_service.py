@@ -0,0 +1,70 @@
+"""
+Echo Service Batch Benchmark
+
+Posts Snowflake-style batches to /echo through Flask's test client and reports rows per second for the
+previous one-row-at-a-time handler and the concurrent handler at several ECHO_CONCURRENCY limits.
+get_echo_response is wrapped with a sleep to stand in for real per-row work (e.g. a model call).
+
+Usage:
+    python benchmark_echo_service.py --rows 1000 --row-latency-ms 20 --concurrency 1 8 32 64
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import echo_service
+
+
+async def sequential_process_rows(input_rows):
+    """The handler's previous behaviour - a list comprehension over the batch."""
+    return [[row[0], echo_service.get_echo_response(row[1])] for row in input_rows]
+
+
+def post_batch(client, input_rows) -> float:
+    """POST one batch to /echo, check the [row_index, value] order contract and return the seconds taken."""
+    start_time = time.perf_counter()
+    response = client.post('/echo', json={'data': input_rows})
+    elapsed_seconds = time.perf_counter() - start_time
+    output_rows = response.get_json()['data']
+    assert [row[0] for row in output_rows] == [row[0] for row in input_rows], 'Output rows are out of order'
+    assert all(value == f'{echo_service.CHARACTER_NAME} said {row[1]}' for row, (_, value) in zip(input_rows, output_rows))
+    return elapsed_seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark /echo batch throughput.')
+    parser.add_argument('--rows', type=int, default=1000, help='Rows per batch')
+    parser.add_argument('--row-latency-ms', type=float, default=20, help='Simulated work per row')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 64], help='ECHO_CONCURRENCY values to run')
+    args = parser.parse_args()
+
+    echo_response = echo_service.get_echo_response
+
+    def slow_echo_response(input):
+        time.sleep(args.row_latency_ms / 1000)
+        return echo_response(input)
+
+    echo_service.get_echo_response = slow_echo_response
+    echo_service.logger.setLevel('WARNING')
+    client = echo_service.app.test_client()
+    input_rows = [[row_index, f'value {row_index}'] for row_index in range(args.rows)]
+
+    process_rows = echo_service.process_rows
+    echo_service.process_rows = sequential_process_rows
+    baseline_seconds = post_batch(client, input_rows)
+    echo_service.process_rows = process_rows
+    print(f'{"sequential":<16} {baseline_seconds:8.3f}s {args.rows / baseline_seconds:10.0f} rows/s')
+
+    for concurrency in args.concurrency:
+        echo_service.row_executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='echo-row')
+        elapsed_seconds = post_batch(client, input_rows)
+        echo_service.row_executor.shutdown()
+        print(
+            f'{f"concurrency={concurrency}":<16} {elapsed_seconds:8.3f}s {args.rows / elapsed_seconds:10.0f} rows/s '
+            f'({baseline_seconds / elapsed_seconds:.1f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -2,13 +2,18 @@ from flask import Flask
 from flask import request
 from flask import make_response
 from flask import render_template
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
 import os
 import sys
+import time
 
 SERVICE_HOST = os.getenv('SERVER_HOST', '0.0.0.0')
 SERVICE_PORT = os.getenv('SERVER_PORT', 8080)
 CHARACTER_NAME = os.getenv('CHARACTER_NAME', 'I')
+# Rows processed at once, shared by all in-flight batches (1 = one row at a time)
+ECHO_CONCURRENCY = int(os.getenv('ECHO_CONCURRENCY', 16))
 
 
 def get_logger(logger_name):
@@ -27,14 +32,30 @@ logger = get_logger('echo-service')
 
 app = Flask(__name__)
 
+# get_echo_response is synchronous (and will block on real work such as a model call), so rows run on a
+# bounded thread pool awaited from the async handler - the pool size is the concurrency limit
+row_executor = ThreadPoolExecutor(max_workers=ECHO_CONCURRENCY, thread_name_prefix='echo-row')
+
 
 @app.get("/healthcheck")
 def readiness_probe():
     return "I'm ready!"
 
 
+async def process_rows(input_rows):
+    '''
+    Run get_echo_response over a batch concurrently on row_executor.
+
+    asyncio.gather returns results in input order, so the output keeps the
+    [row_index, value] pairing and order Snowflake expects.
+    '''
+    loop = asyncio.get_running_loop()
+    values = await asyncio.gather(*[loop.run_in_executor(row_executor, get_echo_response, row[1]) for row in input_rows])
+    return [[row[0], value] for row, value in zip(input_rows, values)]
+
+
 @app.post("/echo")
-def echo():
+async def echo():
     '''
     Main handler for input data sent by Snowflake.
     '''
@@ -58,8 +79,10 @@ def echo():
     #     [row_index, column_1_value, column_2_value, ...}],
     #     ...
     #   ]}
-    output_rows = [[row[0], get_echo_response(row[1])] for row in input_rows]
-    logger.info(f'Produced {len(output_rows)} rows')
+    start_time = time.perf_counter()
+    output_rows = await process_rows(input_rows)
+    elapsed_seconds = time.perf_counter() - start_time
+    logger.info(f'Produced {len(output_rows)} rows in {elapsed_seconds:.3f}s ({len(output_rows) / max(elapsed_seconds, 1e-9):.0f} rows/s)')
 
     response = make_response({"data": output_rows})
     response.headers['Content-type'] = 'application/json'
@@ -0,0 +1,196 @@
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+
+
+@dataclass
+class ChunkSpec:
+    """One slice of the ETL view to stage and merge on its own.
+
+    Attributes:
+        chunk_index: Zero-based position of the chunk
+        chunk_count: Total number of chunks in the plan
+        predicate: SQL predicate over ETL view columns selecting the chunk's rows
+    """
+    chunk_index: int
+    chunk_count: int
+    predicate: str
+
+
+def plan_hash_chunks(natural_keys: list[str], chunk_count: int) -> list[ChunkSpec]:
+    """Split rows into chunks by a hash of the natural key.
+
+    Every natural key lands in exactly one chunk, so each chunk can be upserted independently
+    (including Type 2 changes, which only ever touch rows of the same natural key).
+
+    Args:
+        natural_keys: Natural key column names
+        chunk_count: Number of hash buckets
+
+    Returns:
+        list[ChunkSpec]: One chunk per bucket
+    """
+    assert chunk_count > 0, f'chunk_count must be positive, not {chunk_count}'
+    assert natural_keys, 'Hash chunking requires at least one natural key column'
+    hash_expression = f"ABS(MOD(HASH({', '.join(natural_keys)}), {chunk_count}))"
+    return [ChunkSpec(chunk_index, chunk_count, f'{hash_expression} = {chunk_index}') for chunk_index in range(chunk_count)]
+
+
+def _format_boundary(value) -> str:
+    """Render a range boundary as a SQL literal."""
+    if isinstance(value, (date, datetime)):
+        return f"'{value.isoformat(sep=' ') if isinstance(value, datetime) else value.isoformat()}'"
+    return str(value)
+
+
+def split_range(lower_value, upper_value, chunk_count: int) -> list:
+    """Split [lower_value, upper_value] into chunk_count equal-width intervals.
+
+    Args:
+        lower_value: Minimum value (number, date or datetime)
+        upper_value: Maximum value (same type as lower_value)
+        chunk_count: Number of intervals
+
+    Returns:
+        list: The chunk_count - 1 inner boundaries, ascending and de-duplicated
+    """
+    if lower_value is None or upper_value is None or lower_value >= upper_value or chunk_count <= 1:
+        return []
+    width = upper_value - lower_value
+    boundaries = []
+    for chunk_index in range(1, chunk_count):
+        if isinstance(lower_value, date) and not isinstance(lower_value, datetime):
+            boundary = lower_value + (width * chunk_index) // chunk_count
+        elif isinstance(lower_value, int):
+            boundary = lower_value + (width * chunk_index) // chunk_count
+        else:
+            boundary = lower_value + width * chunk_index / chunk_count
+        if boundary > lower_value and (not boundaries or boundary > boundaries[-1]):
+            boundaries.append(boundary)
+    return boundaries
+
+
+def plan_range_chunks(chunk_column: str, lower_value, upper_value, chunk_count: int) -> list[ChunkSpec]:
+    """Split rows into chunks by ranges of a partition column (e.g. a date).
+
+    The first chunk is open below and also takes NULLs, the last is open above, so every row lands in
+    exactly one chunk even if the data moved since the MIN/MAX were read. Fewer chunks are returned
+    when the range is too narrow to split.
+
+    Args:
+        chunk_column: Partition column in the ETL view
+        lower_value: MIN of the column
+        upper_value: MAX of the column
+        chunk_count: Requested number of chunks
+
+    Returns:
+        list[ChunkSpec]: Range chunks in ascending order
+    """
+    assert chunk_count > 0, f'chunk_count must be positive, not {chunk_count}'
+    boundaries = [_format_boundary(boundary) for boundary in split_range(lower_value, upper_value, chunk_count)]
+    if not boundaries:
+        return [ChunkSpec(0, 1, '1 = 1')]
+
+    predicates = [f'({chunk_column} < {boundaries[0]} OR {chunk_column} IS NULL)']
+    for lower_boundary, upper_boundary in zip(boundaries, boundaries[1:]):
+        predicates.append(f'{chunk_column} >= {lower_boundary} AND {chunk_column} < {upper_boundary}')
+    predicates.append(f'{chunk_column} >= {boundaries[-1]}')
+    return [ChunkSpec(chunk_index, len(predicates), predicate) for chunk_index, predicate in enumerate(predicates)]
+
+
+class ChunkProgressStore:
+    def __init__(self, backend, progress_table_name: str):
+        """Chunk plan and completed-chunk bookkeeping so a failed chunked run can resume with the same batch_id.
+
+        The first attempt of a batch saves its chunk plan (predicates and watermark window) as a 'plan' row;
+        a resumed attempt reuses that plan instead of re-planning, since range boundaries depend on the data
+        at planning time. Completed chunks are 'chunk' rows matched by chunk_index, with their change counts
+        so a resumed run still reports the whole batch.
+
+        Args:
+            backend: Execution backend (SessionBackend or PlanBackend)
+            progress_table_name: Fully qualified progress table name (e.g. learning_db.etl.etl_chunk_progress)
+        """
+        self.backend = backend
+        self.progress_table_name = progress_table_name
+
+    def ensure_progress_table(self) -> None:
+        """Create the progress table if it does not exist yet (and add the plan columns to older tables)."""
+        self.backend.execute(f"""
+        CREATE TABLE IF NOT EXISTS {self.progress_table_name} (
+             table_name STRING
+            ,batch_name STRING
+            ,chunk_count NUMBER
+            ,chunk_index NUMBER
+            ,chunk_predicate STRING
+            ,watermark_high STRING
+            ,completed_datetime TIMESTAMP_NTZ
+            ,record_type STRING
+            ,chunk_plan STRING
+            ,change_counts STRING
+        )
+        """, 'chunk_progress')
+        for column_name in ('record_type', 'chunk_plan', 'change_counts'):
+            self.backend.execute(f'ALTER TABLE {self.progress_table_name} ADD COLUMN IF NOT EXISTS {column_name} STRING', 'chunk_progress')
+
+    def load_progress(self, full_table_name: str, batch_id: str) -> tuple[dict | None, dict[int, dict]]:
+        """Return the saved chunk plan and the chunks already completed by this batch.
+
+        Args:
+            full_table_name: Fully qualified target table name
+            batch_id: Batch ID being resumed
+
+        Returns:
+            tuple: Saved plan (see save_plan, None on the first attempt) and completed chunk index -> change counts
+                   (empty for chunks recorded before counts were stored)
+        """
+        rows = self.backend.execute(f"""
+        SELECT COALESCE(record_type, 'chunk'), chunk_index, chunk_plan, change_counts
+        FROM {self.progress_table_name}
+        WHERE table_name = '{full_table_name.lower()}'
+        AND batch_name = '{batch_id}'
+        """, 'chunk_progress')
+        chunk_plan = next((json.loads(row[2]) for row in rows if row[0] == 'plan'), None)
+        return chunk_plan, {int(row[1]): json.loads(row[3]) if row[3] else {} for row in rows if row[0] == 'chunk'}
+
+    def save_plan(self, full_table_name: str, batch_id: str, chunks: list[ChunkSpec], watermark_window: dict, current_datetime_cst: datetime) -> None:
+        """Record the chunk plan of a batch's first attempt.
+
+        Args:
+            full_table_name: Fully qualified target table name
+            batch_id: Batch ID of the run
+            chunks: Planned chunks
+            watermark_window: watermark_low, watermark_high and full_reconcile used by the run
+            current_datetime_cst: Run timestamp
+        """
+        chunk_plan = json.dumps({'chunk_count': len(chunks), 'predicates': [chunk.predicate for chunk in chunks], **watermark_window}).replace("'", "''")
+        self.backend.execute(f"""
+        INSERT INTO {self.progress_table_name} (table_name, batch_name, chunk_count, record_type, chunk_plan, completed_datetime)
+        VALUES ('{full_table_name.lower()}', '{batch_id}', {len(chunks)}, 'plan', '{chunk_plan}', CAST('{current_datetime_cst}' AS TIMESTAMP_NTZ))
+        """, 'chunk_progress')
+
+    def mark_completed(
+        self,
+        full_table_name: str,
+        batch_id: str,
+        chunk: ChunkSpec,
+        watermark_high: str | None,
+        current_datetime_cst: datetime,
+        change_counts: dict[str, int]
+    ) -> None:
+        """Record a completed chunk.
+
+        Args:
+            full_table_name: Fully qualified target table name
+            batch_id: Batch ID of the run
+            chunk: The completed chunk
+            watermark_high: Watermark upper bound used by the run (None outside incremental mode)
+            current_datetime_cst: Run timestamp
+            change_counts: The chunk's insert/update/type2_change counts, added back in when the batch resumes
+        """
+        predicate = chunk.predicate.replace("'", "''")
+        watermark_literal = f"'{watermark_high}'" if watermark_high is not None else 'NULL'
+        self.backend.execute(f"""
+        INSERT INTO {self.progress_table_name} (table_name, batch_name, chunk_count, chunk_index, chunk_predicate, watermark_high, completed_datetime, record_type, change_counts)
+        VALUES ('{full_table_name.lower()}', '{batch_id}', {chunk.chunk_count}, {chunk.chunk_index}, '{predicate}', {watermark_literal}, CAST('{current_datetime_cst}' AS TIMESTAMP_NTZ), 'chunk', '{json.dumps(change_counts)}')
+        """, 'chunk_progress')
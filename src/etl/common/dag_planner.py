@@ -0,0 +1,159 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class DagPlan:
+    """Dependency plan for a set of table loads.
+
+    Attributes:
+        dependencies: Table name -> sorted list of upstream table names
+        waves: Tables grouped into waves; every table's upstreams are in earlier waves,
+               and each table sits in the earliest wave possible (maximal-width waves)
+        critical_path: Longest chain of dependent tables (by duration), upstream first
+        critical_path_length: Total duration along the critical path (task count if no durations given)
+    """
+    dependencies: dict[str, list[str]]
+    waves: list[list[str]] = field(default_factory=list)
+    critical_path: list[str] = field(default_factory=list)
+    critical_path_length: float = 0
+
+    @property
+    def wave_widths(self) -> list[int]:
+        return [len(wave) for wave in self.waves]
+
+    def describe(self) -> str:
+        """Human-readable summary of the plan for logging."""
+        lines = [f'{len(self.dependencies)} tables in {len(self.waves)} waves, widths={self.wave_widths}']
+        for wave_number, wave in enumerate(self.waves, start=1):
+            lines.append(f'  wave {wave_number}: {", ".join(wave)}')
+        lines.append(f'  critical path ({self.critical_path_length}): {" -> ".join(self.critical_path)}')
+        return '\n'.join(lines)
+
+
+def normalize_manifest(manifest: dict) -> dict[str, dict]:
+    """Normalize a table manifest to {table_name: {'depends_on': [...], **options}}.
+
+    Accepts either a list of upstream tables or a dict with 'depends_on' plus table_updater
+    options (e.g. type_1_column_names, enable_deletes) for each table:
+
+        {
+            'dim_employee': [],
+            'fact_employee_pay': {'depends_on': ['dim_employee'], 'enable_deletes': True},
+        }
+
+    Args:
+        manifest: Table manifest as described above
+
+    Returns:
+        dict: Normalized manifest (table names lowercased)
+    """
+    normalized = {}
+    for table_name, table_config in manifest.items():
+        if table_config is None:
+            table_config = {}
+        elif isinstance(table_config, (list, tuple, set)):
+            table_config = {'depends_on': list(table_config)}
+        else:
+            table_config = dict(table_config)
+        table_config['depends_on'] = sorted({upstream.lower() for upstream in table_config.get('depends_on') or []})
+        normalized[table_name.lower()] = table_config
+    return normalized
+
+
+def load_manifest(path: str) -> dict[str, dict]:
+    """Load a table manifest from a YAML file (requires PyYAML).
+
+    Args:
+        path: Path to a YAML file with the same shape as the dict manifest
+
+    Returns:
+        dict: Normalized manifest
+    """
+    import yaml
+
+    with open(path) as manifest_file:
+        return normalize_manifest(yaml.safe_load(manifest_file) or {})
+
+
+def infer_key_dependencies(table_columns: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Infer fact -> dim dependencies from foreign key column names.
+
+    A table that has a column named {dim_table}_key (other than its own surrogate key) is
+    treated as depending on that dimension, e.g. fact_employee_pay.dim_employee_key -> dim_employee.
+
+    Args:
+        table_columns: Table name -> column names (e.g. from INFORMATION_SCHEMA.COLUMNS)
+
+    Returns:
+        dict: Table name -> sorted list of inferred upstream tables (only tables in table_columns)
+    """
+    table_names = {table_name.lower() for table_name in table_columns}
+    inferred = {}
+    for table_name, column_names in table_columns.items():
+        table_name = table_name.lower()
+        upstreams = set()
+        for column_name in column_names:
+            column_name = column_name.lower()
+            if column_name.endswith('_key') and column_name != f'{table_name}_key':
+                referenced_table = column_name[:-len('_key')]
+                if referenced_table in table_names and referenced_table != table_name:
+                    upstreams.add(referenced_table)
+        inferred[table_name] = sorted(upstreams)
+    return inferred
+
+
+def plan_dag(manifest: dict, durations: dict[str, float] | None = None) -> DagPlan:
+    """Topologically sort a manifest into waves and compute the critical path.
+
+    Args:
+        manifest: Table manifest (see normalize_manifest)
+        durations: Optional expected duration per table for the critical path (defaults to 1 per table)
+
+    Returns:
+        DagPlan: Waves, wave widths and critical path
+
+    Raises:
+        ValueError: If a table depends on a table not in the manifest, or the dependencies contain a cycle
+    """
+    normalized = normalize_manifest(manifest)
+    dependencies = {table_name: table_config['depends_on'] for table_name, table_config in normalized.items()}
+    durations = {table_name.lower(): duration for table_name, duration in (durations or {}).items()}
+
+    for table_name, upstreams in dependencies.items():
+        missing = [upstream for upstream in upstreams if upstream not in dependencies]
+        if missing:
+            raise ValueError(f"Table '{table_name}' depends on tables missing from the manifest: {missing}")
+
+    # Kahn's algorithm, one level at a time so each wave is as wide as possible
+    remaining = {table_name: set(upstreams) for table_name, upstreams in dependencies.items()}
+    waves = []
+    while remaining:
+        wave = sorted(table_name for table_name, upstreams in remaining.items() if not upstreams)
+        if not wave:
+            raise ValueError(f'Dependency cycle detected between tables: {sorted(remaining)}')
+        waves.append(wave)
+        for table_name in wave:
+            del remaining[table_name]
+        for upstreams in remaining.values():
+            upstreams.difference_update(wave)
+
+    # Longest path through the DAG, walking waves in order so upstream finish times are known
+    finish_times = {}
+    previous_on_path = {}
+    for wave in waves:
+        for table_name in wave:
+            upstream_finish, upstream_table = max(((finish_times[upstream], upstream) for upstream in dependencies[table_name]), default=(0, None))
+            finish_times[table_name] = upstream_finish + durations.get(table_name, 1)
+            previous_on_path[table_name] = upstream_table
+
+    critical_path = []
+    if finish_times:
+        table_name = max(sorted(finish_times), key=lambda name: finish_times[name])
+        critical_path_length = finish_times[table_name]
+        while table_name is not None:
+            critical_path.insert(0, table_name)
+            table_name = previous_on_path[table_name]
+    else:
+        critical_path_length = 0
+
+    return DagPlan(dependencies=dependencies, waves=waves, critical_path=critical_path, critical_path_length=critical_path_length)
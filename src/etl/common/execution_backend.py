@@ -0,0 +1,103 @@
+import json
+import textwrap
+from dataclasses import asdict, dataclass, field
+
+
+class SessionBackend:
+    def __init__(self, session):
+        """Execution backend that runs statements on a Snowpark session.
+
+        Args:
+            session: Snowflake Snowpark session object
+        """
+        self.session = session
+        self.last_query_id: str | None = None
+
+    def execute(self, sql_string: str, phase: str) -> list:
+        """Run a statement and return the collected rows.
+
+        The statement's Snowflake query id is kept in last_query_id (None for sessions without query history).
+
+        Args:
+            sql_string: SQL statement to run
+            phase: Name of the TableUpdater phase issuing the statement (unused here)
+
+        Returns:
+            list: Collected Snowpark Row objects
+        """
+        if not hasattr(self.session, 'query_history'):
+            return self.session.sql(sql_string).collect()
+        with self.session.query_history() as query_history:
+            rows = self.session.sql(sql_string).collect()
+        self.last_query_id = query_history.queries[-1].query_id if query_history.queries else None
+        return rows
+
+    def record_metadata(self, metadata: dict) -> None:
+        """Nothing to record when actually executing."""
+        pass
+
+
+@dataclass
+class PlannedStatement:
+    """A statement recorded by PlanBackend.
+
+    Attributes:
+        sequence: 1-based position in the run
+        phase: TableUpdater phase that issued the statement (e.g. 'identify_upserts', 'table_inserts:chunk_2')
+        sql_string: The statement text (dedented)
+    """
+    sequence: int
+    phase: str
+    sql_string: str
+
+
+@dataclass
+class PlanBackend:
+    """Execution backend that records statements in order instead of running them (dry run / SQL plan mode).
+
+    Every statement returns the canned rows configured for its phase (no rows by default), so a run
+    follows the "nothing changed" path unless results are supplied. Use with a TableMetadata fixture
+    so no Snowflake session is needed at all.
+
+    Attributes:
+        results: Optional phase name -> rows to return for statements of that phase
+        statements: Recorded statements in execution order
+        metadata: Metadata and derived column lists the statements were generated from
+        last_query_id: Always None, nothing is sent to Snowflake
+    """
+    results: dict[str, list] = field(default_factory=dict)
+    statements: list[PlannedStatement] = field(default_factory=list)
+    metadata: dict = field(default_factory=dict)
+    last_query_id: str | None = None
+
+    def execute(self, sql_string: str, phase: str) -> list:
+        """Record a statement and return the canned rows for its phase.
+
+        Args:
+            sql_string: SQL statement that would have been run
+            phase: Name of the TableUpdater phase issuing the statement
+
+        Returns:
+            list: Canned rows for the phase (base phase name without a ':chunk_n' suffix also matches)
+        """
+        self.statements.append(PlannedStatement(len(self.statements) + 1, phase, textwrap.dedent(sql_string).strip()))
+        return self.results.get(phase, self.results.get(phase.split(':')[0], []))
+
+    def record_metadata(self, metadata: dict) -> None:
+        """Keep the metadata the plan was generated from.
+
+        Args:
+            metadata: JSON-serializable metadata and derived infers
+        """
+        self.metadata = metadata
+
+    def to_sql_script(self) -> str:
+        """Render the recorded statements as a SQL script, one commented block per statement."""
+        return '\n\n'.join([f'-- [{statement.sequence}] {statement.phase}\n{statement.sql_string};' for statement in self.statements])
+
+    def to_json(self) -> str:
+        """Render the plan (statements plus metadata) as JSON, e.g. for diffing between versions."""
+        return json.dumps({
+            'metadata': self.metadata,
+            'statements': [asdict(statement) for statement in self.statements]
+        }, indent=2, default=str)
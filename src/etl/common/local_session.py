@@ -0,0 +1,226 @@
+import json
+import re
+from datetime import datetime
+
+from snowflake.snowpark.row import Row
+
+
+class LocalResult:
+    def __init__(self, rows: list):
+        """Collected result of a LocalSession statement (the `.collect()` half of `session.sql(...).collect()`).
+
+        Args:
+            rows: Snowpark Row objects
+        """
+        self.rows = rows
+
+    def collect(self) -> list:
+        return self.rows
+
+
+class LocalSession:
+    def __init__(
+        self,
+        database_name: str = 'learning_db',
+        schema_names: tuple[str, ...] = ('dw', 'etl', 'src'),
+        current_username: str = 'LOCAL_USER',
+        current_datetime: datetime | None = None,
+        database_path: str = ':memory:'
+    ):
+        """In-process stand-in for the subset of the Snowpark Session API that TableUpdater uses, backed by DuckDB.
+
+        Statements are written in Snowflake SQL and translated on the way in, so the Snowflake DDL from the
+        test notebook (AUTOINCREMENT keys, ALTER TABLE ... ADD CONSTRAINT ... PRIMARY KEY, STRING/NUMBER/
+        TIMESTAMP_NTZ/BINARY types) and every statement TableUpdater generates run unchanged. Supported:
+
+        - `sql(...).collect()` returning Snowpark Rows (MERGE/INSERT/UPDATE/DELETE return Snowflake's row count columns)
+        - INFORMATION_SCHEMA lookups, CURRENT_USER() and the CST timestamp used by load_table_metadata()
+        - SHOW PRIMARY KEYS (primary keys are recorded but not enforced, like Snowflake)
+        - SHA1_BINARY and TO_BINARY/TO_VARCHAR with the 'HEX' format, for binary row hashes
+        - `call()` for etl.logging / etl.logging_batch, kept in `log_records`
+
+        Not supported: LAST_DDL / LAST_ALTERED (so no TableMetadataCache) and Snowflake-only functions beyond the
+        translations below. Requires the duckdb package.
+
+        Args:
+            database_name: Database to create (attached under this name so three-part names resolve)
+            schema_names: Schemas to create in the database
+            current_username: Value returned for CURRENT_USER()
+            current_datetime: Optional fixed value for the CST run timestamp (defaults to the local clock)
+            database_path: DuckDB database file, in memory by default
+        """
+        import duckdb
+
+        self.connection = duckdb.connect()
+        self.connection.execute(f"ATTACH '{database_path}' AS {database_name}")
+        for schema_name in schema_names:
+            self.connection.execute(f'CREATE SCHEMA IF NOT EXISTS {database_name}.{schema_name}')
+        # Snowflake functions without a DuckDB equivalent (macros also resolve inside views)
+        self.connection.execute('CREATE TEMP MACRO sha1_binary(value) AS unhex(sha1(value))')
+        self.database_name = database_name
+        self.current_username = current_username
+        self.current_datetime = current_datetime
+        self.primary_keys: dict[str, list[str]] = {}
+        self.log_records: list[dict] = []
+        self.statement_count = 0
+
+    # Snowflake -> DuckDB rewrites applied to every statement, in order
+    _TRANSLATIONS = [
+        (r'\bTIMESTAMP_NTZ\b', 'TIMESTAMP'),
+        (r'\bNUMBER\s*\(', 'DECIMAL('),
+        (r'\bNUMBER\b', 'BIGINT'),
+        (r'\bSTRING\b', 'VARCHAR'),
+        (r'\bFLOAT\b', 'DOUBLE'),
+        (r'\bBINARY\s*\(\s*\d+\s*\)', 'BLOB'),
+        (r'\bBINARY\b', 'BLOB'),
+        (r"\bTO_BINARY\(([\w.]+)\s*,\s*'HEX'\s*\)", r'UNHEX(\1)'),
+        (r"\bTO_VARCHAR\(([\w.]+)\s*,\s*'HEX'\s*\)", r'HEX(\1)'),
+        (r'\b(TEMPORARY|TRANSIENT)\s+TABLE\b', 'TABLE'),
+        (r'\bDATA_RETENTION_TIME_IN_DAYS\s*=\s*\d+', ''),
+        (r'\bARRAY_AGG\(([^()]*)\)\s*WITHIN\s+GROUP\s*\(\s*ORDER\s+BY\s+([^()]*)\)', r'ARRAY_AGG(\1 ORDER BY \2)'),
+        (r"\b([\w.]+)\s*=\s*UPPER\(('[^']*')\)", r'UPPER(\1) = UPPER(\2)')
+    ]
+
+    def _full_name(self, object_name: str) -> str:
+        """Lowercase three-part name for primary key bookkeeping."""
+        parts = object_name.lower().split('.')
+        if len(parts) == 1:
+            parts = ['main'] + parts
+        if len(parts) == 2:
+            parts = [self.database_name.lower()] + parts
+        return '.'.join(parts)
+
+    def _translate(self, sql_string: str) -> str:
+        """Rewrite a Snowflake statement into DuckDB SQL."""
+        sql_string = sql_string.strip().rstrip(';')
+        for pattern, replacement in self._TRANSLATIONS:
+            sql_string = re.sub(pattern, replacement, sql_string, flags=re.IGNORECASE)
+
+        current_datetime = self.current_datetime.isoformat(sep=' ') if self.current_datetime else None
+        sql_string = re.sub(r'\bCURRENT_USER\(\)', f"'{self.current_username}'", sql_string, flags=re.IGNORECASE)
+        sql_string = re.sub(
+            r"\bCONVERT_TIMEZONE\([^()]*CURRENT_TIMESTAMP\(\)\)",
+            f"CAST('{current_datetime}' AS TIMESTAMP)" if current_datetime else 'CURRENT_LOCALTIMESTAMP()',
+            sql_string,
+            flags=re.IGNORECASE
+        )
+
+        # DuckDB only accepts bare column names on the left of a MERGE ... UPDATE SET assignment
+        if re.match(r'MERGE\b', sql_string, flags=re.IGNORECASE):
+            sql_string = re.sub(r'(SET\s+|,\s*)\w+\.(\w+)\s*=(?!=)', r'\1\2 =', sql_string, flags=re.IGNORECASE)
+        return sql_string
+
+    def _create_table(self, sql_string: str) -> str:
+        """Handle AUTOINCREMENT/IDENTITY columns and inline PRIMARY KEY constraints of a CREATE TABLE."""
+        table_match = re.match(r'CREATE\s+(?:OR\s+REPLACE\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w.]+)', sql_string, flags=re.IGNORECASE)
+        full_name = self._full_name(table_match.group(1))
+
+        # Primary keys are informational in Snowflake, so record them instead of letting DuckDB enforce them
+        key_match = re.search(r',\s*(?:CONSTRAINT\s+\w+\s+)?PRIMARY\s+KEY\s*\(([^)]*)\)', sql_string, flags=re.IGNORECASE)
+        if key_match:
+            self.primary_keys[full_name] = [column_name.strip().lower() for column_name in key_match.group(1).split(',')]
+            sql_string = sql_string[:key_match.start()] + sql_string[key_match.end():]
+        elif re.match(r'CREATE\s+OR\s+REPLACE', sql_string, flags=re.IGNORECASE):
+            self.primary_keys.pop(full_name, None)
+
+        def to_sequence_default(column_match) -> str:
+            sequence_name = f"{full_name.rsplit('.', 1)[0]}.seq_{full_name.rsplit('.', 1)[1]}_{column_match.group(1).lower()}"
+            self.connection.execute(f'CREATE SEQUENCE IF NOT EXISTS {sequence_name}')
+            return f"{column_match.group(1)} {column_match.group(2)} DEFAULT nextval('{sequence_name}')"
+
+        return re.sub(r'\b(\w+)\s+(\w+)\s+(?:AUTOINCREMENT|IDENTITY)(?:\s*\(\s*\d+\s*,\s*\d+\s*\))?', to_sequence_default, sql_string, flags=re.IGNORECASE)
+
+    def _show_primary_keys(self, object_name: str) -> list:
+        """SHOW PRIMARY KEYS IN TABLE, with the columns TableUpdater reads."""
+        full_name = self._full_name(object_name)
+        database_name, schema_name, table_name = full_name.split('.')
+        build_row = Row._builder.build('database_name', 'schema_name', 'table_name', 'column_name', 'key_sequence').to_row()
+        return [
+            build_row(database_name.upper(), schema_name.upper(), table_name.upper(), column_name.upper(), key_sequence)
+            for key_sequence, column_name in enumerate(self.primary_keys.get(full_name, []), start=1)
+        ]
+
+    def sql(self, sql_string: str) -> LocalResult:
+        """Run a Snowflake SQL statement.
+
+        Args:
+            sql_string: Single Snowflake SQL statement
+
+        Returns:
+            LocalResult: Result to `.collect()`
+        """
+        self.statement_count += 1
+        sql_string = self._translate(sql_string)
+
+        show_match = re.match(r'SHOW\s+PRIMARY\s+KEYS\s+IN\s+TABLE\s+([\w.]+)', sql_string, flags=re.IGNORECASE)
+        if show_match:
+            return LocalResult(self._show_primary_keys(show_match.group(1)))
+
+        constraint_match = re.match(
+            r'ALTER\s+TABLE\s+([\w.]+)\s+ADD\s+(?:CONSTRAINT\s+\w+\s+)?PRIMARY\s+KEY\s*\(([^)]*)\)',
+            sql_string,
+            flags=re.IGNORECASE
+        )
+        if constraint_match:
+            self.primary_keys[self._full_name(constraint_match.group(1))] = [column_name.strip().lower() for column_name in constraint_match.group(2).split(',')]
+            return LocalResult([Row(status='Statement executed successfully.')])
+
+        statement_type = sql_string.split(None, 1)[0].upper() if sql_string else ''
+        if statement_type == 'CREATE' and re.match(r'CREATE\s+(?:OR\s+REPLACE\s+)?TABLE\b', sql_string, flags=re.IGNORECASE):
+            sql_string = self._create_table(sql_string)
+        if statement_type == 'DROP':
+            drop_match = re.match(r'DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?([\w.]+)', sql_string, flags=re.IGNORECASE)
+            if drop_match:
+                self.primary_keys.pop(self._full_name(drop_match.group(1)), None)
+        if statement_type == 'MERGE':
+            sql_string = f'{sql_string} RETURNING merge_action'
+
+        cursor = self.connection.execute(sql_string)
+        if cursor.description is None:
+            return LocalResult([])
+        column_names = [column[0] for column in cursor.description]
+        rows = cursor.fetchall()
+
+        # Mirror the row count columns Snowflake returns for DML
+        if statement_type == 'MERGE':
+            actions = [row[0] for row in rows]
+            return LocalResult([Row(**{
+                'number of rows inserted': actions.count('INSERT'),
+                'number of rows updated': actions.count('UPDATE'),
+                'number of rows deleted': actions.count('DELETE')
+            })])
+        if statement_type in ('INSERT', 'UPDATE', 'DELETE'):
+            action = {'INSERT': 'inserted', 'UPDATE': 'updated', 'DELETE': 'deleted'}[statement_type]
+            return LocalResult([Row(**{f'number of rows {action}': rows[0][0] if rows else 0})])
+        if statement_type in ('CREATE', 'DROP', 'ALTER'):
+            return LocalResult([Row(status='Statement executed successfully.')])
+
+        # Snowflake upper-cases unquoted identifiers in result column names
+        build_row = Row._builder.build(*[column_name.upper() for column_name in column_names]).to_row()
+        return LocalResult([build_row(*row) for row in rows])
+
+    def call(self, proc_name: str, *args):
+        """Emulate the logging procedures TableUpdater calls.
+
+        Args:
+            proc_name: etl.logging (logger_name, log_level, batch_id, message) or
+                       etl.logging_batch (batch_id, JSON array of [logger_name, log_level, message])
+            *args: Procedure arguments
+
+        Returns:
+            str: Procedure status message
+        """
+        proc_name = '.'.join(proc_name.lower().split('.')[-2:])
+        if proc_name == 'etl.logging':
+            logger_name, log_level, batch_id, message = args
+            self.log_records.append({'logger_name': logger_name, 'log_level': log_level, 'batch_id': batch_id, 'message': message})
+            return 'Log entry created successfully'
+        if proc_name == 'etl.logging_batch':
+            batch_id, log_entries = args
+            for logger_name, log_level, message in json.loads(log_entries):
+                self.log_records.append({'logger_name': logger_name, 'log_level': log_level, 'batch_id': batch_id, 'message': message})
+            return f'{len(json.loads(log_entries))} log entries created successfully'
+        raise NotImplementedError(f'LocalSession does not emulate procedure: {proc_name}')
+
+    def close(self) -> None:
+        self.connection.close()
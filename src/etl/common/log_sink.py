@@ -0,0 +1,87 @@
+import json
+
+
+class ProcLogSink:
+    def __init__(self, session, batch_id: str, proc_name: str = 'etl.logging'):
+        """Log sink that calls the etl.logging procedure once per message.
+
+        Args:
+            session: Snowflake Snowpark session object
+            batch_id: Batch ID for logging and traceability
+            proc_name: Logging procedure to call
+        """
+        self.session = session
+        self.batch_id = batch_id
+        self.proc_name = proc_name
+
+    def log(self, logger_name: str, log_level: str, message: str) -> None:
+        """Write a single message straight to the logging procedure.
+
+        Args:
+            logger_name: Name of the logger (appears in Scope field for filtering)
+            log_level: Log level - 'info' or 'error'
+            message: The message to log
+        """
+        self.session.call(self.proc_name, logger_name, log_level, self.batch_id, message)
+
+    def flush(self) -> None:
+        """Nothing is buffered, so there is nothing to flush."""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+
+
+class BufferedLogSink(ProcLogSink):
+    def __init__(
+        self,
+        session,
+        batch_id: str,
+        proc_name: str = 'etl.logging_batch',
+        max_buffered_messages: int = 500
+    ):
+        """Log sink that buffers messages in memory and writes them with one procedure call per flush.
+
+        Messages keep the same logger name / log level / batch_id semantics as etl.logging,
+        they are just shipped together as a JSON array to etl.logging_batch.
+
+        Args:
+            session: Snowflake Snowpark session object
+            batch_id: Batch ID for logging and traceability
+            proc_name: Batch logging procedure to call on flush
+            max_buffered_messages: Flush automatically once this many messages are buffered
+        """
+        super().__init__(session, batch_id, proc_name)
+        self.max_buffered_messages = max_buffered_messages
+        self._buffer: list[list[str]] = []
+
+    def log(self, logger_name: str, log_level: str, message: str) -> None:
+        """Buffer a message until the next flush.
+
+        Args:
+            logger_name: Name of the logger (appears in Scope field for filtering)
+            log_level: Log level - 'info' or 'error'
+            message: The message to log
+        """
+        self._buffer.append([logger_name, log_level, message])
+        if len(self._buffer) >= self.max_buffered_messages:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered messages in a single procedure call."""
+        if not self._buffer:
+            return
+        self.session.call(self.proc_name, self.batch_id, json.dumps(self._buffer))
+        self._buffer = []
+
+
+class NullLogSink(ProcLogSink):
+    def __init__(self):
+        """Log sink that drops messages (e.g. SQL plan runs without a session) - TableUpdater still prints them."""
+        super().__init__(None, None)
+
+    def log(self, logger_name: str, log_level: str, message: str) -> None:
+        pass
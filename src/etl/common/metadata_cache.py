@@ -0,0 +1,212 @@
+import json
+import threading
+from collections import OrderedDict, deque
+from dataclasses import asdict, replace
+from datetime import datetime
+from typing import Callable
+
+try:
+    from src.etl.common.table_metadata import TableMetadata, load_table_metadata
+except ImportError:
+    from table_metadata import TableMetadata, load_table_metadata
+
+
+class TableMetadataCache:
+    def __init__(self, max_entries: int = 128, cache_table_suffix: str = 'table_metadata_cache'):
+        """Opt-in cache of TableMetadata across table_updater runs.
+
+        Two tiers, both keyed by fully qualified table name and validated against a schema fingerprint:
+        - In-process LRU (shared by every TableUpdater using this cache, e.g. multi-table runs)
+        - Persistent cache table {database}.{etl_schema}.table_metadata_cache, deployed from procs/metadata_cache.sql
+          (never created at runtime, so a warm proc call costs a single statement)
+
+        The fingerprint is a hash of the target table's LAST_DDL and the ETL view's LAST_ALTERED, so
+        DML from the loads themselves does not invalidate entries but any DDL (column or key changes,
+        view replacement) does. The fingerprint, session user, timestamp and cache table lookup are one
+        statement, so warm runs skip INFORMATION_SCHEMA.COLUMNS and SHOW PRIMARY KEYS entirely.
+
+        Every lookup logs its result through the log callable (TableUpdater's log sink), which
+        etl.vw_table_metadata_cache_lookups / etl.vw_table_metadata_cache_stats read back across runs.
+
+        Args:
+            max_entries: Maximum number of tables held in the in-process LRU
+            cache_table_suffix: Name of the cache table inside the ETL schema
+        """
+        self.max_entries = max_entries
+        self.cache_table_suffix = cache_table_suffix
+        self._entries: OrderedDict[str, tuple[str, TableMetadata]] = OrderedDict()
+        self._lookups: deque[dict] = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        session,
+        table_name: str,
+        database_name: str = 'learning_db',
+        schema_name: str = 'dw',
+        etl_schema_name: str = 'etl',
+        log: Callable[[str], None] | None = None
+    ) -> TableMetadata:
+        """Return metadata for a table, loading and caching it only when the schema fingerprint changed.
+
+        Args:
+            session: Snowflake Snowpark session object
+            table_name: Name of the target table (ETL view name is vw_{table_name})
+            database_name: Target database name
+            schema_name: Target schema name for dimension/fact tables
+            etl_schema_name: Schema containing ETL views and the cache table
+            log: Optional logging callable for the hit/miss message
+
+        Returns:
+            TableMetadata: Metadata with the current session user and timestamp
+        """
+        full_table_name = f'{database_name}.{schema_name}.{table_name}'.lower()
+        cache_table_name = f'{database_name}.{etl_schema_name}.{self.cache_table_suffix}'
+
+        row = session.sql(f"""
+        WITH fingerprint AS (
+            SELECT
+                 CURRENT_USER() AS current_username
+                ,CONVERT_TIMEZONE('America/Los_Angeles', 'America/Chicago', CURRENT_TIMESTAMP())::TIMESTAMP_NTZ AS current_datetime_cst
+                ,(
+                    SELECT MAX(LAST_DDL)::STRING
+                    FROM INFORMATION_SCHEMA.TABLES
+                    WHERE TABLE_CATALOG = UPPER('{database_name}')
+                    AND TABLE_SCHEMA = UPPER('{schema_name}')
+                    AND TABLE_NAME = UPPER('{table_name}')
+                ) AS table_last_ddl
+                ,(
+                    SELECT MAX(LAST_ALTERED)::STRING
+                    FROM INFORMATION_SCHEMA.VIEWS
+                    WHERE TABLE_CATALOG = UPPER('{database_name}')
+                    AND TABLE_SCHEMA = UPPER('{etl_schema_name}')
+                    AND TABLE_NAME = UPPER('vw_{table_name}')
+                ) AS view_last_altered
+        )
+        SELECT
+             f.current_username
+            ,f.current_datetime_cst
+            ,f.table_last_ddl
+            ,f.view_last_altered
+            ,SHA1(COALESCE(f.table_last_ddl, '') || '|' || COALESCE(f.view_last_altered, '')) AS schema_fingerprint
+            ,c.table_metadata::STRING AS cached_table_metadata
+        FROM fingerprint f
+        LEFT JOIN {cache_table_name} c
+            ON c.full_table_name = '{full_table_name}'
+            AND c.schema_fingerprint = SHA1(COALESCE(f.table_last_ddl, '') || '|' || COALESCE(f.view_last_altered, ''))
+        """).collect()[0]
+        current_username, current_datetime_cst, table_last_ddl, view_last_altered, schema_fingerprint, cached_table_metadata = row
+
+        # Never cache a missing table/view - fall through so TableUpdater validation reports it
+        if table_last_ddl is None or view_last_altered is None:
+            self._record(full_table_name, 'uncacheable', schema_fingerprint, log)
+            return load_table_metadata(session, table_name, database_name, schema_name, etl_schema_name)
+
+        with self._lock:
+            entry = self._entries.get(full_table_name)
+            if entry is not None and entry[0] == schema_fingerprint:
+                self._entries.move_to_end(full_table_name)
+                metadata = entry[1]
+            else:
+                metadata = None
+
+        if metadata is not None:
+            result = 'memory_hit'
+        elif cached_table_metadata is not None:
+            result = 'table_hit'
+            metadata = TableMetadata(**json.loads(cached_table_metadata), current_username=current_username, current_datetime_cst=current_datetime_cst)
+            self._put(full_table_name, schema_fingerprint, metadata)
+        else:
+            result = 'miss'
+            metadata = load_table_metadata(session, table_name, database_name, schema_name, etl_schema_name)
+            self._put(full_table_name, schema_fingerprint, metadata)
+            self._write_cache_table(session, cache_table_name, full_table_name, schema_fingerprint, metadata)
+
+        self._record(full_table_name, result, schema_fingerprint, log)
+        return replace(metadata, current_username=current_username, current_datetime_cst=current_datetime_cst)
+
+    def invalidate(self, full_table_name: str | None = None) -> None:
+        """Drop one table (or every table) from the in-process LRU.
+
+        The cache table is self-invalidating through the fingerprint, so it is left alone.
+
+        Args:
+            full_table_name: database.schema.table to drop, or None to clear everything
+        """
+        with self._lock:
+            if full_table_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(full_table_name.lower(), None)
+
+    def debug_view(self) -> list[dict]:
+        """List this process's recent cache lookups (oldest first) - etl.vw_table_metadata_cache_lookups has all runs.
+
+        Returns:
+            list[dict]: One dict per lookup with full_table_name, result, schema_fingerprint and lookup_datetime.
+                        result is one of 'memory_hit', 'table_hit', 'miss' or 'uncacheable'.
+        """
+        with self._lock:
+            return list(self._lookups)
+
+    def stats(self) -> dict:
+        """Summarize recent lookups as hit/miss counts.
+
+        Returns:
+            dict: Counts of hits, misses and the hit rate over the recorded lookups
+        """
+        lookups = self.debug_view()
+        hits = sum(1 for lookup in lookups if lookup['result'].endswith('_hit'))
+        misses = len(lookups) - hits
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / len(lookups) if lookups else 0.0,
+            'cached_tables': len(self._entries)
+        }
+
+    def _put(self, full_table_name: str, schema_fingerprint: str, metadata: TableMetadata) -> None:
+        """Insert into the in-process LRU, evicting the least recently used table if full."""
+        with self._lock:
+            self._entries[full_table_name] = (schema_fingerprint, metadata)
+            self._entries.move_to_end(full_table_name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _record(self, full_table_name: str, result: str, schema_fingerprint: str | None, log: Callable[[str], None] | None) -> None:
+        """Record a lookup for debug_view() and optionally log it."""
+        with self._lock:
+            self._lookups.append({
+                'full_table_name': full_table_name,
+                'result': result,
+                'schema_fingerprint': schema_fingerprint,
+                'lookup_datetime': datetime.now().isoformat()
+            })
+        if log is not None:
+            log(f'Table metadata cache {result} for {full_table_name} (fingerprint={schema_fingerprint})')
+
+    def _write_cache_table(self, session, cache_table_name: str, full_table_name: str, schema_fingerprint: str, metadata: TableMetadata) -> None:
+        """Upsert the structural part of the metadata into the cache table."""
+        cached_fields = {key: value for key, value in asdict(metadata).items() if key not in ('current_username', 'current_datetime_cst')}
+        metadata_json = json.dumps(cached_fields).replace("'", "''")
+        session.sql(f"""
+        MERGE INTO {cache_table_name} as target
+        USING (
+            SELECT
+                 '{full_table_name}' AS full_table_name
+                ,'{schema_fingerprint}' AS schema_fingerprint
+                ,PARSE_JSON('{metadata_json}') AS table_metadata
+                ,CAST('{metadata.current_datetime_cst}' AS TIMESTAMP_NTZ) AS cached_datetime
+        ) as source
+        ON target.full_table_name = source.full_table_name
+        WHEN MATCHED THEN UPDATE SET
+             target.schema_fingerprint = source.schema_fingerprint
+            ,target.table_metadata = source.table_metadata
+            ,target.cached_datetime = source.cached_datetime
+        WHEN NOT MATCHED THEN INSERT (full_table_name, schema_fingerprint, table_metadata, cached_datetime)
+        VALUES (source.full_table_name, source.schema_fingerprint, source.table_metadata, source.cached_datetime)
+        """).collect()
+
+
+# Shared in-process cache so multi-table runs in the same process reuse each other's lookups
+default_metadata_cache = TableMetadataCache()
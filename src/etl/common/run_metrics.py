@@ -0,0 +1,126 @@
+import hashlib
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+
+@dataclass
+class PhaseMetric:
+    """Timing and row counts of one statement issued by a TableUpdater phase.
+
+    Attributes:
+        statement_sequence: 1-based position of the statement in the run
+        phase: TableUpdater phase that issued the statement (e.g. 'identify_upserts', 'table_inserts')
+        chunk_number: 1-based chunk number while chunking, otherwise None
+        statement_hash: SHA1 of the statement text (stable across runs with the same generated SQL)
+        query_id: Snowflake query id (None when the backend can't report one)
+        start_datetime_utc: Statement start
+        end_datetime_utc: Statement end
+        duration_seconds: Wall time of the statement
+        rows_returned: Number of result rows
+        rows_inserted: Rows inserted according to the MERGE/INSERT result
+        rows_updated: Rows updated according to the MERGE result
+        rows_deleted: Rows deleted according to the MERGE/DELETE result
+    """
+    statement_sequence: int
+    phase: str
+    chunk_number: int | None
+    statement_hash: str
+    query_id: str | None
+    start_datetime_utc: datetime
+    end_datetime_utc: datetime
+    duration_seconds: float
+    rows_returned: int
+    rows_inserted: int
+    rows_updated: int
+    rows_deleted: int
+
+    def to_dict(self) -> dict:
+        """JSON-friendly representation (datetimes as ISO strings)."""
+        return {
+            **asdict(self),
+            'start_datetime_utc': self.start_datetime_utc.isoformat(),
+            'end_datetime_utc': self.end_datetime_utc.isoformat()
+        }
+
+
+def statement_hash(sql_string: str) -> str:
+    """SHA1 of a statement with whitespace normalized, so indentation changes don't change the hash."""
+    return hashlib.sha1(' '.join(sql_string.split()).encode('utf-8')).hexdigest()
+
+
+def _sql_literal(value) -> str:
+    if value is None:
+        return 'NULL'
+    if isinstance(value, datetime):
+        return f"CAST('{value.isoformat(sep=' ')}' AS TIMESTAMP_NTZ)"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class RunMetricsStore:
+    def __init__(self, backend, metrics_table_name: str):
+        """Per-phase run metrics of TableUpdater runs, kept in an etl table for dashboards.
+
+        One row per statement, so metrics can be aggregated by table, phase, batch or query id.
+
+        Args:
+            backend: Execution backend (SessionBackend or PlanBackend)
+            metrics_table_name: Fully qualified metrics table name (e.g. learning_db.etl.etl_run_metrics)
+        """
+        self.backend = backend
+        self.metrics_table_name = metrics_table_name
+
+    def ensure_metrics_table(self) -> None:
+        """Create the metrics table if it does not exist yet."""
+        self.backend.execute(f"""
+        CREATE TABLE IF NOT EXISTS {self.metrics_table_name} (
+             table_name STRING
+            ,batch_name STRING
+            ,table_type STRING
+            ,execution_mode STRING
+            ,statement_sequence NUMBER
+            ,phase STRING
+            ,chunk_number NUMBER
+            ,statement_hash STRING
+            ,query_id STRING
+            ,start_datetime_utc TIMESTAMP_NTZ
+            ,end_datetime_utc TIMESTAMP_NTZ
+            ,duration_seconds FLOAT
+            ,rows_returned NUMBER
+            ,rows_inserted NUMBER
+            ,rows_updated NUMBER
+            ,rows_deleted NUMBER
+        )
+        """, 'run_metrics')
+
+    def save(self, full_table_name: str, batch_id: str, table_type: str, execution_mode: str, metrics: list[PhaseMetric]) -> None:
+        """Insert a run's metrics in a single statement.
+
+        Args:
+            full_table_name: Fully qualified target table name
+            batch_id: Batch ID of the run
+            table_type: 'dim_type_1', 'dim_type_2' or 'fact'
+            execution_mode: 'staged' or 'fused'
+            metrics: Metrics collected by the run
+        """
+        if not metrics:
+            return
+        value_rows = []
+        for metric in metrics:
+            values = [
+                full_table_name.lower(), batch_id, table_type, execution_mode,
+                metric.statement_sequence, metric.phase, metric.chunk_number, metric.statement_hash, metric.query_id,
+                metric.start_datetime_utc, metric.end_datetime_utc, metric.duration_seconds,
+                metric.rows_returned, metric.rows_inserted, metric.rows_updated, metric.rows_deleted
+            ]
+            value_rows.append(f"({', '.join([_sql_literal(value) for value in values])})")
+        values_sql = '\n        ,'.join(value_rows)
+        self.backend.execute(f"""
+        INSERT INTO {self.metrics_table_name} (
+             table_name, batch_name, table_type, execution_mode, statement_sequence, phase, chunk_number, statement_hash, query_id
+            ,start_datetime_utc, end_datetime_utc, duration_seconds, rows_returned, rows_inserted, rows_updated, rows_deleted
+        )
+        VALUES
+        {values_sql}
+        """, 'run_metrics')
@@ -0,0 +1,173 @@
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+
+
+@dataclass
+class TableMetadata:
+    """Everything TableUpdater needs to know about a target table and its ETL view.
+
+    Attributes:
+        database_name: Target database name
+        schema_name: Target schema name for dimension/fact tables
+        etl_schema_name: Schema containing ETL views and staging tables
+        table_name: Name of the target table
+        current_username: CURRENT_USER() of the session that loaded the metadata
+        current_datetime_cst: Current timestamp converted to America/Chicago (TIMESTAMP_NTZ)
+        table_exists: Whether the target table exists in INFORMATION_SCHEMA.TABLES
+        view_exists: Whether vw_{table_name} exists in INFORMATION_SCHEMA.VIEWS
+        table_columns: Lowercase target table column names in ordinal order
+        view_columns: Lowercase ETL view column names in ordinal order
+        natural_keys: Lowercase primary key (natural key) column names of the target table
+        table_column_types: Target table column name -> INFORMATION_SCHEMA data type (e.g. 'TEXT', 'BINARY', 'NUMBER')
+        view_column_types: ETL view column name -> INFORMATION_SCHEMA data type
+    """
+    database_name: str
+    schema_name: str
+    etl_schema_name: str
+    table_name: str
+    current_username: str
+    current_datetime_cst: datetime
+    table_exists: bool
+    view_exists: bool
+    table_columns: list[str] = field(default_factory=list)
+    view_columns: list[str] = field(default_factory=list)
+    natural_keys: list[str] = field(default_factory=list)
+    table_column_types: dict[str, str] = field(default_factory=dict)
+    view_column_types: dict[str, str] = field(default_factory=dict)
+
+
+# INFORMATION_SCHEMA data types (Snowflake, plus DuckDB for LocalSession) by row hash storage type
+HASH_STORAGE_DATA_TYPES = {
+    'STRING': ('TEXT', 'VARCHAR', 'STRING', 'CHAR', 'CHARACTER'),
+    'BINARY': ('BINARY', 'VARBINARY', 'BLOB'),
+    'NUMBER': ('NUMBER', 'DECIMAL', 'NUMERIC', 'FIXED', 'INT', 'INTEGER', 'BIGINT', 'HUGEINT', 'UBIGINT')
+}
+
+
+def hash_storage_type(data_type: str | None) -> str | None:
+    """Row hash storage type ('STRING', 'BINARY' or 'NUMBER') of an INFORMATION_SCHEMA data type (None if unknown)."""
+    if not data_type:
+        return None
+    base_type = data_type.upper().split('(')[0].strip()
+    for storage_type, data_types in HASH_STORAGE_DATA_TYPES.items():
+        if base_type in data_types:
+            return storage_type
+    return None
+
+
+def _parse_column_array(value) -> list[str]:
+    """Convert an ARRAY_AGG result (JSON string from Snowpark, or list) to lowercase column names."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = json.loads(value)
+    return [column_name.lower() for column_name in value]
+
+
+def _parse_data_type_array(value) -> list[str]:
+    """Convert an ARRAY_AGG of DATA_TYPE values to uppercase type names."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = json.loads(value)
+    return [data_type.upper() for data_type in value]
+
+
+def load_table_metadata(
+    session,
+    table_name: str,
+    database_name: str = 'learning_db',
+    schema_name: str = 'dw',
+    etl_schema_name: str = 'etl'
+) -> TableMetadata:
+    """Load table/view metadata in one combined query plus SHOW PRIMARY KEYS.
+
+    Replaces the separate CURRENT_USER, timestamp, INFORMATION_SCHEMA.COLUMNS (table and view),
+    INFORMATION_SCHEMA.TABLES and INFORMATION_SCHEMA.VIEWS round trips with a single statement (column data types
+    come along, so row hash storage types can be detected without another query).
+    Primary keys are only available through SHOW PRIMARY KEYS, so that stays a second statement
+    (skipped when the table does not exist).
+
+    Args:
+        session: Snowflake Snowpark session object
+        table_name: Name of the target table (ETL view name is vw_{table_name})
+        database_name: Target database name
+        schema_name: Target schema name for dimension/fact tables
+        etl_schema_name: Schema containing ETL views
+
+    Returns:
+        TableMetadata: Typed metadata for the table and its ETL view
+    """
+    row = session.sql(f"""
+    SELECT
+         CURRENT_USER() AS current_username
+        ,CONVERT_TIMEZONE('America/Los_Angeles', 'America/Chicago', CURRENT_TIMESTAMP())::TIMESTAMP_NTZ AS current_datetime_cst
+        ,(
+            SELECT COUNT(*)
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_CATALOG = UPPER('{database_name}')
+            AND TABLE_SCHEMA = UPPER('{schema_name}')
+            AND TABLE_NAME = UPPER('{table_name}')
+        ) AS table_count
+        ,(
+            SELECT COUNT(*)
+            FROM INFORMATION_SCHEMA.VIEWS
+            WHERE TABLE_CATALOG = UPPER('{database_name}')
+            AND TABLE_SCHEMA = UPPER('{etl_schema_name}')
+            AND TABLE_NAME = UPPER('vw_{table_name}')
+        ) AS view_count
+        ,(
+            SELECT ARRAY_AGG(COLUMN_NAME) WITHIN GROUP (ORDER BY ORDINAL_POSITION)
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_CATALOG = UPPER('{database_name}')
+            AND TABLE_SCHEMA = UPPER('{schema_name}')
+            AND TABLE_NAME = UPPER('{table_name}')
+        ) AS table_columns
+        ,(
+            SELECT ARRAY_AGG(COLUMN_NAME) WITHIN GROUP (ORDER BY ORDINAL_POSITION)
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_CATALOG = UPPER('{database_name}')
+            AND TABLE_SCHEMA = UPPER('{etl_schema_name}')
+            AND TABLE_NAME = UPPER('vw_{table_name}')
+        ) AS view_columns
+        ,(
+            SELECT ARRAY_AGG(DATA_TYPE) WITHIN GROUP (ORDER BY ORDINAL_POSITION)
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_CATALOG = UPPER('{database_name}')
+            AND TABLE_SCHEMA = UPPER('{schema_name}')
+            AND TABLE_NAME = UPPER('{table_name}')
+        ) AS table_column_types
+        ,(
+            SELECT ARRAY_AGG(DATA_TYPE) WITHIN GROUP (ORDER BY ORDINAL_POSITION)
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_CATALOG = UPPER('{database_name}')
+            AND TABLE_SCHEMA = UPPER('{etl_schema_name}')
+            AND TABLE_NAME = UPPER('vw_{table_name}')
+        ) AS view_column_types
+    """).collect()[0]
+
+    table_columns = _parse_column_array(row[4])
+    view_columns = _parse_column_array(row[5])
+
+    # SHOW PRIMARY KEYS errors on a missing table, so only run it when there is a table to inspect
+    natural_keys = []
+    if table_columns:
+        primary_key_rows = session.sql(f'SHOW PRIMARY KEYS IN TABLE {database_name}.{schema_name}.{table_name}').collect()
+        natural_keys = [pk_row.column_name.lower() for pk_row in primary_key_rows]
+
+    return TableMetadata(
+        database_name=database_name,
+        schema_name=schema_name,
+        etl_schema_name=etl_schema_name,
+        table_name=table_name,
+        current_username=row[0],
+        current_datetime_cst=row[1],
+        table_exists=row[2] > 0,
+        view_exists=row[3] > 0,
+        table_columns=table_columns,
+        view_columns=view_columns,
+        natural_keys=natural_keys,
+        table_column_types=dict(zip(table_columns, _parse_data_type_array(row[6]))),
+        view_column_types=dict(zip(view_columns, _parse_data_type_array(row[7])))
+    )
@@ -0,0 +1,137 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+try:
+    from src.etl.common.table_updater import main as table_updater_main
+except ImportError:
+    from table_updater import main as table_updater_main
+
+
+@dataclass
+class TableRunResult:
+    """Outcome of a single table's TableUpdater pipeline.
+
+    Attributes:
+        table_name: Name of the target table
+        succeeded: Whether the pipeline completed without raising
+        summary: Summary string returned by main() (None on failure)
+        error: Error message (None on success)
+        worker_name: Thread that ran the table
+        start_time: Seconds from the start of the run until this table started
+        duration_seconds: Wall time for the table
+    """
+    table_name: str
+    succeeded: bool
+    summary: str | None
+    error: str | None
+    worker_name: str
+    start_time: float
+    duration_seconds: float
+
+
+@dataclass
+class RunTablesResult:
+    """Outcome of a run_tables() call.
+
+    Attributes:
+        max_workers: Size of the thread pool
+        duration_seconds: Wall time for the whole run
+        results: Per-table results, in the order the tables were passed in
+    """
+    max_workers: int
+    duration_seconds: float
+    results: list[TableRunResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> list[TableRunResult]:
+        return [result for result in self.results if result.succeeded]
+
+    @property
+    def failed(self) -> list[TableRunResult]:
+        return [result for result in self.results if not result.succeeded]
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable representation of the run."""
+        return asdict(self)
+
+
+def run_tables(
+    session_factory: Callable[[], object],
+    tables: list[str | dict],
+    max_workers: int = 4,
+    use_metadata_cache: bool = False,
+    close_sessions: bool = True,
+    table_runner: Callable[..., str] = table_updater_main
+) -> RunTablesResult:
+    """Run independent TableUpdater pipelines concurrently on a thread pool.
+
+    Snowpark sessions are not safe to share across threads, so each worker thread lazily creates its
+    own session from session_factory and reuses it for every table it picks up. Tables must not
+    depend on each other (use the DAG for dims -> facts ordering). A failing table does not stop the
+    others; its error is captured in the result.
+
+    Args:
+        session_factory: Zero-argument callable returning a new session (e.g. config.get_session)
+        tables: Table names, or dicts with 'table_name' plus extra main() kwargs
+                (e.g. {'table_name': 'dim_employee', 'type_1_column_names': 'email'})
+        max_workers: Number of worker threads (and sessions)
+        use_metadata_cache: Share the in-process metadata cache across all tables
+        close_sessions: Close the worker sessions once all tables have finished
+        table_runner: Pipeline entry point, defaults to table_updater.main
+
+    Returns:
+        RunTablesResult: Per-table timings, summaries and errors
+    """
+    table_specs = [{'table_name': table} if isinstance(table, str) else dict(table) for table in tables]
+    worker_state = threading.local()
+    created_sessions = []
+    created_sessions_lock = threading.Lock()
+    run_start = time.perf_counter()
+
+    def get_worker_session():
+        if not hasattr(worker_state, 'session'):
+            worker_state.session = session_factory()
+            with created_sessions_lock:
+                created_sessions.append(worker_state.session)
+        return worker_state.session
+
+    def run_one(table_spec: dict) -> TableRunResult:
+        table_start = time.perf_counter()
+        table_kwargs = {key: value for key, value in table_spec.items() if key != 'table_name'}
+        if use_metadata_cache:
+            table_kwargs.setdefault('use_metadata_cache', True)
+        try:
+            summary = table_runner(get_worker_session(), table_spec['table_name'], **table_kwargs)
+            succeeded, error = True, None
+        except Exception as e:
+            summary, succeeded, error = None, False, str(e)
+        return TableRunResult(
+            table_name=table_spec['table_name'],
+            succeeded=succeeded,
+            summary=summary,
+            error=error,
+            worker_name=threading.current_thread().name,
+            start_time=table_start - run_start,
+            duration_seconds=time.perf_counter() - table_start
+        )
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='table_runner') as executor:
+            results = list(executor.map(run_one, table_specs))
+    finally:
+        if close_sessions:
+            for session in created_sessions:
+                try:
+                    session.close()
+                except:
+                    pass  # Don't fail the run if a session is already gone
+
+    run_result = RunTablesResult(max_workers=max_workers, duration_seconds=time.perf_counter() - run_start, results=results)
+    for result in run_result.results:
+        status = 'succeeded' if result.succeeded else f'failed: {result.error}'
+        print(f'{result.table_name} [{result.worker_name}] {result.duration_seconds:.2f}s {status}')
+    print(f'{len(run_result.succeeded)}/{len(run_result.results)} tables succeeded in {run_result.duration_seconds:.2f}s with {max_workers} workers')
+    return run_result
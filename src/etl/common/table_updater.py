@@ -1,8 +1,26 @@
 import json
+import re
+import time
 import uuid
-from datetime import datetime
-from functools import partial
-from snowflake.snowpark.row import Row
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+try:
+    from src.etl.common.log_sink import ProcLogSink, BufferedLogSink, NullLogSink
+    from src.etl.common.execution_backend import SessionBackend, PlanBackend
+    from src.etl.common.table_metadata import TableMetadata, hash_storage_type, load_table_metadata
+    from src.etl.common.metadata_cache import TableMetadataCache, default_metadata_cache
+    from src.etl.common.watermark import WatermarkStore
+    from src.etl.common.chunking import ChunkProgressStore, ChunkSpec, plan_hash_chunks, plan_range_chunks
+    from src.etl.common.run_metrics import PhaseMetric, RunMetricsStore, statement_hash
+except ImportError:
+    from log_sink import ProcLogSink, BufferedLogSink, NullLogSink
+    from execution_backend import SessionBackend, PlanBackend
+    from table_metadata import TableMetadata, hash_storage_type, load_table_metadata
+    from metadata_cache import TableMetadataCache, default_metadata_cache
+    from watermark import WatermarkStore
+    from chunking import ChunkProgressStore, ChunkSpec, plan_hash_chunks, plan_range_chunks
+    from run_metrics import PhaseMetric, RunMetricsStore, statement_hash
 
 class TableUpdater:
     def __init__(
@@ -14,15 +32,30 @@ class TableUpdater:
         schema_name: str = 'dw',
         src_schema_name: str = 'src',
         etl_schema_name: str = 'etl',
-        type_1_column_names: str | None = None
-
+        type_1_column_names: str | None = None,
+        log_sink: ProcLogSink | None = None,
+        table_metadata: TableMetadata | None = None,
+        metadata_cache: TableMetadataCache | None = None,
+        execution_mode: str = 'staged',
+        staging_strategy: str = 'temporary',
+        watermark_column: str | None = None,
+        full_reconcile: bool = False,
+        full_reconcile_days: int | None = None,
+        chunk_count: int | None = None,
+        chunk_column: str | None = None,
+        backend: SessionBackend | PlanBackend | None = None,
+        type_1_history_full_scan: bool = False,
+        type_1_compare_columns_only: bool = False,
+        enable_deletes: bool = False,
+        max_delete_percentage: float | None = None,
+        delete_mode: str = 'hard'
     ):
         """Updater class that upserts data from ETL view to data warehouse table.
         
         Supports dimension tables (Type 1 and Type 2 SCD) and fact tables.
 
         Args:
-            session: Snowflake Snowpark session object
+            session: Snowflake Snowpark session object (may be None with a PlanBackend and table_metadata fixture)
             table_name: Name of the target table (ETL view name will be inferred as vw_{table_name})
             batch_id: Batch ID for logging and traceability
             database_name: Target database name
@@ -31,13 +64,44 @@ class TableUpdater:
             etl_schema_name: Schema containing ETL views and staging tables
             type_1_column_names: Comma-separated list of Type 1 column names for Type 2 dimensions
                                  (enables historical row updates for these columns)
+            log_sink: Optional log sink (e.g. BufferedLogSink) - defaults to one etl.logging call per message
+            table_metadata: Optional pre-loaded TableMetadata - loaded with load_table_metadata() if not provided
+            metadata_cache: Optional TableMetadataCache - reuses metadata across runs until the table/view DDL changes
+            execution_mode: 'staged' (staging table + separate MERGEs, easiest to debug) or 'fused'
+                            (single MERGE straight from the view for dim_type_1 and fact; staging plus one
+                            expire/update/insert MERGE for dim_type_2)
+            staging_strategy: 'temporary' (default, session scoped), 'transient' (zero retention) or 'permanent'
+                              ({table_name}_updates kept for debugging) - temporary/transient tables get a
+                              per-batch name and are dropped by cleanup_staging_tables()
+            watermark_column: Optional ETL view column (e.g. source modified timestamp or monotonic id) -
+                              enables incremental mode, only rows past the stored high-water mark are scanned
+            full_reconcile: Scan the full view this run (still records the new high-water mark)
+            full_reconcile_days: Automatically do a full reconcile when the last one is at least this many days old
+            chunk_count: Optional number of chunks for process_chunks() - each chunk is staged and merged separately
+            chunk_column: Optional ETL view partition column (e.g. a date) to chunk by range - defaults to
+                          natural key hash buckets
+            backend: Optional execution backend - defaults to SessionBackend(session); PlanBackend records the
+                     statements instead of running them
+            type_1_history_full_scan: Propagate Type 1 columns across the whole dim_type_2 history (e.g. after adding
+                                      Type 1 columns) instead of only the natural keys changed in this batch
+            type_1_compare_columns_only: Detect stale historical rows by comparing only type_1_column_names
+                                         instead of the whole etl_row_hash_value
+            enable_deletes: Delete target rows that no longer exist in the ETL view (hard deletes: fact tables only)
+            max_delete_percentage: Abort before deleting when more than this percentage of the target rows would be
+                                   deleted (None disables the check)
+            delete_mode: 'hard' (default) physically deletes fact rows, 'soft' flags rows of any table type with
+                         is_deleted/deleted_batch_name (closing the current row of dim_type_2)
         """
 
-        # Bind session for all future uses
+        # Bind session and execution backend for all future uses
         self.session = session
+        self.backend = backend if backend is not None else SessionBackend(session)
 
-        # Setup logging helper - pre-fills procedure name, logger name, log level, and batch_id
-        self._log_caller = partial(self.session.call, 'etl.logging', f'TABLE_UPDATER:{database_name}.{schema_name}.{table_name}', 'info', batch_id)
+        # Setup logging sink - buffered sinks are flushed at the end of each phase
+        self.logger_name = f'TABLE_UPDATER:{database_name}.{schema_name}.{table_name}'
+        if log_sink is None:
+            log_sink = ProcLogSink(session, batch_id) if session is not None else NullLogSink()
+        self.log_sink = log_sink
         self._log(f'Logger setup.')
 
         # Log initialization
@@ -49,24 +113,29 @@ class TableUpdater:
         self.database_name = database_name
         self.schema_name = schema_name
         self.etl_schema_name = etl_schema_name
-        self.current_username = self.session.sql("SELECT CURRENT_USER() AS current_user").collect()[0][0]
-        self.current_datetime_cst = self.session.sql("SELECT CONVERT_TIMEZONE('America/Los_Angeles', 'America/Chicago', CURRENT_TIMESTAMP())::TIMESTAMP_NTZ AS current_time_cst").collect()[0][0]
+
+        # Table/view metadata, session user and timestamp in one combined round trip (or from the cache)
+        if table_metadata is not None:
+            self.metadata = table_metadata
+        elif metadata_cache is not None:
+            self.metadata = metadata_cache.get(self.session, table_name, database_name, schema_name, etl_schema_name, log=self._log)
+        else:
+            self.metadata = load_table_metadata(self.session, table_name, database_name, schema_name, etl_schema_name)
+        self.current_username = self.metadata.current_username
+        self.current_datetime_cst = self.metadata.current_datetime_cst
         self.full_table_name = f'{database_name}.{schema_name}.{self.table_name}'
         self.etl_view_name = f'{database_name}.{etl_schema_name}.vw_{self.table_name}'
         self.table_primary_key_column_name = f'{self.table_name}_key'
-        self.updates_table_name = f'{database_name}.{etl_schema_name}.{self.table_name}_updates'
+
+        # Staging tables - permanent keeps the fixed debug name, otherwise unique per batch so overlapping runs don't collide
+        assert staging_strategy in ('temporary', 'transient', 'permanent'), f"Unknown staging_strategy '{staging_strategy}', expected 'temporary', 'transient' or 'permanent'"
+        self.staging_strategy = staging_strategy
+        self.staging_table_suffix = '' if staging_strategy == 'permanent' else '_' + re.sub(r'[^0-9a-zA-Z_]', '_', batch_id).lower()
+        self.updates_table_name = f'{database_name}.{etl_schema_name}.{self.table_name}_updates{self.staging_table_suffix}'
+        self.staging_tables: list[str] = []
 
         # Full Column Listing
-        column_listing: list[Row] = self.session.sql(f"""
-        SELECT COLUMN_NAME
-        FROM INFORMATION_SCHEMA.COLUMNS
-        WHERE
-            TABLE_CATALOG = UPPER('{database_name}')
-        AND TABLE_SCHEMA = UPPER('{schema_name}')
-        AND TABLE_NAME = UPPER('{self.table_name}')
-        ORDER BY ORDINAL_POSITION;
-        """).collect()
-        column_listing = [row.COLUMN_NAME.lower() for row in column_listing]
+        column_listing = self.metadata.table_columns
         
         # Early validation: table must exist
         assert len(column_listing) > 0, f"Target table does not exist or has no columns: {self.full_table_name}"
@@ -74,13 +143,17 @@ class TableUpdater:
         # Infer table type (including dimension SCD type)
         self.table_type = self._infer_table_type(column_listing)
 
+        # Row hash storage type (STRING, BINARY or NUMBER) - the view must produce the same type, see _perform_validation_checks
+        self.hash_storage_type = hash_storage_type(self.metadata.table_column_types.get('etl_row_hash_value')) or 'STRING'
+
         # Determine primary keys and join strings
-        table_natural_keys_list: list[Row] = self.session.sql(f'SHOW PRIMARY KEYS IN TABLE {self.full_table_name}').collect()
-        self.table_natural_keys_list = [row.column_name.lower() for row in table_natural_keys_list]
+        self.table_natural_keys_list = self.metadata.natural_keys
         self.natural_key_join_string = ' AND '.join([f'source.{natural_key_column_name} = target.{natural_key_column_name}' for natural_key_column_name in self.table_natural_keys_list])
         # Audit columns that are managed by the ETL process, not from source data
         self.audit_columns = ['create_username', 'create_datetime', 'create_batch_name', 'last_update_username', 'last_update_datetime', 'last_update_batch_name']
-        self.update_table_columns = [column_name for column_name in column_listing if column_name not in (self.table_primary_key_column_name, *self.audit_columns)]
+        # Soft delete columns are ETL-managed like the audit columns (reset on every upsert, set by soft deletes)
+        self.soft_delete_columns = [column_name for column_name in ('is_deleted', 'deleted_batch_name') if column_name in column_listing]
+        self.update_table_columns = [column_name for column_name in column_listing if column_name not in (self.table_primary_key_column_name, *self.audit_columns, *self.soft_delete_columns)]
         self.insert_columns = [column_name for column_name in column_listing if column_name not in (self.table_primary_key_column_name)]
         
         # Type 2 SCD support for dimensions
@@ -94,11 +167,47 @@ class TableUpdater:
             self.update_hash_columns = [column_name for column_name in column_listing if column_name not in (self.table_primary_key_column_name, 'create_username', 'create_datetime', 'create_batch_name') and column_name not in self.table_natural_keys_list and column_name not in type2_tracking_cols]
             # Type 1 columns for historical row updates (Kimball-correct behavior)
             self.type_1_column_names = type_1_column_names.split(',') if type_1_column_names else []
+            self.type_1_history_full_scan = type_1_history_full_scan
+            self.type_1_compare_columns_only = type_1_compare_columns_only
         else:
             self.source_select_columns = self.update_table_columns
             self.update_hash_columns = [column_name for column_name in column_listing if column_name not in (self.table_primary_key_column_name, 'create_username', 'create_datetime', 'create_batch_name') and column_name not in self.table_natural_keys_list]
             self.type_1_column_names = []  # Not applicable for non-Type 2 tables
 
+        # Execution mode - fused MERGE skips the staging table (dim_type_2 keeps staging but fuses expire/update/insert)
+        assert execution_mode in ('staged', 'fused'), f"Unknown execution_mode '{execution_mode}', expected 'staged' or 'fused'"
+        self.execution_mode = execution_mode
+        self.change_counts: dict[str, int] | None = None
+
+        # Delete detection against the full view, guarded by a row count threshold - hard deletes use one anti-join
+        # DELETE, soft deletes ride along in the staged update MERGE (or one MERGE of their own when not staging)
+        assert delete_mode in ('hard', 'soft'), f"Unknown delete_mode '{delete_mode}', expected 'hard' or 'soft'"
+        self.enable_deletes = enable_deletes
+        self.max_delete_percentage = max_delete_percentage
+        self.delete_mode = delete_mode
+        self.delete_count: int | None = None
+
+        # Incremental (watermark) mode - window is resolved at the start of the upsert phase
+        self.watermark_column = watermark_column.lower() if watermark_column else None
+        self.full_reconcile = full_reconcile
+        self.full_reconcile_days = full_reconcile_days
+        self.watermark_store = WatermarkStore(self.backend, f'{database_name}.{etl_schema_name}.etl_watermark') if self.watermark_column else None
+        self.watermark_prepared = False
+        self.watermark_low: str | None = None
+        self.watermark_high: str | None = None
+
+        # Chunked processing - chunk_filter restricts the upsert source while a chunk is running
+        self.chunk_count = chunk_count
+        self.chunk_column = chunk_column.lower() if chunk_column else None
+        self.chunk_progress_store = ChunkProgressStore(self.backend, f'{database_name}.{etl_schema_name}.etl_chunk_progress') if chunk_count else None
+        self.chunk_filter: str | None = None
+        self.current_chunk: ChunkSpec | None = None
+        self.chunk_in_progress = False
+
+        # Per-statement timings and row counts, written to etl_run_metrics by save_run_metrics()
+        self.phase_metrics: list[PhaseMetric] = []
+        self.run_metrics_store = RunMetricsStore(self.backend, f'{database_name}.{etl_schema_name}.etl_run_metrics')
+
         # Log all infers
         infers_parts = [
             f'table_name={self.table_name}',
@@ -111,26 +220,56 @@ class TableUpdater:
             f'full_table_name={self.full_table_name}',
             f'etl_view_name={self.etl_view_name}',
             f'table_primary_key_column_name={self.table_primary_key_column_name}',
+            f'staging_strategy={self.staging_strategy}',
             f'updates_table_name={self.updates_table_name}',
             f'table_type={self.table_type}',
+            f'hash_storage_type={self.hash_storage_type}',
+            f'execution_mode={self.execution_mode}',
             f'table_natural_keys_list={self.table_natural_keys_list}',
             f'natural_key_join_string={self.natural_key_join_string}',
             f'update_table_columns={self.update_table_columns}',
             f'insert_columns={self.insert_columns}',
             f'source_select_columns={self.source_select_columns}',
-            f'update_hash_columns={self.update_hash_columns}'
+            f'update_hash_columns={self.update_hash_columns}',
+            f'watermark_column={self.watermark_column}',
+            f'chunk_count={self.chunk_count}',
+            f'chunk_column={self.chunk_column}',
+            f'enable_deletes={self.enable_deletes}',
+            f'max_delete_percentage={self.max_delete_percentage}',
+            f'delete_mode={self.delete_mode}',
+            f'soft_delete_columns={self.soft_delete_columns}'
         ]
         # Add Type 2 specific fields if applicable
         if self.table_type == 'dim_type_2':
             infers_parts.extend([
                 f'row_effective_date={self.row_effective_date}',
                 f'row_expiration_date_default={self.row_expiration_date_default}',
-                f'type_1_column_names={self.type_1_column_names}'
+                f'type_1_column_names={self.type_1_column_names}',
+                f'type_1_history_full_scan={self.type_1_history_full_scan}',
+                f'type_1_compare_columns_only={self.type_1_compare_columns_only}'
             ])
         self._log(f'Table infers completed: {" | ".join(infers_parts)}')
+        self.backend.record_metadata({
+            'table_metadata': asdict(self.metadata),
+            'table_type': self.table_type,
+            'hash_storage_type': self.hash_storage_type,
+            'execution_mode': self.execution_mode,
+            'staging_strategy': self.staging_strategy,
+            'natural_keys': self.table_natural_keys_list,
+            'update_table_columns': self.update_table_columns,
+            'insert_columns': self.insert_columns,
+            'source_select_columns': self.source_select_columns,
+            'update_hash_columns': self.update_hash_columns,
+            'type_1_column_names': self.type_1_column_names,
+            'watermark_column': self.watermark_column,
+            'chunk_count': self.chunk_count,
+            'chunk_column': self.chunk_column,
+            'delete_mode': self.delete_mode if self.enable_deletes else None
+        })
 
         # Perform validation checks
         self._perform_validation_checks(column_listing)
+        self.log_sink.flush()
 
 
     def _perform_validation_checks(self, column_listing: list[str]) -> None:
@@ -146,24 +285,10 @@ class TableUpdater:
         self._log(f'Performing validation checks for columns: {column_listing}')
         
         # Check that target table exists
-        table_count = self.session.sql(f"""
-            SELECT COUNT(*) as table_count 
-            FROM INFORMATION_SCHEMA.TABLES 
-            WHERE TABLE_CATALOG = UPPER('{self.database_name}')
-            AND TABLE_SCHEMA = UPPER('{self.schema_name}')
-            AND TABLE_NAME = UPPER('{self.table_name}')
-        """).collect()[0][0]
-        assert table_count > 0, f"Target table does not exist: {self.full_table_name}"
+        assert self.metadata.table_exists, f"Target table does not exist: {self.full_table_name}"
         
         # Check that ETL view exists
-        view_count = self.session.sql(f"""
-            SELECT COUNT(*) as view_count 
-            FROM INFORMATION_SCHEMA.VIEWS 
-            WHERE TABLE_CATALOG = UPPER('{self.database_name}')
-            AND TABLE_SCHEMA = UPPER('{self.etl_schema_name}')
-            AND TABLE_NAME = UPPER('vw_{self.table_name}')
-        """).collect()[0][0]
-        assert view_count > 0, f"ETL view does not exist: {self.etl_view_name}"
+        assert self.metadata.view_exists, f"ETL view does not exist: {self.etl_view_name}"
         
         # Check natural keys exist (Issue #3 from review)
         assert len(self.table_natural_keys_list) > 0, f"No primary keys defined on table: {self.full_table_name}"
@@ -179,31 +304,80 @@ class TableUpdater:
             for col in type2_required_columns:
                 assert col in column_listing, f"Required Type 2 column '{col}' missing from table: {self.full_table_name}"
         
+        # Check soft delete columns exist if soft deletes are enabled
+        if self.enable_deletes and self.delete_mode == 'soft':
+            for col in ['is_deleted', 'deleted_batch_name']:
+                assert col in column_listing, f"Required soft delete column '{col}' missing from table: {self.full_table_name}"
+        
         # Check etl_row_hash_value exists in ETL view
-        view_columns = self.session.sql(f"""
-            SELECT COLUMN_NAME
-            FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_CATALOG = UPPER('{self.database_name}')
-            AND TABLE_SCHEMA = UPPER('{self.etl_schema_name}')
-            AND TABLE_NAME = UPPER('vw_{self.table_name}')
-        """).collect()
-        view_column_names = [row.COLUMN_NAME.lower() for row in view_columns]
+        view_column_names = self.metadata.view_columns
         assert 'etl_row_hash_value' in view_column_names, f"Required column 'etl_row_hash_value' missing from view: {self.etl_view_name}"
         
         # Check etl_row_hash_value_2 exists in view if Type 2 dimension
         if self.table_type == 'dim_type_2':
             assert 'etl_row_hash_value_2' in view_column_names, f"Required column 'etl_row_hash_value_2' missing from view: {self.etl_view_name}"
 
+        # Check the view produces hashes of the table's storage type (skipped when the types are unknown)
+        for hash_column_name in ['etl_row_hash_value', 'etl_row_hash_value_2']:
+            table_hash_type = hash_storage_type(self.metadata.table_column_types.get(hash_column_name))
+            view_hash_type = hash_storage_type(self.metadata.view_column_types.get(hash_column_name))
+            if table_hash_type and view_hash_type:
+                assert table_hash_type == view_hash_type, f"Column '{hash_column_name}' is {view_hash_type} in view {self.etl_view_name} but {table_hash_type} in table {self.full_table_name} - rebuild the view or run view_builder.migrate_hash_storage"
+
+        # Check watermark column exists in view if incremental mode
+        if self.watermark_column:
+            assert self.watermark_column in view_column_names, f"Watermark column '{self.watermark_column}' missing from view: {self.etl_view_name}"
+
+        # Check chunk partition column exists in view if chunking by range
+        if self.chunk_column:
+            assert self.chunk_column in view_column_names, f"Chunk column '{self.chunk_column}' missing from view: {self.etl_view_name}"
+
         self._log(f'Column level validation completed.')
 
+    def _execute(self, sql_string: str, phase: str) -> list:
+        """Run (or, with a PlanBackend, record) a statement through the execution backend.
+        
+        Every statement is timed and appended to phase_metrics with its hash, query id and row counts.
+        
+        Args:
+            sql_string: SQL statement to run
+            phase: Name of the phase issuing the statement - suffixed with the chunk while chunking
+            
+        Returns:
+            list: Collected rows
+        """
+        chunk_number = self.current_chunk.chunk_index + 1 if self.current_chunk is not None else None
+        start_datetime_utc = datetime.now(timezone.utc).replace(tzinfo=None)
+        start_time = time.perf_counter()
+        rows = self.backend.execute(sql_string, f'{phase}:chunk_{chunk_number}' if chunk_number else phase)
+        duration_seconds = time.perf_counter() - start_time
+
+        # Instrument every statement - rows affected come from the MERGE/DML result row
+        counts = self._merge_result_counts(rows)
+        self.phase_metrics.append(PhaseMetric(
+            statement_sequence=len(self.phase_metrics) + 1,
+            phase=phase,
+            chunk_number=chunk_number,
+            statement_hash=statement_hash(sql_string),
+            query_id=self.backend.last_query_id,
+            start_datetime_utc=start_datetime_utc,
+            end_datetime_utc=datetime.now(timezone.utc).replace(tzinfo=None),
+            duration_seconds=round(duration_seconds, 6),
+            rows_returned=len(rows),
+            rows_inserted=counts['inserted'],
+            rows_updated=counts['updated'],
+            rows_deleted=counts['deleted']
+        ))
+        return rows
+
     def _log(self, message: str) -> None:
-        """Print message to console and log to Snowflake logging procedure.
+        """Print message to console and send it to the log sink.
         
         Args:
             message: The message to print and log
         """
         print(message)
-        self._log_caller(message)
+        self.log_sink.log(self.logger_name, 'info', message)
 
     def _format_df_result(self, rows: list) -> str:
         """Format collected Snowpark rows as JSON string for logging.
@@ -219,6 +393,170 @@ class TableUpdater:
         except:
             return 'likely completed successfully, but no rows.'
 
+    def _merge_result_counts(self, rows: list) -> dict[str, int]:
+        """Read inserted/updated/deleted row counts from a collected MERGE result.
+        
+        Args:
+            rows: List of Snowpark Row objects from a MERGE .collect()
+            
+        Returns:
+            dict: Counts keyed by 'inserted', 'updated' and 'deleted' (0 when not reported)
+        """
+        try:
+            result = rows[0].asDict() if rows else {}
+        except (AttributeError, TypeError):
+            result = {}  # Not a DML result (e.g. plain tuples or duplicate column names)
+        return {
+            'inserted': int(result.get('number of rows inserted', 0)),
+            'updated': int(result.get('number of rows updated', 0)),
+            'deleted': int(result.get('number of rows deleted', 0))
+        }
+
+    def _audit_column_values(self) -> dict[str, str]:
+        """SQL literals for the ETL-managed audit columns of this batch (soft delete columns reset to not deleted)."""
+        audit_values = {
+            'create_username': f"'{self.current_username}'",
+            'create_datetime': f"CAST('{self.current_datetime_cst}' AS TIMESTAMP_NTZ)",
+            'create_batch_name': f"'{self.batch_id}'",
+            'last_update_username': f"'{self.current_username}'",
+            'last_update_datetime': f"CAST('{self.current_datetime_cst}' AS TIMESTAMP_NTZ)",
+            'last_update_batch_name': f"'{self.batch_id}'",
+            'is_deleted': '0',
+            'deleted_batch_name': 'CAST(NULL AS STRING)'
+        }
+        return {column_name: value for column_name, value in audit_values.items() if column_name in (*self.audit_columns, *self.soft_delete_columns)}
+
+    def _soft_delete_clause_sql(self) -> str:
+        """WHEN MATCHED clause applying staged soft deletes in a MERGE from the staging table ('' when not staged)."""
+        if not self._stages_soft_deletes():
+            return ''
+        return f"""WHEN MATCHED AND source.insert_update_indicator = 'delete'
+        THEN UPDATE SET
+             {self._soft_delete_assignments()}"""
+
+    def _stages_soft_deletes(self) -> bool:
+        """Whether soft deletes are staged by identify_upserts and applied by the update MERGE.
+        
+        Chunked runs and fused dim_type_1/fact runs have no single staging table covering the whole view,
+        so they soft delete in one MERGE of their own after the upserts (process_table_deletes).
+        """
+        return (
+            self.enable_deletes
+            and self.delete_mode == 'soft'
+            and not self.chunk_count
+            and (self.execution_mode == 'staged' or self.table_type == 'dim_type_2')
+        )
+
+    def _active_row_conditions(self, alias: str) -> list[str]:
+        """Conditions for target rows that can still be deleted (current and not already soft deleted)."""
+        conditions = []
+        if self.table_type == 'dim_type_2':
+            conditions.append(f'{alias}.current_row_flag = 1')
+        if self.delete_mode == 'soft':
+            conditions.append(f'COALESCE({alias}.is_deleted, 0) = 0')
+        return conditions
+
+    def _soft_delete_assignments(self) -> str:
+        """MERGE SET list that soft deletes a matched row - closing it for dim_type_2 - with this batch's audit values."""
+        audit_values = self._audit_column_values()
+        assignments = {'is_deleted': '1', 'deleted_batch_name': f"'{self.batch_id}'"}
+        if self.table_type == 'dim_type_2':
+            assignments['row_expiration_date'] = f"CAST('{self.row_effective_date}' AS DATE) - 1"
+            assignments['current_row_flag'] = '0'
+        for column_name in ('last_update_username', 'last_update_datetime', 'last_update_batch_name'):
+            assignments[column_name] = audit_values[column_name]
+        return '\n            ,'.join([f'target.{column_name} = {value}' for column_name, value in assignments.items()])
+
+    def _create_staging_table_sql(self, staging_table_name: str) -> str:
+        """Build the CREATE statement prefix (up to AS) for a staging table and register it for cleanup.
+        
+        Args:
+            staging_table_name: Fully qualified staging table name
+            
+        Returns:
+            str: CREATE OR REPLACE [TEMPORARY|TRANSIENT] TABLE ... clause for the configured staging strategy
+        """
+        if staging_table_name not in self.staging_tables:
+            self.staging_tables.append(staging_table_name)
+        if self.staging_strategy == 'temporary':
+            return f'CREATE OR REPLACE TEMPORARY TABLE {staging_table_name}'
+        elif self.staging_strategy == 'transient':
+            return f'CREATE OR REPLACE TRANSIENT TABLE {staging_table_name} DATA_RETENTION_TIME_IN_DAYS = 0'
+        else:
+            return f'CREATE OR REPLACE TABLE {staging_table_name}'
+
+    def cleanup_staging_tables(self) -> None:
+        """Drop the staging tables created by this run (permanent staging tables are kept for debugging)."""
+        if self.staging_strategy == 'permanent':
+            return
+        for staging_table_name in self.staging_tables:
+            self._execute(f'DROP TABLE IF EXISTS {staging_table_name}', 'cleanup')
+            self._log(f'Dropped staging table {staging_table_name}')
+        self.staging_tables = []
+        self.log_sink.flush()
+
+    def _prepare_watermark_window(self) -> None:
+        """Resolve the watermark window for this run (incremental mode only).
+        
+        The upper bound is captured up front so rows landing in the view mid-run are picked up next run.
+        Runs a full reconcile when there is no stored mark yet, when full_reconcile is set, or when the
+        last full reconcile is older than full_reconcile_days.
+        """
+        if self.watermark_column is None or self.watermark_prepared:
+            return
+
+        self.watermark_store.ensure_control_table()
+        stored_high_water_mark, last_full_reconcile_datetime = self.watermark_store.get(self.full_table_name, self.watermark_column)
+        if stored_high_water_mark is None:
+            self.full_reconcile = True
+        elif self.full_reconcile_days is not None:
+            if last_full_reconcile_datetime is None or (self.current_datetime_cst - last_full_reconcile_datetime).days >= self.full_reconcile_days:
+                self.full_reconcile = True
+
+        self.watermark_low = None if self.full_reconcile else stored_high_water_mark
+        lower_bound_filter = f"WHERE {self.watermark_column} > '{self.watermark_low}'" if self.watermark_low is not None else ''
+        watermark_rows = self._execute(f"SELECT MAX({self.watermark_column}) FROM {self.etl_view_name} {lower_bound_filter}", 'watermark')
+        new_high_water_mark = watermark_rows[0][0] if watermark_rows else None
+        self.watermark_high = str(new_high_water_mark) if new_high_water_mark is not None else stored_high_water_mark
+        self.watermark_prepared = True
+        self._log(f'Watermark window on {self.watermark_column}: full_reconcile={self.full_reconcile}, low={self.watermark_low}, high={self.watermark_high}')
+
+    def _upsert_source_sql(self) -> str:
+        """Source relation for change detection - the ETL view, filtered to the watermark window in incremental
+        mode and to the current chunk in chunked mode.
+        
+        Only upserts use this; anything that must see every source row (e.g. delete detection) uses etl_view_name.
+        """
+        self._prepare_watermark_window()
+        if self.watermark_column is None or self.full_reconcile:
+            source_sql = self.etl_view_name
+        else:
+            source_sql = f"""(
+            SELECT * FROM {self.etl_view_name}
+            WHERE {self.watermark_column} > '{self.watermark_low}'
+            AND {self.watermark_column} <= '{self.watermark_high}'
+        )"""
+        if self.chunk_filter is not None:
+            source_sql = f"""(
+            SELECT * FROM {source_sql}
+            WHERE {self.chunk_filter}
+        )"""
+        return source_sql
+
+    def commit_watermark(self) -> None:
+        """Store the high-water mark reached by this run - call only after the load completed."""
+        if self.watermark_column is None or self.watermark_high is None:
+            return
+        self.watermark_store.save(
+            self.full_table_name,
+            self.watermark_column,
+            self.watermark_high,
+            self.batch_id,
+            self.current_datetime_cst,
+            self.full_reconcile
+        )
+        self._log(f'Watermark committed: {self.watermark_column}={self.watermark_high} (full_reconcile={self.full_reconcile})')
+
     def _infer_table_type(self, column_listing: list[str]) -> str:
         """Infer table type based on table name prefix and column structure.
         
@@ -247,12 +585,14 @@ class TableUpdater:
     def identify_upserts(self):
         """Create staging table identifying rows that need insert, update, or Type 2 change.
         
-        Creates a temporary table ({table_name}_updates) containing:
+        Creates a staging table ({table_name}_updates, see staging_strategy) containing:
         - New rows to insert (insert_update_indicator = 'insert')
         - Existing rows with changed Type 1 attributes (insert_update_indicator = 'update')
         - Existing rows with changed Type 2 attributes (insert_update_indicator = 'type2_change')
+        - Active rows missing from the full ETL view when soft deletes are staged (insert_update_indicator = 'delete')
         
-        Also logs change audit counts for monitoring.
+        Also aggregates the change counts once (logged for monitoring and kept in change_counts for the run summary)
+        and checks the delete threshold against the staged delete count before anything is written.
         """
         # Build Type 2 tracking columns if needed
         if self.table_type == 'dim_type_2':
@@ -273,9 +613,41 @@ class TableUpdater:
             END as current_row_flag"""
         else:
             type2_tracking_columns = ""
+
+        # Soft delete columns are reset on every upsert, so a row that reappears in the view is undeleted
+        audit_values = self._audit_column_values()
+        soft_delete_columns_sql = ''.join([f'\n            ,{audit_values[column_name]} as {column_name}' for column_name in self.soft_delete_columns])
+        soft_deleted_filter = 'OR target.is_deleted = 1' if 'is_deleted' in self.soft_delete_columns else ''
+
+        # Soft deletes: active target rows missing from the full view (never the watermark window or chunk)
+        if self._stages_soft_deletes():
+            type2_tracking_columns_sql = ',target.row_effective_date, target.row_expiration_date, target.current_row_flag' if self.table_type == 'dim_type_2' else ''
+            soft_deletes_sql = f"""
+        UNION ALL
+        SELECT
+             target.{self.table_primary_key_column_name}
+            ,{','.join([f'target.{col}' for col in self.source_select_columns])}
+            {type2_tracking_columns_sql}
+            ,'{self.current_username}' as create_username
+            ,CAST('{self.current_datetime_cst}' AS TIMESTAMP_NTZ) as create_datetime
+            ,'{self.batch_id}' as create_batch_name
+            ,'{self.current_username}' as last_update_username
+            ,CAST('{self.current_datetime_cst}' AS TIMESTAMP_NTZ) as last_update_datetime
+            ,'{self.batch_id}' as last_update_batch_name
+            ,1 as is_deleted
+            ,'{self.batch_id}' as deleted_batch_name
+            ,'delete' as insert_update_indicator
+        FROM {self.full_table_name} target
+        WHERE {' AND '.join(self._active_row_conditions('target'))}
+        AND NOT EXISTS (
+            SELECT 1 FROM {self.etl_view_name} source
+            WHERE {self.natural_key_join_string}
+        )"""
+        else:
+            soft_deletes_sql = ''
         
         sql_string = f"""
-        CREATE OR REPLACE TABLE {self.updates_table_name} AS 
+        {self._create_staging_table_sql(self.updates_table_name)} AS 
         SELECT
              target.{self.table_primary_key_column_name}
             ,{','.join([f'source.{col}' for col in self.source_select_columns])}
@@ -285,13 +657,13 @@ class TableUpdater:
             ,'{self.batch_id}' as create_batch_name
             ,'{self.current_username}' as last_update_username
             ,CAST('{self.current_datetime_cst}' AS TIMESTAMP_NTZ) as last_update_datetime
-            ,'{self.batch_id}' as last_update_batch_name
+            ,'{self.batch_id}' as last_update_batch_name{soft_delete_columns_sql}
             ,CASE 
                 WHEN target.{self.table_primary_key_column_name} IS NULL THEN 'insert'
                 {"WHEN source.etl_row_hash_value_2 <> target.etl_row_hash_value_2 THEN 'type2_change'" if self.table_type == 'dim_type_2' else ""}
                 ELSE 'update'
              END as insert_update_indicator
-        FROM {self.etl_view_name} source
+        FROM {self._upsert_source_sql()} source
         LEFT JOIN {self.full_table_name} target
             ON {self.natural_key_join_string}
                 {"AND target.current_row_flag = 1" if self.table_type == 'dim_type_2' else ""}
@@ -299,9 +671,10 @@ class TableUpdater:
             target.{self.table_primary_key_column_name} IS NULL
         OR source.etl_row_hash_value <> target.etl_row_hash_value
         {f"OR source.etl_row_hash_value_2 <> target.etl_row_hash_value_2" if self.table_type == 'dim_type_2' else ""}
+        {soft_deleted_filter}{soft_deletes_sql}
         """
         self._log(f'upsert sql string: {sql_string}')
-        execution_results = self.session.sql(sql_string).collect()
+        execution_results = self._execute(sql_string, 'identify_upserts')
         self._log(f'upsert result: {self._format_df_result(execution_results)}')
 
         change_audit_sql_string = f"""
@@ -309,11 +682,18 @@ class TableUpdater:
              COALESCE(SUM(CASE WHEN insert_update_indicator = 'insert' THEN 1 ELSE 0 END), 0) AS new_records
             ,COALESCE(SUM(CASE WHEN insert_update_indicator = 'update' THEN 1 ELSE 0 END), 0) AS change_records
             ,COALESCE(SUM(CASE WHEN insert_update_indicator = 'type2_change' THEN 1 ELSE 0 END), 0) AS type2_changes
+            {",COALESCE(SUM(CASE WHEN insert_update_indicator = 'delete' THEN 1 ELSE 0 END), 0) AS delete_records" if self._stages_soft_deletes() else ""}
         FROM {self.updates_table_name}
         """
         self._log(f'change audit sql string: {change_audit_sql_string}')
-        execution_results = self.session.sql(change_audit_sql_string).collect()
+        execution_results = self._execute(change_audit_sql_string, 'change_audit')
         self._log(f'change audit result: {self._format_df_result(execution_results)}')
+        change_audit = execution_results[0] if execution_results else (0, 0, 0)
+        self.change_counts = {'insert': int(change_audit[0]), 'update': int(change_audit[1]), 'type2_change': int(change_audit[2])}
+        if self._stages_soft_deletes():
+            self.delete_count = int(change_audit[3]) if len(change_audit) > 3 else 0
+            self._check_delete_threshold(self.delete_count)
+        self.log_sink.flush()
 
 
     def _process_type2_expirations(self):
@@ -324,6 +704,8 @@ class TableUpdater:
         - current_row_flag to 0
         - Updates audit columns (last_update_*)
         
+        Rows marked as 'delete' (staged soft deletes) are closed the same way and flagged is_deleted.
+        
         Only runs for dim_type_2 tables.
         """
         if self.table_type != 'dim_type_2':
@@ -340,9 +722,10 @@ class TableUpdater:
             ,target.last_update_username = '{self.current_username}'
             ,target.last_update_datetime = CAST('{self.current_datetime_cst}' AS TIMESTAMP_NTZ)
             ,target.last_update_batch_name = '{self.batch_id}'
+        {self._soft_delete_clause_sql()}
         """
         self._log(f'type2 expirations sql string: {sql_string}')
-        execution_results = self.session.sql(sql_string).collect()
+        execution_results = self._execute(sql_string, 'type2_expirations')
         self._log(f'type2 expirations result: {self._format_df_result(execution_results)}')
 
 
@@ -351,7 +734,12 @@ class TableUpdater:
         
         For Type 2 dimensions, Type 1 changes should propagate to all historical rows.
         Compares historical rows (current_row_flag = 0) against the current row 
-        (current_row_flag = 1) using etl_row_hash_value to detect differences.
+        (current_row_flag = 1) using etl_row_hash_value (or only the Type 1 columns with
+        type_1_compare_columns_only) to detect differences.
+        
+        Only the natural keys staged as 'update' or 'type2_change' in this batch, plus keys staged as 'insert'
+        that already have historical rows (re-activated after a soft delete), are considered, so the cost
+        follows the change set instead of the whole history - unless type_1_history_full_scan is set.
         
         Only runs if:
         - Table is dim_type_2
@@ -360,15 +748,43 @@ class TableUpdater:
         if self.table_type != 'dim_type_2' or not self.type_1_column_names:
             return
 
-        sql_string = f"""
-        MERGE INTO {self.full_table_name} as target
-        USING (
+        if not self.type_1_history_full_scan:
+            current_rows_sql = f"""(
+            SELECT current_rows.*
+            FROM {self.full_table_name} current_rows
+            INNER JOIN (
+                SELECT DISTINCT {', '.join([f'staged.{column_name}' for column_name in self.table_natural_keys_list])}
+                FROM {self.updates_table_name} staged
+                WHERE staged.insert_update_indicator IN ('update', 'type2_change')
+                OR (
+                    staged.insert_update_indicator = 'insert'
+                    AND EXISTS (
+                        SELECT 1 FROM {self.full_table_name} history_rows
+                        WHERE {' AND '.join([f'history_rows.{column_name} = staged.{column_name}' for column_name in self.table_natural_keys_list])}
+                        AND history_rows.current_row_flag = 0
+                    )
+                )
+            ) changed_keys
+                ON {' AND '.join([f'changed_keys.{column_name} = current_rows.{column_name}' for column_name in self.table_natural_keys_list])}
+            WHERE current_rows.current_row_flag = 1
+        )"""
+        else:
+            current_rows_sql = f"""(
             SELECT * FROM {self.full_table_name} 
             WHERE current_row_flag = 1
-        ) as source
+        )"""
+
+        if self.type_1_compare_columns_only:
+            type_1_difference_sql = '(' + ' OR '.join([f'target.{column_name} IS DISTINCT FROM source.{column_name}' for column_name in self.type_1_column_names]) + ')'
+        else:
+            type_1_difference_sql = 'source.etl_row_hash_value <> target.etl_row_hash_value'
+
+        sql_string = f"""
+        MERGE INTO {self.full_table_name} as target
+        USING {current_rows_sql} as source
         ON {self.natural_key_join_string}
             AND target.current_row_flag = 0
-        WHEN MATCHED AND source.etl_row_hash_value <> target.etl_row_hash_value
+        WHEN MATCHED AND {type_1_difference_sql}
         THEN UPDATE SET
         {', '.join([f'target.{column_name} = source.{column_name}' for column_name in self.type_1_column_names])}
         ,target.etl_row_hash_value = source.etl_row_hash_value
@@ -377,7 +793,7 @@ class TableUpdater:
         ,target.last_update_batch_name = '{self.batch_id}'
         """
         self._log(f'table type 2 historical type 1 updates: {sql_string}')
-        execution_results = self.session.sql(sql_string).collect()
+        execution_results = self._execute(sql_string, 'type1_historical_updates')
         self._log(f'table type 2 historical type 1 updates result: {self._format_df_result(execution_results)}')
 
 
@@ -391,7 +807,7 @@ class TableUpdater:
         Note: Type 1 historical updates are handled in process_table_inserts() AFTER
         new rows are inserted, so the current row values are available.
         
-        For other table types, simply updates rows marked as 'update'.
+        For other table types, updates rows marked as 'update' and soft deletes rows marked as 'delete'.
         """
         # Handle Type 2 expirations first (if applicable)
         if self.table_type == 'dim_type_2':
@@ -404,10 +820,12 @@ class TableUpdater:
         WHEN MATCHED AND source.insert_update_indicator = 'update'
         THEN UPDATE SET
         {', '.join([f'target.{column_name} = source.{column_name}' for column_name in self.update_hash_columns])}
+        {self._soft_delete_clause_sql() if self.table_type != 'dim_type_2' else ''}
         """
         self._log(f'table updates sql string: {sql_string}')
-        execution_results = self.session.sql(sql_string).collect()
+        execution_results = self._execute(sql_string, 'table_updates')
         self._log(f'table updates result: {self._format_df_result(execution_results)}')
+        self.log_sink.flush()
 
 
     def process_table_inserts(self):
@@ -430,15 +848,427 @@ class TableUpdater:
         VALUES ({', '.join([f'source.{col}'for col in self.insert_columns])})
         """
         self._log(f'table inserts sql string: {sql_string}')
-        execution_results = self.session.sql(sql_string).collect()
+        execution_results = self._execute(sql_string, 'table_inserts')
         self._log(f'table inserts result: {self._format_df_result(execution_results)}')
 
         # Type 1 historical updates must run AFTER inserts so the new current row exists
-        if self.table_type == 'dim_type_2':
+        # (full history scans run once after the last chunk in chunked runs)
+        if self.table_type == 'dim_type_2' and not (self.chunk_in_progress and self.type_1_history_full_scan):
+            self._process_type1_historical_updates()
+        self.log_sink.flush()
+
+
+    def process_fused_upserts(self):
+        """Detect changes, update and insert in a single MERGE straight from the ETL view.
+        
+        Replaces identify_upserts + process_table_updates + process_table_inserts for
+        dim_type_1 and fact tables: no staging table and one scan of the view and target.
+        Change counts come from the MERGE result and are stored in self.change_counts.
+        """
+        assert self.execution_mode == 'fused', f"process_fused_upserts requires execution_mode='fused', not '{self.execution_mode}'"
+        assert self.table_type != 'dim_type_2', 'process_fused_upserts does not handle dim_type_2, use process_scd2_upserts'
+
+        audit_values = self._audit_column_values()
+        source_values = {column_name: audit_values.get(column_name, f'source.{column_name}') for column_name in self.insert_columns}
+
+        sql_string = f"""
+        MERGE INTO {self.full_table_name} as target
+        USING {self._upsert_source_sql()} as source
+        ON {self.natural_key_join_string}
+        WHEN MATCHED AND (source.etl_row_hash_value <> target.etl_row_hash_value {'OR target.is_deleted = 1' if 'is_deleted' in self.soft_delete_columns else ''})
+        THEN UPDATE SET
+        {', '.join([f'target.{column_name} = {source_values[column_name]}' for column_name in self.update_hash_columns])}
+        WHEN NOT MATCHED
+        THEN INSERT ({', '.join(self.insert_columns)})
+        VALUES ({', '.join([source_values[column_name] for column_name in self.insert_columns])})
+        """
+        self._log(f'fused upsert sql string: {sql_string}')
+        execution_results = self._execute(sql_string, 'fused_upserts')
+        self._log(f'fused upsert result: {self._format_df_result(execution_results)}')
+
+        merge_counts = self._merge_result_counts(execution_results)
+        self.change_counts = {'insert': merge_counts['inserted'], 'update': merge_counts['updated'], 'type2_change': 0}
+        self.log_sink.flush()
+
+
+    def process_scd2_upserts(self):
+        """Set-based Type 2 path: expire, update and insert in a single MERGE from the staging table.
+        
+        Replaces the expiration, update and insert MERGEs of the staged path for dim_type_2 (fused execution
+        mode). The staging table is unioned with its 'type2_change' rows under a NULL merge key, so the same
+        MERGE expires the current row (matched on the surrogate key) and inserts its new version (never
+        matches). Staged soft deletes close their current row in the same MERGE. Historical Type 1 updates
+        follow, limited to the natural keys changed in this batch.
+        """
+        assert self.table_type == 'dim_type_2', f'process_scd2_upserts requires a dim_type_2 table, not {self.table_type}'
+
+        self.identify_upserts()
+
+        sql_string = f"""
+        MERGE INTO {self.full_table_name} as target
+        USING (
+            SELECT staged.*, staged.{self.table_primary_key_column_name} AS etl_merge_key
+            FROM {self.updates_table_name} staged
+            UNION ALL
+            SELECT staged.*, NULL AS etl_merge_key
+            FROM {self.updates_table_name} staged
+            WHERE staged.insert_update_indicator = 'type2_change'
+        ) as source
+        ON target.{self.table_primary_key_column_name} = source.etl_merge_key
+        WHEN MATCHED AND source.insert_update_indicator = 'type2_change'
+        THEN UPDATE SET
+             target.row_expiration_date = CAST('{self.row_effective_date}' AS DATE) - 1
+            ,target.current_row_flag = 0
+            ,target.last_update_username = '{self.current_username}'
+            ,target.last_update_datetime = CAST('{self.current_datetime_cst}' AS TIMESTAMP_NTZ)
+            ,target.last_update_batch_name = '{self.batch_id}'
+        WHEN MATCHED AND source.insert_update_indicator = 'update'
+        THEN UPDATE SET
+        {', '.join([f'target.{column_name} = source.{column_name}' for column_name in self.update_hash_columns])}
+        {self._soft_delete_clause_sql()}
+        WHEN NOT MATCHED AND source.insert_update_indicator IN ('insert', 'type2_change')
+        THEN INSERT ({', '.join(self.insert_columns)})
+        VALUES ({', '.join([f'source.{col}' for col in self.insert_columns])})
+        """
+        self._log(f'scd2 upsert sql string: {sql_string}')
+        execution_results = self._execute(sql_string, 'scd2_upserts')
+        self._log(f'scd2 upsert result: {self._format_df_result(execution_results)}')
+
+        # New versions are in place, so the changed keys' current rows can be propagated to their history
+        if not (self.chunk_in_progress and self.type_1_history_full_scan):
             self._process_type1_historical_updates()
+        self.log_sink.flush()
+
+
+    def _check_delete_threshold(self, expected_delete_count: int | None = None) -> None:
+        """Abort before the destructive statement when too large a share of the target would be deleted.
         
+        Only counts active target rows (current, not soft deleted). Without an expected_delete_count (known when
+        soft deletes were staged) the rows to delete are counted with the same anti-join predicate the delete
+        uses, in the same statement as the active row count - comparing row counts would hide deletes behind
+        duplicate or NULL natural keys in the view.
         
-def main(session, table_name: str, batch_id: str | None = None, type_1_column_names: str | None = None) -> str:
+        Args:
+            expected_delete_count: Optional number of rows about to be deleted
+        
+        Raises:
+            RuntimeError: If the delete percentage exceeds max_delete_percentage
+        """
+        if self.max_delete_percentage is None:
+            return
+
+        active_row_conditions = self._active_row_conditions('target')
+        active_row_filter = ' AND '.join(active_row_conditions) if active_row_conditions else '1 = 1'
+        target_count_sql = f'SELECT COUNT(*) FROM {self.full_table_name} target WHERE {active_row_filter}'
+        delete_count_sql = f"""SELECT COUNT(*) FROM {self.full_table_name} target
+                WHERE {active_row_filter}
+                AND NOT EXISTS (
+                    SELECT 1 FROM {self.etl_view_name} source
+                    WHERE {self.natural_key_join_string}
+                )"""
+        sql_string = f"""
+        SELECT
+             ({target_count_sql}) AS target_row_count
+            {f',({delete_count_sql}) AS delete_row_count' if expected_delete_count is None else ''}
+        """
+        self._log(f'table deletes threshold sql string: {sql_string}')
+        execution_results = self._execute(sql_string, 'delete_threshold')
+        row_counts = [int(row_count or 0) for row_count in execution_results[0]] if execution_results else [0, 0]
+        target_row_count = row_counts[0]
+        if expected_delete_count is None:
+            expected_delete_count = row_counts[1] if len(row_counts) > 1 else 0
+        delete_percentage = 100.0 * expected_delete_count / target_row_count if target_row_count else 0.0
+        self._log(
+            f'Delete threshold check: {expected_delete_count} of {target_row_count} target rows '
+            f'({delete_percentage:.2f}%, max {self.max_delete_percentage}%)'
+        )
+        if delete_percentage > self.max_delete_percentage:
+            raise RuntimeError(
+                f'Aborting deletes on {self.full_table_name}: {expected_delete_count} of {target_row_count} rows '
+                f'({delete_percentage:.2f}%) exceed max_delete_percentage={self.max_delete_percentage}'
+            )
+
+
+    def process_table_deletes(self):
+        """Delete (or soft delete) records that no longer exist in source view.
+        
+        Hard deletes (fact tables only): detection and deletion happen in one anti-join DELETE (NOT EXISTS against
+        the full ETL view, never the watermark window or chunk), so there is no _deletes staging table and no
+        separate COUNT - the count comes from the DELETE result and is kept in delete_count.
+        
+        Soft deletes (any table type) that weren't staged with the upserts run as one MERGE setting is_deleted and
+        deleted_batch_name (and closing the current row of dim_type_2) on the active rows missing from the view.
+        
+        The max_delete_percentage threshold is checked first.
+        
+        Fact tables may have records deleted from source systems that should
+        be removed from the data warehouse to maintain data accuracy.
+        """
+        if self.delete_mode == 'soft':
+            self._check_delete_threshold()
+            sql_string = f"""
+        MERGE INTO {self.full_table_name} as target
+        USING (
+            SELECT target.{self.table_primary_key_column_name}
+            FROM {self.full_table_name} target
+            WHERE {' AND '.join(self._active_row_conditions('target'))}
+            AND NOT EXISTS (
+                SELECT 1 FROM {self.etl_view_name} source
+                WHERE {self.natural_key_join_string}
+            )
+        ) as source
+        ON source.{self.table_primary_key_column_name} = target.{self.table_primary_key_column_name}
+        WHEN MATCHED
+        THEN UPDATE SET
+             {self._soft_delete_assignments()}
+        """
+            self._log(f'table soft deletes sql string: {sql_string}')
+            execution_results = self._execute(sql_string, 'table_soft_deletes')
+            self._log(f'table soft deletes result: {self._format_df_result(execution_results)}')
+            self.delete_count = self._merge_result_counts(execution_results)['updated']
+            self._log(f'Soft deleted {self.delete_count} records from {self.full_table_name}')
+            self.log_sink.flush()
+            return
+
+        # Assert table type is fact - dimensions should not be physically deleted (use delete_mode='soft')
+        assert self.table_type == 'fact', f"Delete processing only supported for fact tables, not {self.table_type}"
+
+        self._check_delete_threshold()
+
+        # DELETE can't alias its target, so the subquery correlates on the full table name
+        sql_string = f"""
+        DELETE FROM {self.full_table_name}
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {self.etl_view_name} source
+            WHERE {' AND '.join([f'source.{column_name} = {self.full_table_name}.{column_name}' for column_name in self.table_natural_keys_list])}
+        )
+        """
+        self._log(f'table deletes sql string: {sql_string}')
+        execution_results = self._execute(sql_string, 'table_deletes')
+        self._log(f'table deletes result: {self._format_df_result(execution_results)}')
+        self.delete_count = self._merge_result_counts(execution_results)['deleted']
+        self._log(f'Deleted {self.delete_count} records from {self.full_table_name}')
+        self.log_sink.flush()
+
+
+    def plan_chunks(self) -> list[ChunkSpec]:
+        """Split the upsert source into chunk_count chunks by chunk_column range or natural key hash.
+        
+        Returns:
+            list[ChunkSpec]: Chunks to process in order
+        """
+        assert self.chunk_count, 'plan_chunks requires chunk_count'
+        if self.chunk_column is None:
+            return plan_hash_chunks(self.table_natural_keys_list, self.chunk_count)
+
+        range_rows = self._execute(f"SELECT MIN({self.chunk_column}), MAX({self.chunk_column}) FROM {self._upsert_source_sql()}", 'chunk_plan')
+        lower_value, upper_value = range_rows[0] if range_rows else (None, None)
+        return plan_range_chunks(self.chunk_column, lower_value, upper_value, self.chunk_count)
+
+
+    def process_chunks(self):
+        """Stage and merge the upsert source one chunk at a time.
+        
+        Each chunk runs the configured execution mode (staged or fused) against its slice of the view,
+        logs progress and is recorded in etl_chunk_progress. The first attempt of a batch saves its chunk plan
+        and watermark window there; re-running with the same batch_id after a failure loads that plan before
+        any planning and skips the chunk indexes that batch already completed. For Type 2
+        dimensions the historical Type 1 updates run with each chunk (once after the last chunk with
+        type_1_history_full_scan).
+        
+        Change counts of every chunk of the batch - processed by this run, or completed by an earlier attempt
+        (as recorded in etl_chunk_progress) - are summed into self.change_counts.
+        """
+        self.chunk_progress_store.ensure_progress_table()
+        chunk_plan, completed_chunks = self.chunk_progress_store.load_progress(self.full_table_name, self.batch_id)
+
+        if chunk_plan is not None:
+            # Resuming - reuse the first attempt's chunks and watermark window, the data may have moved since
+            chunks = [ChunkSpec(chunk_index, chunk_plan['chunk_count'], predicate) for chunk_index, predicate in enumerate(chunk_plan['predicates'])]
+            if self.watermark_column:
+                self.watermark_low = chunk_plan['watermark_low']
+                self.watermark_high = chunk_plan['watermark_high']
+                self.full_reconcile = chunk_plan['full_reconcile']
+                self.watermark_prepared = True
+            self._log(f'Resuming batch {self.batch_id} with its saved plan of {len(chunks)} chunks ({len(completed_chunks)} completed), watermark high {self.watermark_high}')
+        else:
+            self._prepare_watermark_window()
+            chunks = self.plan_chunks()
+            self.chunk_progress_store.save_plan(
+                self.full_table_name,
+                self.batch_id,
+                chunks,
+                {'watermark_low': self.watermark_low, 'watermark_high': self.watermark_high, 'full_reconcile': self.full_reconcile},
+                self.current_datetime_cst
+            )
+
+        total_counts = {'insert': 0, 'update': 0, 'type2_change': 0}
+        run_start = time.perf_counter()
+        self.chunk_in_progress = True
+        try:
+            for chunk in chunks:
+                chunk_label = f'{chunk.chunk_index + 1}/{chunk.chunk_count}'
+                if chunk.chunk_index in completed_chunks:
+                    for change_type in total_counts:
+                        total_counts[change_type] += completed_chunks[chunk.chunk_index].get(change_type, 0)
+                    self._log(f'Chunk {chunk_label} already completed by batch {self.batch_id}, skipping: {completed_chunks[chunk.chunk_index]} | {chunk.predicate}')
+                    continue
+
+                chunk_start = time.perf_counter()
+                self.chunk_filter = chunk.predicate
+                self.current_chunk = chunk
+                if self.execution_mode == 'fused' and self.table_type == 'dim_type_2':
+                    self.process_scd2_upserts()
+                elif self.execution_mode == 'fused':
+                    self.process_fused_upserts()
+                else:
+                    self.identify_upserts()
+                    self.process_table_updates()
+                    self.process_table_inserts()
+
+                for change_type in total_counts:
+                    total_counts[change_type] += self.change_counts[change_type]
+                self.current_chunk = None
+                chunk_counts = {change_type: self.change_counts[change_type] for change_type in total_counts}
+                self.chunk_progress_store.mark_completed(self.full_table_name, self.batch_id, chunk, self.watermark_high, self.current_datetime_cst, chunk_counts)
+                self._log(
+                    f'Chunk {chunk_label} completed in {time.perf_counter() - chunk_start:.1f}s '
+                    f'({time.perf_counter() - run_start:.1f}s total): {self.change_counts} | {chunk.predicate}'
+                )
+                self.log_sink.flush()
+        finally:
+            self.chunk_in_progress = False
+            self.chunk_filter = None
+            self.current_chunk = None
+
+        # Changed-key propagation already ran with every chunk, a full history scan runs once here
+        if self.table_type == 'dim_type_2' and self.type_1_history_full_scan:
+            self._process_type1_historical_updates()
+        self.change_counts = total_counts
+        self._log(f'All {len(chunks)} chunks completed: {total_counts}')
+        self.log_sink.flush()
+
+    def run(self) -> str:
+        """Run all phases for the configured execution mode (plus deletes if enabled) and commit the watermark.
+
+        Returns:
+            str: Summary with insert/update/type2_change counts (and delete count with enable_deletes)
+        """
+        if self.chunk_count:
+            self.process_chunks()
+        elif self.execution_mode == 'fused' and self.table_type == 'dim_type_2':
+            self.process_scd2_upserts()
+        elif self.execution_mode == 'fused':
+            self.process_fused_upserts()
+        else:
+            self.identify_upserts()
+            self.process_table_updates()
+            self.process_table_inserts()
+
+        # Deletes compare against the full view, so they run once after all upserts (and chunks) unless soft
+        # deletes were already applied with the staged updates
+        if self.enable_deletes and not self._stages_soft_deletes() and (self.delete_mode == 'soft' or self.table_type == 'fact'):
+            self.process_table_deletes()
+
+        # Counts were aggregated once while staging (or read from the MERGE results), no second scan of the staging table
+        change_counts = self.change_counts or {'insert': 0, 'update': 0, 'type2_change': 0}
+        summary = f"{change_counts['insert']} inserts, {change_counts['update']} updates, {change_counts['type2_change']} type2 changes"
+        if self.delete_count is not None:
+            summary += f', {self.delete_count} deletes'
+        self.commit_watermark()
+        return summary
+
+    def save_run_metrics(self) -> None:
+        """Write the per-statement metrics collected so far to etl_run_metrics (one INSERT per run)."""
+        self.run_metrics_store.ensure_metrics_table()
+        self.run_metrics_store.save(self.full_table_name, self.batch_id, self.table_type, self.execution_mode, self.phase_metrics)
+        self._log(f'Saved {len(self.phase_metrics)} run metrics to {self.run_metrics_store.metrics_table_name}')
+
+    def run_metrics_json(self, summary: str | None = None) -> str:
+        """Run metrics as JSON (summary, change counts, per-phase totals and per-statement metrics).
+
+        Args:
+            summary: Optional summary string returned by run()
+
+        Returns:
+            str: JSON document
+        """
+        phase_totals = {}
+        for metric in self.phase_metrics:
+            totals = phase_totals.setdefault(metric.phase, {'statements': 0, 'duration_seconds': 0.0, 'rows_inserted': 0, 'rows_updated': 0, 'rows_deleted': 0})
+            totals['statements'] += 1
+            totals['duration_seconds'] = round(totals['duration_seconds'] + metric.duration_seconds, 6)
+            totals['rows_inserted'] += metric.rows_inserted
+            totals['rows_updated'] += metric.rows_updated
+            totals['rows_deleted'] += metric.rows_deleted
+        return json.dumps({
+            'table_name': self.full_table_name,
+            'batch_id': self.batch_id,
+            'table_type': self.table_type,
+            'execution_mode': self.execution_mode,
+            'summary': summary,
+            'change_counts': self.change_counts,
+            'delete_count': self.delete_count,
+            'phases': phase_totals,
+            'statements': [metric.to_dict() for metric in self.phase_metrics]
+        })
+        
+        
+def plan_table_update(
+    table_metadata: TableMetadata,
+    batch_id: str = 'plan',
+    results: dict[str, list] | None = None,
+    **kwargs
+) -> PlanBackend:
+    """Generate the statements a TableUpdater run would execute, without a session or executing anything.
+
+    Args:
+        table_metadata: Metadata fixture for the target table and its ETL view
+        batch_id: Batch ID to render into the statements
+        results: Optional phase name -> canned rows (e.g. {'change_audit': [...]}) to steer the run
+        **kwargs: Other TableUpdater options (type_1_column_names, execution_mode, staging_strategy, ...)
+
+    Returns:
+        PlanBackend: Recorded statements (see to_sql_script / to_json) and metadata
+    """
+    backend = PlanBackend(results=results or {})
+    updater = TableUpdater(
+        None,
+        table_metadata.table_name,
+        batch_id,
+        database_name=table_metadata.database_name,
+        schema_name=table_metadata.schema_name,
+        etl_schema_name=table_metadata.etl_schema_name,
+        table_metadata=table_metadata,
+        backend=backend,
+        **kwargs
+    )
+    updater.run()
+    updater.cleanup_staging_tables()
+    return backend
+
+
+def main(
+    session,
+    table_name: str,
+    batch_id: str | None = None,
+    type_1_column_names: str | None = None,
+    use_metadata_cache: bool = False,
+    execution_mode: str = 'staged',
+    staging_strategy: str = 'temporary',
+    watermark_column: str | None = None,
+    full_reconcile: bool = False,
+    full_reconcile_days: int | None = None,
+    chunk_count: int | None = None,
+    chunk_column: str | None = None,
+    record_run_metrics: bool = False,
+    return_metrics: bool = False,
+    type_1_history_full_scan: bool = False,
+    type_1_compare_columns_only: bool = False,
+    enable_deletes: bool = False,
+    max_delete_percentage: float | None = None,
+    delete_mode: str = 'hard'
+) -> str:
     """Entry point for Snowflake stored procedure.
     
     Args:
@@ -446,9 +1276,24 @@ def main(session, table_name: str, batch_id: str | None = None, type_1_column_na
         table_name: Name of the target table to update
         batch_id: Optional batch ID for traceability (auto-generated if not provided)
         type_1_column_names: Optional comma-separated Type 1 column names for Type 2 dimensions
+        use_metadata_cache: Optional flag to reuse cached table metadata until the table/view DDL changes
+        execution_mode: Optional 'staged' (default) or 'fused' single-MERGE mode (set-based SCD2 path for dim_type_2)
+        staging_strategy: Optional 'temporary' (default, same as TableUpdater), 'transient' or 'permanent' (kept for debugging) staging tables
+        watermark_column: Optional ETL view watermark column for incremental extraction
+        full_reconcile: Optional flag to scan the full view in incremental mode
+        full_reconcile_days: Optional max age in days of the last full reconcile in incremental mode
+        chunk_count: Optional number of chunks to stage and merge separately (resumable with the same batch_id)
+        chunk_column: Optional ETL view partition column to chunk by range instead of natural key hash
+        record_run_metrics: Optional flag to write per-phase timings and row counts to etl.etl_run_metrics (default False)
+        return_metrics: Optional flag to return the run metrics JSON instead of the summary string
+        type_1_history_full_scan: Optional flag to propagate Type 1 columns across the whole Type 2 history, not just changed keys
+        type_1_compare_columns_only: Optional flag to compare only type_1_column_names (not etl_row_hash_value) against history
+        enable_deletes: Optional flag to enable deletion of records that no longer exist in source (hard deletes: fact tables only)
+        max_delete_percentage: Optional max percentage of target rows a delete may remove before the run aborts
+        delete_mode: Optional 'hard' (default) DELETE or 'soft' is_deleted flag (all table types)
         
     Returns:
-        Summary string with insert/update/type2_change counts
+        Summary string with insert/update/type2_change/delete counts (run metrics JSON with return_metrics)
         
     Raises:
         Exception: Re-raises any exception after logging
@@ -456,28 +1301,58 @@ def main(session, table_name: str, batch_id: str | None = None, type_1_column_na
     # Generate batch_id if not provided
     if batch_id is None:
         batch_id = f"{table_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
+
+    # Buffer log messages and write them once per phase instead of once per message
+    log_sink = BufferedLogSink(session, batch_id)
+    updater = None
     
     try:
-        updater = TableUpdater(session, table_name, batch_id, type_1_column_names=type_1_column_names)
-        updater.identify_upserts()
-        updater.process_table_updates()
-        updater.process_table_inserts()
-
-        # Return a nice summary
-        summary = session.sql(f"""
-            SELECT 
-                COALESCE(SUM(CASE WHEN insert_update_indicator = 'insert' THEN 1 ELSE 0 END),0) || ' inserts, ' ||
-                COALESCE(SUM(CASE WHEN insert_update_indicator = 'update' THEN 1 ELSE 0 END),0) || ' updates, ' ||
-                COALESCE(SUM(CASE WHEN insert_update_indicator = 'type2_change' THEN 1 ELSE 0 END),0) || ' type2 changes'
-            FROM {updater.database_name}.{updater.etl_schema_name}.{table_name}_updates
-        """).collect()[0][0]
+        updater = TableUpdater(
+            session,
+            table_name,
+            batch_id,
+            type_1_column_names=type_1_column_names,
+            log_sink=log_sink,
+            metadata_cache=default_metadata_cache if use_metadata_cache else None,
+            execution_mode=execution_mode,
+            staging_strategy=staging_strategy,
+            watermark_column=watermark_column,
+            full_reconcile=full_reconcile,
+            full_reconcile_days=full_reconcile_days,
+            chunk_count=chunk_count,
+            chunk_column=chunk_column,
+            type_1_history_full_scan=type_1_history_full_scan,
+            type_1_compare_columns_only=type_1_compare_columns_only,
+            enable_deletes=enable_deletes,
+            max_delete_percentage=max_delete_percentage,
+            delete_mode=delete_mode
+        )
+        summary = updater.run()
         updater._log(f'Completed, summary: {summary}')
+        updater.cleanup_staging_tables()
+        if record_run_metrics:
+            updater.save_run_metrics()
+        log_sink.flush()
         
+        if return_metrics:
+            return updater.run_metrics_json(summary)
         return f"{table_name} completed — {summary}"
     except Exception as e:
-        # Log the error before raising
+        # Log the error (plus anything still buffered) before raising
         try:
-            session.call('etl.logging', f'TABLE_UPDATER:{table_name}', 'error', batch_id, f'Error updating {table_name}: {str(e)}')
+            log_sink.log(f'TABLE_UPDATER:{table_name}', 'error', f'Error updating {table_name}: {str(e)}')
+            log_sink.flush()
         except:
             pass  # Don't fail if logging itself fails
+        try:
+            if updater is not None:
+                updater.cleanup_staging_tables()
+        except:
+            pass  # Don't mask the original error if cleanup fails
+        try:
+            if updater is not None and record_run_metrics:
+                updater.save_run_metrics()  # Metrics up to the failing phase
+                log_sink.flush()
+        except:
+            pass  # Don't mask the original error if saving metrics fails
         raise e
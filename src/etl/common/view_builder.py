@@ -0,0 +1,453 @@
+import re
+from dataclasses import dataclass, field
+
+try:
+    from src.etl.common.table_metadata import TableMetadata, hash_storage_type
+except ImportError:
+    from table_metadata import TableMetadata, hash_storage_type
+
+# Target columns maintained by the ETL process - never hash inputs
+ETL_MANAGED_COLUMNS = [
+    'etl_row_hash_value', 'etl_row_hash_value_2',
+    'row_effective_date', 'row_expiration_date', 'current_row_flag',
+    'create_username', 'create_datetime', 'create_batch_name',
+    'last_update_username', 'last_update_datetime', 'last_update_batch_name',
+    'is_deleted', 'deleted_batch_name'
+]
+
+# INFORMATION_SCHEMA data types that CONCAT_WS accepts without a CAST
+STRING_DATA_TYPES = ('TEXT', 'VARCHAR', 'STRING', 'CHAR', 'CHARACTER')
+
+# Keywords that can directly precede a column reference, so `keyword column` is not an implicit alias
+SELECT_KEYWORDS = ('SELECT', 'DISTINCT', 'FROM', 'WHERE', 'AND', 'OR', 'NOT', 'ON', 'BY', 'WHEN', 'THEN', 'ELSE')
+
+HASH_ALGORITHMS = ('sha1', 'sha1_binary', 'hash')
+
+# Row hash storage type -> view hash algorithm and target column DDL type
+HASH_STORAGE_ALGORITHMS = {'STRING': 'sha1', 'BINARY': 'sha1_binary', 'NUMBER': 'hash'}
+HASH_STORAGE_DDL_TYPES = {'STRING': 'STRING', 'BINARY': 'BINARY(20)', 'NUMBER': 'NUMBER(38,0)'}
+
+
+@dataclass
+class ViewColumnClassification:
+    """How the columns of a target table feed its ETL view.
+
+    Attributes:
+        table_name: Name of the target table
+        table_type: 'dim_type_1', 'dim_type_2' or 'fact' (same inference as TableUpdater)
+        natural_keys: Primary key columns - selected, never hashed
+        hash_columns: Inputs of etl_row_hash_value (Type 1 columns for dim_type_2, all business columns otherwise)
+        hash_columns_2: Inputs of etl_row_hash_value_2 (Type 2 columns, dim_type_2 only)
+    """
+    table_name: str
+    table_type: str
+    natural_keys: list[str]
+    hash_columns: list[str]
+    hash_columns_2: list[str] = field(default_factory=list)
+
+    @property
+    def view_columns(self) -> list[str]:
+        """Columns the view selects besides the hashes, in target table order."""
+        return self.natural_keys + [column_name for column_name in self.hash_columns + self.hash_columns_2 if column_name not in self.natural_keys]
+
+
+@dataclass
+class HashValidationResult:
+    """Findings of validate_view_hashes().
+
+    Attributes:
+        view_name: Validated view
+        errors: Hash inputs that don't match the classification (wrong split, missing or extra columns)
+        warnings: Inefficiencies that don't affect correctness (e.g. needless casts)
+    """
+    view_name: str
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+
+def _infer_table_type(table_metadata: TableMetadata) -> str:
+    table_lower = table_metadata.table_name.lower()
+    if table_lower.startswith('dim_'):
+        return 'dim_type_2' if 'etl_row_hash_value_2' in table_metadata.table_columns else 'dim_type_1'
+    elif table_lower.startswith('fact_'):
+        return 'fact'
+    raise ValueError(f"Unable to infer table type for '{table_metadata.table_name}'. Table name must start with 'dim_' or 'fact_'")
+
+
+def _split_column_names(column_names: str | list[str] | None) -> list[str]:
+    """Accept the comma-separated form TableUpdater uses as well as a list."""
+    if column_names is None:
+        return []
+    if isinstance(column_names, str):
+        column_names = column_names.split(',')
+    return [column_name.strip().lower() for column_name in column_names if column_name.strip()]
+
+
+def classify_columns(
+    table_metadata: TableMetadata,
+    type_2_column_names: str | list[str] | None = None,
+    type_1_column_names: str | list[str] | None = None
+) -> ViewColumnClassification:
+    """Split a target table's business columns into hash inputs.
+
+    Business columns are the table columns minus the surrogate key, natural keys and ETL-managed columns.
+    For dim_type_2, type_2_column_names feed etl_row_hash_value_2 and the rest feed etl_row_hash_value;
+    type_1_column_names is optional and only checked against that rest.
+
+    Args:
+        table_metadata: Metadata of the target table (e.g. from load_table_metadata)
+        type_2_column_names: Comma-separated or list of Type 2 columns (required for dim_type_2)
+        type_1_column_names: Optional comma-separated or list of Type 1 columns (dim_type_2 only)
+
+    Returns:
+        ViewColumnClassification: Natural keys and hash inputs in table column order
+
+    Raises:
+        AssertionError: If the declared columns don't partition the business columns
+    """
+    table_type = _infer_table_type(table_metadata)
+    surrogate_key = f'{table_metadata.table_name.lower()}_key'
+    natural_keys = list(table_metadata.natural_keys)
+    business_columns = [
+        column_name for column_name in table_metadata.table_columns
+        if column_name != surrogate_key and column_name not in natural_keys and column_name not in ETL_MANAGED_COLUMNS
+    ]
+    assert len(natural_keys) > 0, f"No primary keys defined on table: {table_metadata.table_name}"
+
+    type_2_columns = _split_column_names(type_2_column_names)
+    type_1_columns = _split_column_names(type_1_column_names)
+    if table_type != 'dim_type_2':
+        assert not type_2_columns, f"Type 2 columns declared for {table_type} table: {table_metadata.table_name}"
+        return ViewColumnClassification(table_metadata.table_name, table_type, natural_keys, business_columns)
+
+    assert type_2_columns, f"type_2_column_names is required for dim_type_2 table: {table_metadata.table_name}"
+    for column_name in type_1_columns + type_2_columns:
+        assert column_name in business_columns, f"Declared column '{column_name}' is not a business column of {table_metadata.table_name}"
+    overlap = sorted(set(type_1_columns) & set(type_2_columns))
+    assert not overlap, f"Columns declared both Type 1 and Type 2: {overlap}"
+    hash_columns = [column_name for column_name in business_columns if column_name not in type_2_columns]
+    if type_1_columns:
+        unclassified = [column_name for column_name in hash_columns if column_name not in type_1_columns]
+        assert not unclassified, f"Business columns neither Type 1 nor Type 2: {unclassified}"
+    return ViewColumnClassification(
+        table_metadata.table_name,
+        table_type,
+        natural_keys,
+        hash_columns,
+        [column_name for column_name in business_columns if column_name in type_2_columns]
+    )
+
+
+def hash_expression(column_names: list[str], column_types: dict[str, str] | None = None, algorithm: str = 'sha1') -> str:
+    """Row hash expression over column_names.
+
+    'sha1' keeps the documented SHA1(CONCAT_WS('|', COALESCE(CAST(col AS STRING), '|'), ...)) contract - hash values
+    match hand-written views, but columns already typed as strings (per column_types) skip the CAST. 'sha1_binary'
+    hashes the same string with SHA1_BINARY, for BINARY(20) hash columns (half the bytes of the 40 character hex
+    string). 'hash' uses Snowflake's 64-bit HASH(col, ...), which takes any types and NULLs directly and is much
+    cheaper than SHA1 over a concatenated string (a NUMBER, with a higher collision probability than SHA1). HASH is
+    type-sensitive - the same value typed NUMBER(10,2) and NUMBER(38,0), or NUMBER and TEXT, hashes differently - so
+    its inputs must have the same types wherever the hash is computed (ETL view and target table).
+
+    Args:
+        column_names: Hash inputs in a fixed order
+        column_types: Optional column name -> INFORMATION_SCHEMA data type of the source columns
+        algorithm: 'sha1' (default), 'sha1_binary' or 'hash'
+
+    Returns:
+        str: SQL expression
+    """
+    assert algorithm in HASH_ALGORITHMS, f"Unknown hash algorithm '{algorithm}', expected one of {HASH_ALGORITHMS}"
+    assert column_names, 'hash_expression requires at least one column'
+    if algorithm == 'hash':
+        return f"HASH({', '.join(column_names)})"
+
+    column_types = {column_name.lower(): data_type.upper() for column_name, data_type in (column_types or {}).items()}
+    coalesced_columns = []
+    for column_name in column_names:
+        data_type = column_types.get(column_name, '')
+        is_string = data_type.split('(')[0] in STRING_DATA_TYPES
+        coalesced_columns.append(f"COALESCE({column_name if is_string else f'CAST({column_name} AS STRING)'}, '|')")
+    coalesced_sql = ',\n        '.join(coalesced_columns)
+    hash_function = 'SHA1_BINARY' if algorithm == 'sha1_binary' else 'SHA1'
+    return f"{hash_function}(CONCAT_WS('|',\n        {coalesced_sql}\n    ))"
+
+
+def build_view_sql(
+    classification: ViewColumnClassification,
+    source_sql: str,
+    column_types: dict[str, str] | None = None,
+    algorithm: str = 'sha1',
+    database_name: str = 'learning_db',
+    etl_schema_name: str = 'etl'
+) -> str:
+    """CREATE OR REPLACE VIEW DDL for vw_{table_name} with the hash columns TableUpdater expects.
+
+    Args:
+        classification: Column classification from classify_columns()
+        source_sql: Source table name or parenthesized query whose columns are named like the target columns
+        column_types: Optional source column name -> data type (skips casts on string columns)
+        algorithm: 'sha1' (default), 'sha1_binary' or 'hash', see hash_expression()
+        database_name: Database of the ETL view
+        etl_schema_name: Schema of the ETL view
+
+    Returns:
+        str: View DDL
+    """
+    select_columns = [*classification.view_columns]
+    select_columns.append(f'{hash_expression(classification.hash_columns, column_types, algorithm)} AS etl_row_hash_value')
+    if classification.table_type == 'dim_type_2':
+        select_columns.append(f'{hash_expression(classification.hash_columns_2, column_types, algorithm)} AS etl_row_hash_value_2')
+    select_sql = '\n    ,'.join(select_columns)
+    return f"""CREATE OR REPLACE VIEW {database_name}.{etl_schema_name}.vw_{classification.table_name} AS
+SELECT
+     {select_sql}
+FROM {source_sql}"""
+
+
+def load_column_types(session, object_name: str, database_name: str = 'learning_db', schema_name: str = 'src') -> dict[str, str]:
+    """Data types of a source table/view from INFORMATION_SCHEMA.COLUMNS.
+
+    Args:
+        session: Snowflake Snowpark session object
+        object_name: Source table or view name
+        database_name: Database of the source object
+        schema_name: Schema of the source object
+
+    Returns:
+        dict: Lowercase column name -> data type (e.g. 'TEXT', 'NUMBER')
+    """
+    rows = session.sql(f"""
+    SELECT COLUMN_NAME, DATA_TYPE
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_CATALOG = UPPER('{database_name}')
+    AND TABLE_SCHEMA = UPPER('{schema_name}')
+    AND TABLE_NAME = UPPER('{object_name}')
+    """).collect()
+    return {row[0].lower(): row[1].upper() for row in rows}
+
+
+def load_view_definition(session, table_metadata: TableMetadata) -> str | None:
+    """SQL text of vw_{table_name} from INFORMATION_SCHEMA.VIEWS (None if the view doesn't exist)."""
+    rows = session.sql(f"""
+    SELECT VIEW_DEFINITION
+    FROM INFORMATION_SCHEMA.VIEWS
+    WHERE TABLE_CATALOG = UPPER('{table_metadata.database_name}')
+    AND TABLE_SCHEMA = UPPER('{table_metadata.etl_schema_name}')
+    AND TABLE_NAME = UPPER('vw_{table_metadata.table_name}')
+    """).collect()
+    return rows[0][0] if rows else None
+
+
+def _find_alias(view_definition: str, alias: str) -> re.Match | None:
+    """Alias of a select item, either `expr AS alias` or the implicit `expr alias` (which must end the item,
+    and must not follow a keyword - `SELECT alias` or `WHERE alias ...` reference a column)."""
+    alias_match = re.search(rf'\bAS\s+"?{alias}"?(?![\w])', view_definition, flags=re.IGNORECASE)
+    if alias_match is not None:
+        return alias_match
+    for alias_match in re.finditer(rf'(?<=[\w)"])\s+"?{alias}"?(?![\w])(?=\s*(?:,|\bFROM\b|$))', view_definition, flags=re.IGNORECASE):
+        previous_word = re.search(r'(\w+)\W*$', view_definition[:alias_match.start()])
+        if previous_word is None or previous_word.group(1).upper() not in SELECT_KEYWORDS:
+            return alias_match
+    return None
+
+
+def _select_item_sql(view_definition: str, alias: str) -> str | None:
+    """Expression of the top-level select item aliased `alias`, found by walking back to the previous
+    comma (or SELECT) at parenthesis depth 0."""
+    alias_match = _find_alias(view_definition, alias)
+    if alias_match is None:
+        return None
+    depth = 0
+    position = alias_match.start() - 1
+    while position >= 0:
+        character = view_definition[position]
+        if character == ')':
+            depth += 1
+        elif character == '(':
+            if depth == 0:
+                break
+            depth -= 1
+        elif character == ',' and depth == 0:
+            break
+        elif depth == 0 and re.match(r'SELECT\b', view_definition[position:], flags=re.IGNORECASE) and not re.match(r'\w', view_definition[position - 1:position] or ' '):
+            position += len('SELECT') - 1
+            break
+        position -= 1
+    return view_definition[position + 1:alias_match.start()].strip()
+
+
+def _referenced_columns(expression_sql: str, column_names: list[str]) -> list[str]:
+    """Known column names referenced by an expression, in order of first use (string literals ignored)."""
+    expression_sql = re.sub(r"'(?:[^']|'')*'", "''", expression_sql)
+    referenced = []
+    for identifier in re.findall(r'(?<![\w.])(?:\w+\.)?"?(\w+)"?', expression_sql):
+        identifier = identifier.lower()
+        if identifier in column_names and identifier not in referenced:
+            referenced.append(identifier)
+    return referenced
+
+
+def validate_view_hashes(
+    view_definition: str,
+    classification: ViewColumnClassification,
+    column_types: dict[str, str] | None = None
+) -> HashValidationResult:
+    """Check an existing view's hash inputs against the declared column classification.
+
+    Errors: a hash column missing from the view, a declared column missing from its hash, a column in the
+    wrong hash (a Type 2 column in etl_row_hash_value or vice versa corrupts history) or natural keys /
+    unclassified columns hashed. Warnings: CASTs of columns that are already strings (per column_types).
+
+    Args:
+        view_definition: View SQL (e.g. from load_view_definition)
+        classification: Declared classification from classify_columns()
+        column_types: Optional source column name -> data type
+
+    Returns:
+        HashValidationResult: Errors and warnings
+    """
+    result = HashValidationResult(f'vw_{classification.table_name}')
+    known_columns = classification.natural_keys + classification.hash_columns + classification.hash_columns_2
+    expected_hashes = {'etl_row_hash_value': classification.hash_columns}
+    if classification.table_type == 'dim_type_2':
+        expected_hashes['etl_row_hash_value_2'] = classification.hash_columns_2
+
+    for hash_column_name, expected_columns in expected_hashes.items():
+        expression_sql = _select_item_sql(view_definition, hash_column_name)
+        if expression_sql is None:
+            result.errors.append(f'{hash_column_name} is missing from the view')
+            continue
+        referenced = _referenced_columns(expression_sql, known_columns)
+        for column_name in expected_columns:
+            if column_name not in referenced:
+                result.errors.append(f"{hash_column_name} does not include '{column_name}'")
+        for column_name in referenced:
+            if column_name in expected_columns:
+                continue
+            if column_name in classification.natural_keys:
+                result.errors.append(f"{hash_column_name} includes natural key '{column_name}'")
+            else:
+                other_hash = next((other_name for other_name, other_columns in expected_hashes.items() if column_name in other_columns), None)
+                result.errors.append(f"{hash_column_name} includes '{column_name}', which belongs to {other_hash}")
+
+        # Casting a string to a string is pure overhead on wide tables
+        if column_types:
+            string_columns = [column_name for column_name, data_type in column_types.items() if data_type.upper().split('(')[0] in STRING_DATA_TYPES]
+            for cast_match in re.finditer(r'CAST\(\s*(?:\w+\.)?"?(\w+)"?\s+AS\s+(?:STRING|VARCHAR|TEXT)\b', expression_sql, flags=re.IGNORECASE):
+                if cast_match.group(1).lower() in string_columns:
+                    result.warnings.append(f"{hash_column_name} casts string column '{cast_match.group(1).lower()}' (CAST is not needed)")
+            for cast_match in re.finditer(r'(?:\w+\.)?"?(\w+)"?\s*::\s*(?:STRING|VARCHAR|TEXT)\b', expression_sql, flags=re.IGNORECASE):
+                if cast_match.group(1).lower() in string_columns:
+                    result.warnings.append(f"{hash_column_name} casts string column '{cast_match.group(1).lower()}' (CAST is not needed)")
+    return result
+
+
+def hash_migration_statements(
+    table_metadata: TableMetadata,
+    classification: ViewColumnClassification,
+    storage_type: str
+) -> list[str]:
+    """Statements converting a table's row hash columns to another storage type.
+
+    Each hash column is rebuilt as {column}_migrated, filled, then swapped in by DROP/RENAME (Snowflake can't
+    change a column's type in place). STRING <-> BINARY converts the stored SHA1 digests between hex and binary;
+    conversions to or from NUMBER recompute the hashes from the row's own columns, since HASH and SHA1 values
+    can't be derived from each other. Columns already stored as storage_type are skipped.
+
+    Args:
+        table_metadata: Metadata of the target table (e.g. from load_table_metadata)
+        classification: Column classification from classify_columns()
+        storage_type: 'STRING', 'BINARY' or 'NUMBER'
+
+    Returns:
+        list: SQL statements in execution order (empty if nothing needs to change)
+    """
+    storage_type = storage_type.upper()
+    assert storage_type in HASH_STORAGE_ALGORITHMS, f"Unknown hash storage type '{storage_type}', expected one of {tuple(HASH_STORAGE_ALGORITHMS)}"
+    full_table_name = f'{table_metadata.database_name}.{table_metadata.schema_name}.{table_metadata.table_name}'
+    hash_inputs = {'etl_row_hash_value': classification.hash_columns}
+    if classification.table_type == 'dim_type_2':
+        hash_inputs['etl_row_hash_value_2'] = classification.hash_columns_2
+
+    statements = []
+    for hash_column_name, column_names in hash_inputs.items():
+        current_storage_type = hash_storage_type(table_metadata.table_column_types.get(hash_column_name)) or 'STRING'
+        if current_storage_type == storage_type:
+            continue
+        if current_storage_type == 'STRING' and storage_type == 'BINARY':
+            value_sql = f"TO_BINARY({hash_column_name}, 'HEX')"
+        elif current_storage_type == 'BINARY' and storage_type == 'STRING':
+            value_sql = f"LOWER(TO_VARCHAR({hash_column_name}, 'HEX'))"
+        else:
+            value_sql = hash_expression(column_names, table_metadata.table_column_types, HASH_STORAGE_ALGORITHMS[storage_type])
+        migrated_column_name = f'{hash_column_name}_migrated'
+        statements.extend([
+            f'ALTER TABLE {full_table_name} ADD COLUMN {migrated_column_name} {HASH_STORAGE_DDL_TYPES[storage_type]}',
+            f'UPDATE {full_table_name} SET {migrated_column_name} = {value_sql}',
+            f'ALTER TABLE {full_table_name} DROP COLUMN {hash_column_name}',
+            f'ALTER TABLE {full_table_name} RENAME COLUMN {migrated_column_name} TO {hash_column_name}'
+        ])
+    return statements
+
+
+def migrate_hash_storage(
+    session,
+    table_metadata: TableMetadata,
+    classification: ViewColumnClassification,
+    storage_type: str,
+    source_sql: str,
+    column_types: dict[str, str] | None = None,
+    execute: bool = True
+) -> list[str]:
+    """Convert an existing table's row hashes to another storage type and rebuild its ETL view to match.
+
+    TableUpdater rejects a view whose hash type differs from the table's, so the table and view have to move
+    together - run this between loads. The view is rebuilt with build_view_sql() using the algorithm of the
+    new storage type.
+
+    Moving to NUMBER hashes the table's columns with HASH while the view hashes the source columns, and HASH is
+    type-sensitive: the source columns must have the target column types (cast them in source_sql if not), or the
+    next load sees every row as changed. With column_types, mismatched hash inputs are rejected up front.
+
+    Args:
+        session: Snowflake Snowpark session object
+        table_metadata: Metadata of the target table (e.g. from load_table_metadata)
+        classification: Column classification from classify_columns()
+        storage_type: 'STRING' (SHA1 hex), 'BINARY' (SHA1_BINARY) or 'NUMBER' (HASH)
+        source_sql: Source table name or parenthesized query for the rebuilt view
+        column_types: Optional source column name -> data type (skips casts on string columns)
+        execute: Run the statements (False only returns them, for review)
+
+    Returns:
+        list: Executed (or planned) SQL statements
+
+    Raises:
+        AssertionError: If storage_type is NUMBER and column_types disagree with the table's column types
+    """
+    if storage_type.upper() == 'NUMBER' and column_types:
+        source_types = {column_name.lower(): data_type.upper() for column_name, data_type in column_types.items()}
+        mismatched = [
+            f"{column_name} ({source_types[column_name]} vs {table_metadata.table_column_types[column_name].upper()})"
+            for column_name in classification.hash_columns + classification.hash_columns_2
+            if column_name in source_types and column_name in table_metadata.table_column_types
+            and source_types[column_name] != table_metadata.table_column_types[column_name].upper()
+        ]
+        assert not mismatched, f"HASH is type-sensitive, source column types differ from {table_metadata.table_name}: {mismatched} - cast them in source_sql"
+    statements = hash_migration_statements(table_metadata, classification, storage_type)
+    statements.append(build_view_sql(
+        classification,
+        source_sql,
+        column_types,
+        HASH_STORAGE_ALGORITHMS[storage_type.upper()],
+        table_metadata.database_name,
+        table_metadata.etl_schema_name
+    ))
+    if execute:
+        for sql_string in statements:
+            session.sql(sql_string).collect()
+    return statements
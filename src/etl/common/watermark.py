@@ -0,0 +1,91 @@
+from datetime import datetime
+
+
+class WatermarkStore:
+    def __init__(self, backend, control_table_name: str):
+        """High-water marks for incremental TableUpdater runs, kept in an etl control table.
+
+        One row per (table, watermark column). The mark is stored as a string and compared against the
+        view column with Snowflake's implicit cast, so timestamp, date and numeric watermarks all work.
+
+        Args:
+            backend: Execution backend (SessionBackend or PlanBackend)
+            control_table_name: Fully qualified control table name (e.g. learning_db.etl.etl_watermark)
+        """
+        self.backend = backend
+        self.control_table_name = control_table_name
+
+    def ensure_control_table(self) -> None:
+        """Create the control table if it does not exist yet."""
+        self.backend.execute(f"""
+        CREATE TABLE IF NOT EXISTS {self.control_table_name} (
+             table_name STRING
+            ,watermark_column STRING
+            ,high_water_mark STRING
+            ,last_full_reconcile_datetime TIMESTAMP_NTZ
+            ,last_update_batch_name STRING
+            ,last_update_datetime TIMESTAMP_NTZ
+        )
+        """, 'watermark')
+
+    def get(self, full_table_name: str, watermark_column: str) -> tuple[str | None, datetime | None]:
+        """Read the stored high-water mark for a table.
+
+        Args:
+            full_table_name: Fully qualified target table name
+            watermark_column: Watermark column in the ETL view
+
+        Returns:
+            tuple: (high_water_mark, last_full_reconcile_datetime), both None if nothing has been stored yet
+        """
+        rows = self.backend.execute(f"""
+        SELECT high_water_mark, last_full_reconcile_datetime
+        FROM {self.control_table_name}
+        WHERE table_name = '{full_table_name.lower()}'
+        AND watermark_column = '{watermark_column.lower()}'
+        """, 'watermark')
+        if not rows:
+            return None, None
+        return rows[0][0], rows[0][1]
+
+    def save(
+        self,
+        full_table_name: str,
+        watermark_column: str,
+        high_water_mark: str,
+        batch_id: str,
+        current_datetime_cst: datetime,
+        full_reconcile: bool
+    ) -> None:
+        """Store the high-water mark reached by a completed run.
+
+        Args:
+            full_table_name: Fully qualified target table name
+            watermark_column: Watermark column in the ETL view
+            high_water_mark: Highest watermark value processed by the run
+            batch_id: Batch ID of the run
+            current_datetime_cst: Run timestamp
+            full_reconcile: Whether the run scanned the full view (updates last_full_reconcile_datetime)
+        """
+        reconcile_datetime = f"CAST('{current_datetime_cst}' AS TIMESTAMP_NTZ)" if full_reconcile else 'NULL'
+        self.backend.execute(f"""
+        MERGE INTO {self.control_table_name} as target
+        USING (
+            SELECT
+                 '{full_table_name.lower()}' AS table_name
+                ,'{watermark_column.lower()}' AS watermark_column
+                ,'{high_water_mark}' AS high_water_mark
+                ,{reconcile_datetime} AS last_full_reconcile_datetime
+                ,'{batch_id}' AS last_update_batch_name
+                ,CAST('{current_datetime_cst}' AS TIMESTAMP_NTZ) AS last_update_datetime
+        ) as source
+        ON target.table_name = source.table_name
+            AND target.watermark_column = source.watermark_column
+        WHEN MATCHED THEN UPDATE SET
+             target.high_water_mark = source.high_water_mark
+            ,target.last_full_reconcile_datetime = COALESCE(source.last_full_reconcile_datetime, target.last_full_reconcile_datetime)
+            ,target.last_update_batch_name = source.last_update_batch_name
+            ,target.last_update_datetime = source.last_update_datetime
+        WHEN NOT MATCHED THEN INSERT (table_name, watermark_column, high_water_mark, last_full_reconcile_datetime, last_update_batch_name, last_update_datetime)
+        VALUES (source.table_name, source.watermark_column, source.high_water_mark, source.last_full_reconcile_datetime, source.last_update_batch_name, source.last_update_datetime)
+        """, 'watermark')
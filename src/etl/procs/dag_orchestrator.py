@@ -1,19 +1,41 @@
 """
 ETL DAG Orchestrator
 
-Creates a DAG that orchestrates ETL loads in dependency order:
+Creates a DAG that orchestrates ETL loads in dependency order, built from TABLE_MANIFEST:
 1. dim_employee (runs first)
 2. fact_employee_pay (runs after dim_employee succeeds)
 
+Tables with no dependency between them run in parallel. Dependencies can also be
+inferred from fact -> dim foreign key column names ({dim_table}_key).
+
 Usage:
     Copy this code into a Snowflake Python worksheet or notebook cell,
     adjust the configuration variables, and run.
+
+    The wave planning lives in src/etl/common/dag_planner.py, which has to be importable as a top-level
+    dag_planner module next to this code:
+    - Python worksheet: add it under Packages > Stage Packages, e.g.
+      @your_repo/branches/main/src/etl/common/dag_planner.py (or upload the file to a stage and use that path)
+    - Notebook: upload dag_planner.py to the notebook's files (it is then on the import path)
+    - Locally: run from the repository root (src.etl.common.dag_planner), or run this file directly from
+      src/etl/procs - the sibling src/etl/common folder is added to the path
 """
 
+import sys
+from pathlib import Path
+
 from snowflake.snowpark import Session
 from snowflake.core.task.dagv1 import DAG, DAGTask, DAGOperation
 from snowflake.core import CreateMode, Root
 
+try:
+    from src.etl.common.dag_planner import infer_key_dependencies, normalize_manifest, plan_dag
+except ImportError:
+    # dag_planner.py lives in src/etl/common, not next to this file - add it when running from a checkout
+    if '__file__' in globals():
+        sys.path.append(str(Path(__file__).resolve().parents[1] / 'common'))
+    from dag_planner import infer_key_dependencies, normalize_manifest, plan_dag
+
 # =============================================================================
 # Configuration - adjust these values for your environment
 # =============================================================================
@@ -24,18 +46,85 @@ WAREHOUSE_NAME = 'COMPUTE_WH'
 # Set to number of minutes for automatic scheduling, or None for manual execution only
 SCHEDULE_MINUTES = None  # e.g., 60 for hourly runs
 
+# Schema holding the dimension/fact tables (used to infer dependencies from key columns)
+DW_SCHEMA = 'DW'
+
+# Tables to load and their upstream tables - a list of upstreams, or a dict with 'depends_on'
+# plus table_updater options (type_1_column_names, enable_deletes, max_delete_percentage). Can also be loaded from YAML
+# with dag_planner.load_manifest().
+TABLE_MANIFEST = {
+    'dim_employee': [],
+    'fact_employee_pay': {'depends_on': ['dim_employee']},
+}
+
+# Add dependencies inferred from fact -> dim key columns (e.g. fact_employee_pay.dim_employee_key)
+INFER_DEPENDENCIES = False
+
+
+def infer_manifest_dependencies(session: Session, manifest: dict) -> dict:
+    """
+    Adds fact -> dim dependencies inferred from {dim_table}_key columns to a manifest.
+    
+    Args:
+        session: Snowflake session object
+        manifest: Table manifest (see dag_planner.normalize_manifest)
+    
+    Returns:
+        Normalized manifest with inferred upstream tables merged into depends_on
+    """
+    normalized = normalize_manifest(manifest)
+    table_list = ', '.join([f"UPPER('{table_name}')" for table_name in normalized])
+    column_rows = session.sql(f"""
+        SELECT LOWER(TABLE_NAME) AS table_name, LOWER(COLUMN_NAME) AS column_name
+        FROM {TARGET_DATABASE}.INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = UPPER('{DW_SCHEMA}')
+        AND TABLE_NAME IN ({table_list})
+    """).collect()
+
+    table_columns = {table_name: [] for table_name in normalized}
+    for row in column_rows:
+        table_columns[row[0]].append(row[1])
+
+    for table_name, upstreams in infer_key_dependencies(table_columns).items():
+        normalized[table_name]['depends_on'] = sorted(set(normalized[table_name]['depends_on']) | set(upstreams))
+    return normalized
+
 
-def create_dag_orchestrator(session: Session) -> str:
+def build_task_definition(table_name: str, table_config: dict) -> str:
+    """Builds the CALL statement for one table, passing any configured table_updater options."""
+    arguments = [f"table_name => '{table_name}'"]
+    if table_config.get('type_1_column_names'):
+        arguments.append(f"type_1_column_names => '{table_config['type_1_column_names']}'")
+    if table_config.get('enable_deletes'):
+        arguments.append("enable_deletes => TRUE")
+    if table_config.get('max_delete_percentage') is not None:
+        arguments.append(f"max_delete_percentage => {float(table_config['max_delete_percentage'])}")
+    return f"CALL {TARGET_DATABASE}.{TARGET_SCHEMA}.table_updater({', '.join(arguments)});"
+
+
+def create_dag_orchestrator(session: Session, manifest: dict | None = None, infer_dependencies: bool | None = None) -> str:
     """
     Creates and deploys the ETL DAG orchestrator.
     
     Args:
         session: Snowflake session object (use get_active_session() in notebooks)
+        manifest: Table manifest, defaults to TABLE_MANIFEST
+        infer_dependencies: Add dependencies inferred from key columns, defaults to INFER_DEPENDENCIES
     
     Returns:
         Success message with DAG details
+    
+    Raises:
+        ValueError: If the manifest references unknown tables or contains a dependency cycle
     """
     root = Root(session)
+    manifest = TABLE_MANIFEST if manifest is None else manifest
+    infer_dependencies = INFER_DEPENDENCIES if infer_dependencies is None else infer_dependencies
+
+    # Plan first so cycles / unknown tables fail before anything is deployed
+    manifest = infer_manifest_dependencies(session, manifest) if infer_dependencies else normalize_manifest(manifest)
+    plan = plan_dag(manifest)
+    print(plan.describe())
     
     # Build DAG configuration
     dag_config = {
@@ -47,31 +136,29 @@ def create_dag_orchestrator(session: Session) -> str:
     if SCHEDULE_MINUTES:
         dag_config['schedule'] = f'{SCHEDULE_MINUTES} MINUTE'
     
-    # Define the DAG with tasks and dependencies
+    # Define the DAG with one task per table, created wave by wave
     with DAG(**dag_config) as dag:
-        # Task 1: Load dim_employee (runs first)
-        task_dim_employee = DAGTask(
-            name="load_dim_employee",
-            definition=f"CALL {TARGET_DATABASE}.{TARGET_SCHEMA}.table_updater('dim_employee');",
-            comment="Load dimension table: dim_employee"
-        )
-        
-        # Task 2: Load fact_employee_pay (depends on dim_employee)
-        task_fact_employee_pay = DAGTask(
-            name="load_fact_employee_pay",
-            definition=f"CALL {TARGET_DATABASE}.{TARGET_SCHEMA}.table_updater('fact_employee_pay');",
-            comment="Load fact table: fact_employee_pay"
-        )
+        tasks = {}
+        for wave in plan.waves:
+            for table_name in wave:
+                table_kind = 'fact' if table_name.startswith('fact_') else 'dimension'
+                tasks[table_name] = DAGTask(
+                    name=f"load_{table_name}",
+                    definition=build_task_definition(table_name, manifest[table_name]),
+                    comment=f"Load {table_kind} table: {table_name}"
+                )
         
-        # Define dependency: fact_employee_pay waits for dim_employee to succeed
-        task_dim_employee >> task_fact_employee_pay
+        # Each table waits only for its own upstream tables, so independent tables run in parallel
+        for table_name, upstreams in plan.dependencies.items():
+            for upstream in upstreams:
+                tasks[upstream] >> tasks[table_name]
     
     # Deploy the DAG
     dag_op = DAGOperation(root.databases[TARGET_DATABASE].schemas[TARGET_SCHEMA])
     dag_op.deploy(dag, mode=CreateMode.or_replace)
     
     schedule_msg = f" (scheduled every {SCHEDULE_MINUTES} minutes)" if SCHEDULE_MINUTES else " (manual execution only)"
-    return f"DAG 'etl_dag_orchestrator' deployed to {TARGET_DATABASE}.{TARGET_SCHEMA}{schedule_msg}"
+    return f"DAG 'etl_dag_orchestrator' deployed to {TARGET_DATABASE}.{TARGET_SCHEMA}{schedule_msg}, {len(tasks)} tasks in {len(plan.waves)} waves {plan.wave_widths}"
 
 
 def execute_dag(session: Session) -> str:
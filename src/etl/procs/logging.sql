@@ -58,3 +58,49 @@ def main(session, logger_name: str, log_level: str, batch_id: str, log_message:
         return f"Info log written: {log_message}"
 $$;
 
+
+CREATE OR REPLACE PROCEDURE etl.logging_batch(
+    batch_id VARCHAR,
+    log_entries VARCHAR
+)
+RETURNS VARCHAR
+LANGUAGE PYTHON
+RUNTIME_VERSION = '3.11'
+PACKAGES = ('snowflake-snowpark-python')
+HANDLER = 'main'
+AS
+$$
+import json
+import logging
+
+def main(session, batch_id: str, log_entries: str) -> str:
+    """
+    Batched version of etl.logging - writes many log messages in a single procedure call.
+
+    Args:
+        session: Snowflake session object
+        batch_id: Batch ID for traceability (will be prepended to each message)
+        log_entries: JSON array of [logger_name, log_level, log_message] entries, in order
+    
+    Returns:
+        Success message with the number of log entries written
+
+    Examples:
+        --Using this proc
+        CALL etl.logging_batch('batch_123', '[["logger_name_example", "info", "first message"], ["logger_name_example", "error", "second message"]]');
+    """
+    entries = json.loads(log_entries) if log_entries else []
+
+    for logger_name, log_level, log_message in entries:
+        # Same formatting and level handling as etl.logging
+        logger = logging.getLogger(logger_name)
+        log_level_lower = log_level.lower() if log_level else 'info'
+        formatted_message = f"[ETL] batch_id: {batch_id} - {log_message}"
+
+        if log_level_lower == 'error':
+            logger.error(formatted_message)
+        else:
+            logger.info(formatted_message)
+
+    return f"{len(entries)} log entries written"
+$$;
@@ -0,0 +1,37 @@
+-- Objects behind TableMetadataCache (src/etl/common/metadata_cache.py, main(..., use_metadata_cache=True)).
+-- Deploy once before enabling the cache; table_updater runs never create them.
+
+-- Structural table metadata per target table, valid while schema_fingerprint (table LAST_DDL + view LAST_ALTERED) matches
+CREATE TABLE IF NOT EXISTS etl.table_metadata_cache (
+     full_table_name STRING
+    ,schema_fingerprint STRING
+    ,table_metadata VARIANT
+    ,cached_datetime TIMESTAMP_NTZ
+);
+
+
+-- One row per cache lookup, parsed from the "Table metadata cache {result} for {table} (fingerprint=...)" message
+-- every lookup logs through etl.logging / etl.logging_batch (no extra round trip per run).
+-- result is one of 'memory_hit', 'table_hit', 'miss' or 'uncacheable'.
+CREATE OR REPLACE VIEW etl.vw_table_metadata_cache_lookups AS
+SELECT
+     TIMESTAMP AS lookup_datetime
+    ,REGEXP_SUBSTR(VALUE::STRING, 'batch_id: (\\S+) - ', 1, 1, 'e', 1) AS batch_id
+    ,REGEXP_SUBSTR(VALUE::STRING, 'Table metadata cache (\\w+) for ', 1, 1, 'e', 1) AS result
+    ,REGEXP_SUBSTR(VALUE::STRING, 'Table metadata cache \\w+ for (\\S+) ', 1, 1, 'e', 1) AS full_table_name
+    ,REGEXP_SUBSTR(VALUE::STRING, 'fingerprint=([^)]*)\\)', 1, 1, 'e', 1) AS schema_fingerprint
+FROM learning_db.etl.custom_events
+WHERE RECORD_TYPE = 'LOG'
+AND VALUE::STRING LIKE '[ETL]%Table metadata cache %';
+
+
+-- Daily hit/miss counts per table
+CREATE OR REPLACE VIEW etl.vw_table_metadata_cache_stats AS
+SELECT
+     full_table_name
+    ,DATE_TRUNC('day', lookup_datetime)::DATE AS lookup_date
+    ,COUNT_IF(result IN ('memory_hit', 'table_hit')) AS hits
+    ,COUNT_IF(result NOT IN ('memory_hit', 'table_hit')) AS misses
+    ,ROUND(COUNT_IF(result IN ('memory_hit', 'table_hit')) / COUNT(*), 4) AS hit_rate
+FROM etl.vw_table_metadata_cache_lookups
+GROUP BY full_table_name, DATE_TRUNC('day', lookup_datetime)::DATE;
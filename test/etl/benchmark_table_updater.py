@@ -0,0 +1,284 @@
+"""
+TableUpdater Benchmark Suite
+
+Generates synthetic dim_type_1, dim_type_2 and fact tables (plus their vw_ views) on a local DuckDB
+LocalSession, loads them, applies a percentage of changes and re-runs TableUpdater, recording per-phase
+wall time, statement count and rows inserted/updated/deleted. No Snowflake account is needed.
+
+Results are written to JSON so runs can be compared across commits.
+
+Usage:
+    python test/etl/benchmark_table_updater.py --sizes 10000 100000 --change-rates 0 0.01 0.5 1
+    python test/etl/benchmark_table_updater.py --table-types dim_type_2 --type2-share 0.9 --output churn.json
+    python test/etl/benchmark_table_updater.py --hash-storage binary --output binary_hashes.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.etl.common.local_session import LocalSession
+from src.etl.common.log_sink import BufferedLogSink
+from src.etl.common.table_updater import TableUpdater
+from src.etl.common.view_builder import HASH_STORAGE_ALGORITHMS, HASH_STORAGE_DDL_TYPES
+from src.etl.common.view_builder import hash_expression as view_hash_expression
+
+# =============================================================================
+# Default benchmark grid - override from the command line
+# =============================================================================
+SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+CHANGE_RATES = [0.0, 0.01, 0.5, 1.0]
+TABLE_TYPES = ['dim_type_1', 'dim_type_2', 'fact']
+ATTRIBUTE_COLUMNS = 10
+TYPE2_SHARE = 0.5  # Share of changed dim_type_2 rows whose change is Type 2 (the rest are Type 1)
+HASH_STORAGE = 'STRING'  # Row hash storage: STRING (SHA1 hex), BINARY (SHA1_BINARY) or NUMBER (HASH)
+
+TABLE_NAMES = {
+    'dim_type_1': 'dim_bench_type_1',
+    'dim_type_2': 'dim_bench_type_2',
+    'fact': 'fact_bench'
+}
+
+AUDIT_COLUMNS_DDL = """
+    create_username STRING,
+    create_datetime TIMESTAMP_NTZ,
+    create_batch_name STRING,
+    last_update_username STRING,
+    last_update_datetime TIMESTAMP_NTZ,
+    last_update_batch_name STRING"""
+
+
+def attribute_names(column_count: int) -> list[str]:
+    return [f'attr_{column_number}' for column_number in range(1, column_count + 1)]
+
+
+def hash_expression(column_names: list[str], hash_storage: str = HASH_STORAGE) -> str:
+    """Row hash for the storage type - STRING is the same shape as the ETL views in test_etl_pattern.ipynb."""
+    return view_hash_expression(column_names, algorithm=HASH_STORAGE_ALGORITHMS[hash_storage])
+
+
+def split_type2_columns(column_names: list[str]) -> tuple[list[str], list[str]]:
+    """First half of the attributes are Type 1, the rest Type 2."""
+    split_index = max(1, len(column_names) // 2)
+    return column_names[:split_index], column_names[split_index:] or column_names[-1:]
+
+
+def create_benchmark_tables(session: LocalSession, table_type: str, row_count: int, column_count: int, hash_storage: str = HASH_STORAGE) -> dict:
+    """Create and fill the source table, create the empty target table and its ETL view.
+
+    Args:
+        session: LocalSession to create the objects in
+        table_type: 'dim_type_1', 'dim_type_2' or 'fact'
+        row_count: Number of source rows
+        column_count: Number of attribute columns
+        hash_storage: Row hash storage type of the target table and view
+
+    Returns:
+        dict: table_name, source_table_name and TableUpdater options for the table
+    """
+    table_name = TABLE_NAMES[table_type]
+    source_table_name = f'learning_db.src.source_{table_name}'
+    attributes = attribute_names(column_count)
+    attributes_ddl = ',\n    '.join([f'{column_name} STRING' for column_name in attributes])
+    attributes_select = ', '.join([f"'{column_name}_' || (i % 997)" for column_name in attributes])
+    hash_ddl_type = HASH_STORAGE_DDL_TYPES[hash_storage]
+
+    if table_type == 'fact':
+        session.sql(f"""
+        CREATE TABLE {source_table_name} (
+            entity_id BIGINT,
+            event_date DATE,
+            amount NUMBER(12,2),
+            {attributes_ddl}
+        )""").collect()
+        session.sql(f"""
+        INSERT INTO {source_table_name}
+        SELECT i, DATE '2024-01-01' + CAST(i % 365 AS INTEGER), CAST(i % 10000 AS DECIMAL(12,2)) / 100, {attributes_select}
+        FROM range({row_count}) r(i)
+        """).collect()
+        natural_keys = ['entity_id', 'event_date']
+        view_columns = ['entity_id', 'event_date', 'amount'] + attributes
+        type_columns_ddl = f'entity_id BIGINT,\n    event_date DATE,\n    amount NUMBER(12,2),\n    {attributes_ddl},\n    etl_row_hash_value {hash_ddl_type},'
+        hash_columns_sql = f"{hash_expression(['amount'] + attributes, hash_storage)} AS etl_row_hash_value"
+        options = {}
+    else:
+        session.sql(f"""
+        CREATE TABLE {source_table_name} (
+            entity_id BIGINT,
+            {attributes_ddl}
+        )""").collect()
+        session.sql(f"""
+        INSERT INTO {source_table_name}
+        SELECT i, {attributes_select}
+        FROM range({row_count}) r(i)
+        """).collect()
+        natural_keys = ['entity_id']
+        view_columns = ['entity_id'] + attributes
+        type_columns_ddl = f'entity_id BIGINT,\n    {attributes_ddl},\n    etl_row_hash_value {hash_ddl_type},'
+        hash_columns_sql = f'{hash_expression(attributes, hash_storage)} AS etl_row_hash_value'
+        options = {}
+        if table_type == 'dim_type_2':
+            type_1_columns, type_2_columns = split_type2_columns(attributes)
+            type_columns_ddl += f"""
+    etl_row_hash_value_2 {hash_ddl_type},
+    row_effective_date DATE,
+    row_expiration_date DATE,
+    current_row_flag INT,"""
+            hash_columns_sql = f'{hash_expression(type_1_columns, hash_storage)} AS etl_row_hash_value,\n    {hash_expression(type_2_columns, hash_storage)} AS etl_row_hash_value_2'
+            options = {'type_1_column_names': ','.join(type_1_columns)}
+
+    session.sql(f"""
+    CREATE TABLE learning_db.dw.{table_name} (
+        {table_name}_key BIGINT AUTOINCREMENT,
+        {type_columns_ddl}{AUDIT_COLUMNS_DDL}
+    )""").collect()
+    session.sql(f"ALTER TABLE learning_db.dw.{table_name} ADD CONSTRAINT pk_{table_name} PRIMARY KEY ({', '.join(natural_keys)})").collect()
+    session.sql(f"""
+    CREATE OR REPLACE VIEW learning_db.etl.vw_{table_name} AS
+    SELECT
+        {', '.join(view_columns)},
+        {hash_columns_sql}
+    FROM {source_table_name}
+    """).collect()
+
+    return {'table_name': table_name, 'source_table_name': source_table_name, 'options': options}
+
+
+def apply_changes(session: LocalSession, table_type: str, source_table_name: str, column_count: int, change_rate: float, type2_share: float) -> None:
+    """Change roughly change_rate of the source rows (deterministically, by hash bucket).
+
+    Facts change their amount, Type 1 dims their first attribute, and Type 2 dims a Type 2 attribute
+    for type2_share of the changed rows and a Type 1 attribute for the rest.
+    """
+    if change_rate <= 0:
+        return
+    changed_filter = f'MOD(HASH(entity_id), 10000) < {int(round(change_rate * 10000))}'
+    attributes = attribute_names(column_count)
+    if table_type == 'fact':
+        session.sql(f'UPDATE {source_table_name} SET amount = amount + 1 WHERE {changed_filter}').collect()
+    elif table_type == 'dim_type_1':
+        session.sql(f"UPDATE {source_table_name} SET {attributes[0]} = {attributes[0]} || '_changed' WHERE {changed_filter}").collect()
+    else:
+        type_1_columns, type_2_columns = split_type2_columns(attributes)
+        type2_filter = f"MOD(HASH(entity_id, 'type2'), 10000) < {int(round(type2_share * 10000))}"
+        session.sql(f"UPDATE {source_table_name} SET {type_2_columns[0]} = {type_2_columns[0]} || '_changed' WHERE {changed_filter} AND {type2_filter}").collect()
+        session.sql(f"UPDATE {source_table_name} SET {type_1_columns[0]} = {type_1_columns[0]} || '_changed' WHERE {changed_filter} AND NOT ({type2_filter})").collect()
+
+
+def timed_run(session: LocalSession, table_name: str, batch_id: str, options: dict) -> dict:
+    """Run TableUpdater the same way main() does and collect timings.
+
+    Returns:
+        dict: Total seconds, statement count, summary, change counts and per-phase stats from TableUpdater's run metrics
+    """
+    log_sink = BufferedLogSink(session, batch_id)
+    statement_count_before = session.statement_count
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        updater = TableUpdater(session, table_name, batch_id, log_sink=log_sink, staging_strategy='temporary', **options)
+        summary = updater.run()
+        updater.cleanup_staging_tables()
+        log_sink.flush()
+    run_metrics = json.loads(updater.run_metrics_json(summary))
+    return {
+        'seconds': round(time.perf_counter() - start_time, 4),
+        'statements': session.statement_count - statement_count_before,
+        'summary': summary,
+        'change_counts': dict(updater.change_counts),
+        'phases': run_metrics['phases']
+    }
+
+
+def run_case(table_type: str, row_count: int, change_rate: float, column_count: int, type2_share: float, updater_options: dict, hash_storage: str = HASH_STORAGE) -> dict:
+    """Benchmark one (table type, size, change rate) combination on a fresh LocalSession."""
+    session = LocalSession(current_datetime=datetime(2024, 1, 1, 12))
+    setup_start_time = time.perf_counter()
+    table = create_benchmark_tables(session, table_type, row_count, column_count, hash_storage)
+    setup_seconds = time.perf_counter() - setup_start_time
+    options = {**table['options'], **updater_options}
+
+    initial_load = timed_run(session, table['table_name'], 'bench_initial', options)
+    apply_changes(session, table_type, table['source_table_name'], column_count, change_rate, type2_share)
+    session.current_datetime = datetime(2024, 1, 2, 12)
+    incremental = timed_run(session, table['table_name'], 'bench_incremental', options)
+    session.close()
+
+    return {
+        'table_type': table_type,
+        'rows': row_count,
+        'change_rate': change_rate,
+        'columns': column_count,
+        'type2_share': type2_share if table_type == 'dim_type_2' else None,
+        'hash_storage': hash_storage,
+        'updater_options': options,
+        'setup_seconds': round(setup_seconds, 4),
+        'initial_load': initial_load,
+        'incremental': incremental
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark TableUpdater on a local DuckDB session.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='Source row counts')
+    parser.add_argument('--change-rates', type=float, nargs='+', default=CHANGE_RATES, help='Fractions of rows changed before the measured run')
+    parser.add_argument('--table-types', nargs='+', default=TABLE_TYPES, choices=TABLE_TYPES)
+    parser.add_argument('--columns', type=int, default=ATTRIBUTE_COLUMNS, help='Attribute columns per table')
+    parser.add_argument('--type2-share', type=float, default=TYPE2_SHARE, help='Share of changed dim_type_2 rows with a Type 2 change')
+    parser.add_argument('--hash-storage', default=HASH_STORAGE.lower(), choices=[storage_type.lower() for storage_type in HASH_STORAGE_ALGORITHMS], help='Row hash storage type')
+    parser.add_argument('--execution-mode', default='staged', choices=['staged', 'fused'])
+    parser.add_argument('--chunk-count', type=int, default=None)
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON results file')
+    args = parser.parse_args()
+
+    updater_options = {'execution_mode': args.execution_mode}
+    if args.chunk_count:
+        updater_options['chunk_count'] = args.chunk_count
+
+    results = []
+    for table_type in args.table_types:
+        for row_count in args.sizes:
+            for change_rate in args.change_rates:
+                result = run_case(table_type, row_count, change_rate, args.columns, args.type2_share, updater_options, args.hash_storage.upper())
+                results.append(result)
+                print(
+                    f"{table_type:<11} rows={row_count:<9} change_rate={change_rate:<5} "
+                    f"initial={result['initial_load']['seconds']:.3f}s incremental={result['incremental']['seconds']:.3f}s "
+                    f"statements={result['incremental']['statements']} | {result['incremental']['summary']}"
+                )
+
+    import duckdb
+
+    output = {
+        'run': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python_version': platform.python_version(),
+            'duckdb_version': duckdb.__version__,
+            'backend': 'local_duckdb',
+            'arguments': vars(args)
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as output_file:
+        json.dump(output, output_file, indent=2, default=str)
+    print(f'{len(results)} results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+DAG Planner Checks (Offline)
+
+Checks the pure-Python wave planning behind dag_orchestrator.py (src/etl/common/dag_planner.py):
+manifest normalization, waves, cycle and unknown-upstream detection, the critical path and key inference.
+
+Usage:
+    python test/etl/dag_planner_local.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.etl.common.dag_planner import infer_key_dependencies, normalize_manifest, plan_dag
+
+MANIFEST = {
+    'dim_employee': [],
+    'dim_department': None,
+    'Dim_Location': [],
+    'dim_org_unit': ['dim_department', 'Dim_Location'],
+    'fact_employee_pay': {'depends_on': ['dim_employee', 'dim_org_unit'], 'enable_deletes': True},
+    'fact_headcount': {'depends_on': ['dim_employee']}
+}
+
+test_results = []
+
+
+def record_test(test_id: str, test_name: str, passed: bool, details: str = ""):
+    """Record a test result"""
+    status = "PASS" if passed else "FAIL"
+    test_results.append({"test_id": test_id, "test_name": test_name, "passed": passed, "status": status, "details": details})
+    print(f"[{status}] {test_id}: {test_name}" + (f" - {details}" if details else ""))
+
+
+def raises_value_error(manifest: dict) -> str | None:
+    """Error message of plan_dag(manifest), or None if it didn't raise ValueError."""
+    try:
+        plan_dag(manifest)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+def check_normalize_manifest() -> None:
+    normalized = normalize_manifest(MANIFEST)
+    record_test('normalize:names', 'Table names lowercased', 'dim_location' in normalized and 'Dim_Location' not in normalized)
+    record_test('normalize:list', 'Upstream list becomes depends_on, sorted and lowercased', normalized['dim_org_unit'] == {'depends_on': ['dim_department', 'dim_location']}, str(normalized['dim_org_unit']))
+    record_test('normalize:none', 'None means no upstreams', normalized['dim_department'] == {'depends_on': []})
+    record_test('normalize:options', 'Table options kept', normalized['fact_employee_pay'] == {'depends_on': ['dim_employee', 'dim_org_unit'], 'enable_deletes': True}, str(normalized['fact_employee_pay']))
+    record_test('normalize:input', 'Input manifest not modified', MANIFEST['fact_headcount'] == {'depends_on': ['dim_employee']})
+
+
+def check_waves() -> None:
+    plan = plan_dag(MANIFEST)
+    expected_waves = [
+        ['dim_department', 'dim_employee', 'dim_location'],
+        ['dim_org_unit', 'fact_headcount'],
+        ['fact_employee_pay']
+    ]
+    record_test('waves:layout', 'Tables in the earliest possible wave', plan.waves == expected_waves, str(plan.waves))
+    record_test('waves:widths', 'Wave widths', plan.wave_widths == [3, 2, 1], str(plan.wave_widths))
+    wave_of = {table_name: wave_number for wave_number, wave in enumerate(plan.waves) for table_name in wave}
+    record_test('waves:order', 'Every upstream in an earlier wave', all(wave_of[upstream] < wave_of[table_name] for table_name, upstreams in plan.dependencies.items() for upstream in upstreams))
+    record_test('waves:describe', 'describe() summarizes the plan', plan.describe().startswith('6 tables in 3 waves, widths=[3, 2, 1]'), plan.describe().splitlines()[0])
+
+    empty_plan = plan_dag({})
+    record_test('waves:empty', 'Empty manifest plans to nothing', empty_plan.waves == [] and empty_plan.critical_path == [] and empty_plan.critical_path_length == 0)
+
+
+def check_errors() -> None:
+    cycle_error = raises_value_error({'dim_a_table': ['dim_b_table'], 'dim_b_table': ['dim_c_table'], 'dim_c_table': ['dim_a_table'], 'dim_free': []})
+    record_test('errors:cycle', 'Cycle detected', cycle_error is not None and 'cycle' in cycle_error and "'dim_free'" not in cycle_error, str(cycle_error))
+    self_error = raises_value_error({'dim_self': ['dim_self']})
+    record_test('errors:self_cycle', 'Self dependency is a cycle', self_error is not None and 'cycle' in self_error, str(self_error))
+    missing_error = raises_value_error({'fact_employee_pay': ['dim_employee']})
+    record_test('errors:missing', 'Unknown upstream rejected', missing_error is not None and "['dim_employee']" in missing_error, str(missing_error))
+
+
+def check_critical_path() -> None:
+    plan = plan_dag(MANIFEST)
+    # dim_department and dim_location tie as the first step, either is a valid critical path
+    is_chain = all(upstream in plan.dependencies[table_name] for upstream, table_name in zip(plan.critical_path, plan.critical_path[1:]))
+    record_test(
+        'critical:default',
+        'Critical path by task count',
+        is_chain and plan.critical_path[1:] == ['dim_org_unit', 'fact_employee_pay'] and plan.critical_path_length == 3,
+        f'{plan.critical_path} ({plan.critical_path_length})'
+    )
+
+    durations = {'dim_employee': 50, 'dim_department': 5, 'Dim_Location': 10, 'dim_org_unit': 5, 'fact_employee_pay': 20, 'fact_headcount': 40}
+    plan = plan_dag(MANIFEST, durations)
+    record_test('critical:durations', 'Critical path follows the longest durations', plan.critical_path == ['dim_employee', 'fact_headcount'] and plan.critical_path_length == 90, f'{plan.critical_path} ({plan.critical_path_length})')
+    record_test('critical:waves_unchanged', 'Durations do not change the waves', plan.waves == plan_dag(MANIFEST).waves)
+
+
+def check_infer_key_dependencies() -> None:
+    inferred = infer_key_dependencies({
+        'DIM_EMPLOYEE': ['DIM_EMPLOYEE_KEY', 'EMPLOYEE_ID'],
+        'dim_department': ['dim_department_key', 'dim_employee_key'],
+        'fact_employee_pay': ['fact_employee_pay_key', 'dim_employee_key', 'dim_department_key', 'dim_unknown_key', 'pay_amount']
+    })
+    record_test('infer:own_key', 'Own surrogate key ignored', inferred['dim_employee'] == [], str(inferred['dim_employee']))
+    record_test('infer:fact', 'Fact depends on referenced dims only', inferred['fact_employee_pay'] == ['dim_department', 'dim_employee'], str(inferred['fact_employee_pay']))
+    record_test('infer:dim_to_dim', 'Dim -> dim references inferred too', inferred['dim_department'] == ['dim_employee'])
+    record_test('infer:plannable', 'Inferred dependencies plan into waves', plan_dag(inferred).waves == [['dim_employee'], ['dim_department'], ['fact_employee_pay']])
+
+
+if __name__ == '__main__':
+    check_normalize_manifest()
+    check_waves()
+    check_errors()
+    check_critical_path()
+    check_infer_key_dependencies()
+
+    failed = [result for result in test_results if not result['passed']]
+    print(f'\n{len(test_results) - len(failed)}/{len(test_results)} checks passed')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,163 @@
+"""
+Hash Storage Migration Checks (Local)
+
+Migrates a dim_type_2 table and a fact table through STRING -> BINARY -> NUMBER -> STRING row hash storage with
+migrate_hash_storage() on a local DuckDB LocalSession, loading with main() between migrations:
+
+- After each migration the hash columns have the new type and the rebuilt view validates
+- The first load after a migration finds 0 changes (stored hashes match the view's new algorithm)
+- A source change after a migration is still detected with the expected counts
+- execute=False only returns the statements; mismatched HASH input types are rejected before anything runs
+
+Usage:
+    python test/etl/hash_migration_local.py
+"""
+
+import contextlib
+import io
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.etl.common.local_session import LocalSession
+from src.etl.common.table_metadata import hash_storage_type, load_table_metadata
+from src.etl.common.table_updater import main
+from src.etl.common.view_builder import build_view_sql, classify_columns, load_column_types, load_view_definition, migrate_hash_storage, validate_view_hashes
+
+# Target table -> (source table, natural keys, business columns, main() options, Type 2 columns)
+TABLES = {
+    'dim_employee_type_2': ('source_employee', ['employee_id'], ['first_name', 'last_name', 'department'], {'type_1_column_names': 'first_name,last_name'}, 'department'),
+    'fact_employee_pay': ('source_employee_pay', ['employee_id', 'pay_period'], ['pay_amount', 'pay_status'], {}, None)
+}
+COLUMN_DDL_TYPES = {'employee_id': 'BIGINT', 'pay_period': 'BIGINT', 'first_name': 'STRING', 'last_name': 'STRING', 'department': 'STRING', 'pay_amount': 'NUMBER(10, 2)', 'pay_status': 'STRING'}
+DIM_TYPE_2_COLUMNS = 'row_effective_date DATE, row_expiration_date DATE, current_row_flag INT, etl_row_hash_value_2 STRING,'
+STORAGE_TYPES = ['BINARY', 'NUMBER', 'STRING']
+
+# (table name, source change, expected summary) applied after every migration - one Type 1 and one Type 2 change
+SOURCE_CHANGES = [
+    ('dim_employee_type_2', "UPDATE learning_db.src.source_employee SET first_name = first_name || '_{storage_type}' WHERE employee_id % 10 = {step}", '0 inserts, 5 updates, 0 type2 changes'),
+    ('dim_employee_type_2', "UPDATE learning_db.src.source_employee SET department = department || '_{storage_type}' WHERE employee_id % 10 = {step} + 5", '0 inserts, 0 updates, 5 type2 changes'),
+    ('fact_employee_pay', "UPDATE learning_db.src.source_employee_pay SET pay_amount = pay_amount + 0.5 WHERE employee_id % 10 = {step} AND pay_period = 1", '0 inserts, 5 updates, 0 type2 changes')
+]
+
+test_results = []
+
+
+def record_test(test_id: str, test_name: str, passed: bool, details: str = ""):
+    """Record a test result"""
+    status = "PASS" if passed else "FAIL"
+    test_results.append({"test_id": test_id, "test_name": test_name, "passed": passed, "status": status, "details": details})
+    print(f"[{status}] {test_id}: {test_name}" + (f" - {details}" if details else ""))
+
+
+def create_objects(session: LocalSession) -> None:
+    """Source and target tables (STRING hashes) with their ETL views built by build_view_sql()."""
+    session.sql("CREATE TABLE learning_db.src.source_employee (employee_id BIGINT, first_name STRING, last_name STRING, department STRING)").collect()
+    session.sql("INSERT INTO learning_db.src.source_employee SELECT i, 'first_' || i, CASE WHEN i % 4 = 0 THEN NULL ELSE 'last_' || i END, 'dept_' || (i % 3) FROM range(50) r(i)").collect()
+    session.sql("CREATE TABLE learning_db.src.source_employee_pay (employee_id BIGINT, pay_period BIGINT, pay_amount NUMBER(10, 2), pay_status STRING)").collect()
+    session.sql("INSERT INTO learning_db.src.source_employee_pay SELECT i, p, i * 10.25 + p, CASE WHEN i % 6 = 0 THEN NULL ELSE 'paid' END FROM range(50) r(i), range(1, 3) q(p)").collect()
+    for table_name, (source_table_name, natural_keys, business_columns, _, type_2_column_names) in TABLES.items():
+        session.sql(f"""
+        CREATE TABLE learning_db.dw.{table_name} (
+            {table_name}_key BIGINT AUTOINCREMENT,
+            {', '.join([f'{column_name} {COLUMN_DDL_TYPES[column_name]}' for column_name in natural_keys + business_columns])},
+            etl_row_hash_value STRING,
+            {DIM_TYPE_2_COLUMNS if type_2_column_names else ''}
+            create_username STRING,
+            create_datetime TIMESTAMP_NTZ,
+            create_batch_name STRING,
+            last_update_username STRING,
+            last_update_datetime TIMESTAMP_NTZ,
+            last_update_batch_name STRING
+        )""").collect()
+        session.sql(f"ALTER TABLE learning_db.dw.{table_name} ADD CONSTRAINT pk_{table_name} PRIMARY KEY ({', '.join(natural_keys)})").collect()
+        classification = classify_columns(load_table_metadata(session, table_name), type_2_column_names)
+        session.sql(build_view_sql(classification, f'learning_db.src.{source_table_name}', load_column_types(session, source_table_name))).collect()
+
+
+def run_main(session: LocalSession, table_name: str, batch_id: str) -> str:
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = main(session, table_name, batch_id, **TABLES[table_name][3])
+    return summary.split(' — ', 1)[1]
+
+
+def migrate(session: LocalSession, table_name: str, storage_type: str, execute: bool = True, column_types: dict[str, str] | None = None) -> list[str]:
+    source_table_name, _, _, _, type_2_column_names = TABLES[table_name]
+    table_metadata = load_table_metadata(session, table_name)
+    classification = classify_columns(table_metadata, type_2_column_names)
+    if column_types is None:
+        column_types = load_column_types(session, source_table_name)
+    return migrate_hash_storage(session, table_metadata, classification, storage_type, f'learning_db.src.{source_table_name}', column_types, execute)
+
+
+def check_migration(session: LocalSession, table_name: str, storage_type: str) -> None:
+    """Hash column types and view after a migration."""
+    prefix = f'{storage_type.lower()}:{table_name}'
+    table_metadata = load_table_metadata(session, table_name)
+    hash_column_names = [column_name for column_name in ('etl_row_hash_value', 'etl_row_hash_value_2') if column_name in table_metadata.table_columns]
+    storage_types = {column_name: hash_storage_type(table_metadata.table_column_types[column_name]) for column_name in hash_column_names}
+    record_test(f'{prefix}:storage', f'Hash columns stored as {storage_type}', set(storage_types.values()) == {storage_type}, str(storage_types))
+    view_storage_types = {column_name: hash_storage_type(table_metadata.view_column_types[column_name]) for column_name in hash_column_names}
+    record_test(f'{prefix}:view_storage', f'View hashes typed {storage_type}', set(view_storage_types.values()) == {storage_type}, str(view_storage_types))
+    classification = classify_columns(table_metadata, TABLES[table_name][4])
+    result = validate_view_hashes(load_view_definition(session, table_metadata), classification)
+    record_test(f'{prefix}:view', 'Rebuilt view validates', result.is_valid, str(result.errors))
+
+
+def check_plan_only(session: LocalSession) -> None:
+    statements = migrate(session, 'fact_employee_pay', 'BINARY', execute=False)
+    table_metadata = load_table_metadata(session, 'fact_employee_pay')
+    record_test('plan_only:statements', 'execute=False returns ADD/UPDATE/DROP/RENAME and the view', [statement.split()[0] + ' ' + statement.split()[1] for statement in statements] == ['ALTER TABLE', 'UPDATE learning_db.dw.fact_employee_pay', 'ALTER TABLE', 'ALTER TABLE', 'CREATE OR'], str([statement[:40] for statement in statements]))
+    record_test('plan_only:unchanged', 'execute=False changes nothing', hash_storage_type(table_metadata.table_column_types['etl_row_hash_value']) == 'STRING' and 'etl_row_hash_value_migrated' not in table_metadata.table_columns)
+
+
+def check_hash_type_guard(session: LocalSession) -> None:
+    column_types = {**load_column_types(session, 'source_employee_pay'), 'pay_amount': 'DOUBLE'}
+    try:
+        migrate(session, 'fact_employee_pay', 'NUMBER', column_types=column_types)
+        error = None
+    except AssertionError as e:
+        error = str(e)
+    record_test('type_guard:rejected', 'NUMBER migration rejects hash inputs typed differently from the table', error is not None and 'pay_amount' in error and 'pay_status' not in error, str(error))
+    table_metadata = load_table_metadata(session, 'fact_employee_pay')
+    record_test('type_guard:unchanged', 'Nothing migrated', hash_storage_type(table_metadata.table_column_types['etl_row_hash_value']) == 'STRING')
+
+
+if __name__ == '__main__':
+    session = LocalSession(current_datetime=datetime(2024, 1, 1, 12))
+    create_objects(session)
+    for table_name in TABLES:
+        summary = run_main(session, table_name, 'batch_initial')
+        record_test(f'string:{table_name}:initial_load', 'Initial load', summary.startswith(f"{50 if table_name.startswith('dim') else 100} inserts"), summary)
+
+    check_plan_only(session)
+    check_hash_type_guard(session)
+
+    for step, storage_type in enumerate(STORAGE_TYPES, start=1):
+        session.current_datetime = datetime(2024, 1, 1, 12) + timedelta(days=step)
+        for table_name in TABLES:
+            migrate(session, table_name, storage_type)
+            check_migration(session, table_name, storage_type)
+            summary = run_main(session, table_name, f'batch_{step}_migrated')
+            record_test(f'{storage_type.lower()}:{table_name}:no_changes', 'First load after the migration finds no changes', summary.startswith('0 inserts, 0 updates, 0 type2 changes'), summary)
+
+        for change_number, (table_name, change_sql, expected_summary) in enumerate(SOURCE_CHANGES):
+            session.sql(change_sql.format(storage_type=storage_type.lower(), step=step)).collect()
+            summary = run_main(session, table_name, f'batch_{step}_change_{change_number}')
+            record_test(f'{storage_type.lower()}:{table_name}:change_{change_number}', 'Source change detected', summary.startswith(expected_summary), f'{summary} (expected {expected_summary})')
+
+    mismatched_metadata = load_table_metadata(session, 'dim_employee_type_2')
+    session.sql(build_view_sql(classify_columns(mismatched_metadata, 'department'), 'learning_db.src.source_employee', algorithm='hash')).collect()
+    try:
+        run_main(session, 'dim_employee_type_2', 'batch_mismatched')
+        error = None
+    except AssertionError as e:
+        error = str(e)
+    record_test('mismatch:rejected', 'TableUpdater rejects a NUMBER view over STRING hash columns', error is not None, str(error))
+    session.close()
+
+    failed = [result for result in test_results if not result['passed']]
+    print(f'\n{len(test_results) - len(failed)}/{len(test_results)} checks passed')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,158 @@
+"""
+SQL Plan Checks (Offline)
+
+Plans dim_type_1, dim_type_2 and fact runs with plan_table_update() from TableMetadata fixtures - no session, no
+database - and checks the recorded statements:
+
+- Phase order per table type and execution mode (staged, fused) and staging strategy
+- Key statements: staging CTAS joined on the natural keys and filtered on the row hashes, MERGE targets and keys,
+  Type 2 expirations and Type 1 history updates, staging cleanup
+- to_sql_script() and to_json() render the plan
+
+Usage:
+    python test/etl/plan_table_update_local.py
+"""
+
+import contextlib
+import io
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.etl.common.table_metadata import TableMetadata
+from src.etl.common.table_updater import plan_table_update
+
+AUDIT_COLUMNS = ['create_username', 'create_datetime', 'create_batch_name', 'last_update_username', 'last_update_datetime', 'last_update_batch_name']
+DIM_TYPE_2_COLUMNS = ['etl_row_hash_value', 'etl_row_hash_value_2', 'row_effective_date', 'row_expiration_date', 'current_row_flag']
+
+test_results = []
+
+
+def record_test(test_id: str, test_name: str, passed: bool, details: str = ""):
+    """Record a test result"""
+    status = "PASS" if passed else "FAIL"
+    test_results.append({"test_id": test_id, "test_name": test_name, "passed": passed, "status": status, "details": details})
+    print(f"[{status}] {test_id}: {test_name}" + (f" - {details}" if details else ""))
+
+
+def table_metadata(table_name: str, natural_keys: list[str], business_columns: list[str], etl_columns: list[str]) -> TableMetadata:
+    """Fixture for an existing target table and its ETL view (STRING hashes)."""
+    table_columns = [f'{table_name}_key'] + natural_keys + business_columns + etl_columns + AUDIT_COLUMNS
+    view_columns = natural_keys + business_columns + [column_name for column_name in etl_columns if column_name.startswith('etl_row_hash_value')]
+    return TableMetadata(
+        database_name='learning_db',
+        schema_name='dw',
+        etl_schema_name='etl',
+        table_name=table_name,
+        current_username='etl_user',
+        current_datetime_cst=datetime(2024, 1, 1, 12),
+        table_exists=True,
+        view_exists=True,
+        table_columns=table_columns,
+        view_columns=view_columns,
+        natural_keys=natural_keys,
+        table_column_types={column_name: 'TEXT' for column_name in table_columns},
+        view_column_types={column_name: 'TEXT' for column_name in view_columns}
+    )
+
+
+DIM_TYPE_1 = table_metadata('dim_employee', ['employee_id'], ['first_name', 'department'], ['etl_row_hash_value'])
+DIM_TYPE_2 = table_metadata('dim_employee_type_2', ['employee_id'], ['first_name', 'department'], DIM_TYPE_2_COLUMNS)
+FACT = table_metadata('fact_employee_pay', ['employee_id', 'pay_period'], ['pay_amount'], ['etl_row_hash_value'])
+
+
+def plan(table_metadata: TableMetadata, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return plan_table_update(table_metadata, 'batch_plan', **kwargs)
+
+
+def statement(backend, phase: str) -> str:
+    """Whitespace-normalized SQL of the first statement of a phase ('' if the phase didn't run)."""
+    return next((' '.join(planned.sql_string.split()) for planned in backend.statements if planned.phase == phase), '')
+
+
+def check_dim_type_1() -> None:
+    backend = plan(DIM_TYPE_1)
+    phases = [planned.phase for planned in backend.statements]
+    record_test('dim_type_1:phases', 'Staged phases in order', phases == ['identify_upserts', 'change_audit', 'table_updates', 'table_inserts', 'cleanup'], str(phases))
+    record_test('dim_type_1:sequence', 'Statements numbered in execution order', [planned.sequence for planned in backend.statements] == list(range(1, len(phases) + 1)))
+    record_test('dim_type_1:table_type', 'Table type inferred from the fixture', backend.metadata['table_type'] == 'dim_type_1', str(backend.metadata['table_type']))
+
+    staging_sql = statement(backend, 'identify_upserts')
+    record_test('dim_type_1:staging', 'Temporary per-batch staging table by default', staging_sql.startswith('CREATE OR REPLACE TEMPORARY TABLE learning_db.etl.dim_employee_updates_batch_plan AS'), staging_sql[:80])
+    record_test('dim_type_1:staging_join', 'View left joined to the table on the natural key', 'FROM learning_db.etl.vw_dim_employee source LEFT JOIN learning_db.dw.dim_employee target ON source.employee_id = target.employee_id' in staging_sql)
+    record_test('dim_type_1:staging_filter', 'Only new or changed rows staged', 'target.dim_employee_key IS NULL OR source.etl_row_hash_value <> target.etl_row_hash_value' in staging_sql and 'etl_row_hash_value_2' not in staging_sql)
+    record_test('dim_type_1:change_audit', 'Change audit reads the staging table', statement(backend, 'change_audit').endswith('FROM learning_db.etl.dim_employee_updates_batch_plan'))
+
+    updates_sql = statement(backend, 'table_updates')
+    record_test('dim_type_1:updates', 'Update MERGE on the surrogate key', updates_sql.startswith('MERGE INTO learning_db.dw.dim_employee as target USING learning_db.etl.dim_employee_updates_batch_plan as source ON source.dim_employee_key = target.dim_employee_key') and "insert_update_indicator = 'update'" in updates_sql)
+    record_test('dim_type_1:update_columns', 'Business columns and hash updated, natural key and create audit untouched', 'target.first_name = source.first_name' in updates_sql and 'target.etl_row_hash_value = source.etl_row_hash_value' in updates_sql and 'target.employee_id' not in updates_sql and 'target.create_' not in updates_sql)
+    inserts_sql = statement(backend, 'table_inserts')
+    record_test('dim_type_1:inserts', 'Insert MERGE on the natural key', 'ON source.employee_id = target.employee_id WHEN NOT MATCHED' in inserts_sql and 'dim_employee_key' not in inserts_sql.split('THEN INSERT', 1)[1])
+    record_test('dim_type_1:cleanup', 'Staging table dropped', statement(backend, 'cleanup') == 'DROP TABLE IF EXISTS learning_db.etl.dim_employee_updates_batch_plan')
+
+    backend = plan(DIM_TYPE_1, staging_strategy='permanent')
+    phases = [planned.phase for planned in backend.statements]
+    record_test('dim_type_1:permanent', 'Permanent staging keeps the fixed name and skips cleanup', statement(backend, 'identify_upserts').startswith('CREATE OR REPLACE TABLE learning_db.etl.dim_employee_updates AS') and 'cleanup' not in phases, str(phases))
+
+
+def check_dim_type_2() -> None:
+    backend = plan(DIM_TYPE_2, type_1_column_names='first_name')
+    phases = [planned.phase for planned in backend.statements]
+    expected_phases = ['identify_upserts', 'change_audit', 'type2_expirations', 'table_updates', 'table_inserts', 'type1_historical_updates', 'cleanup']
+    record_test('dim_type_2:phases', 'Staged SCD2 phases in order', phases == expected_phases, str(phases))
+    record_test('dim_type_2:table_type', 'Table type inferred from etl_row_hash_value_2', backend.metadata['table_type'] == 'dim_type_2')
+
+    staging_sql = statement(backend, 'identify_upserts')
+    record_test('dim_type_2:staging_join', 'Joined to the current row only', 'ON source.employee_id = target.employee_id AND target.current_row_flag = 1' in staging_sql)
+    record_test('dim_type_2:staging_indicator', 'Type 2 hash change staged as type2_change', "WHEN source.etl_row_hash_value_2 <> target.etl_row_hash_value_2 THEN 'type2_change'" in staging_sql)
+    expirations_sql = statement(backend, 'type2_expirations')
+    record_test('dim_type_2:expirations', 'Changed current rows expired the day before', "insert_update_indicator = 'type2_change'" in expirations_sql and "target.row_expiration_date = CAST('2024-01-01' AS DATE) - 1" in expirations_sql and 'target.current_row_flag = 0' in expirations_sql)
+    inserts_sql = statement(backend, 'table_inserts')
+    record_test('dim_type_2:inserts', 'New rows and new versions inserted', "insert_update_indicator IN ('insert', 'type2_change')" in inserts_sql and 'AND target.current_row_flag = 1' in inserts_sql)
+    history_sql = statement(backend, 'type1_historical_updates')
+    record_test('dim_type_2:type1_history', 'Type 1 columns copied to history rows only', 'target.first_name = source.first_name' in history_sql and 'target.department' not in history_sql and 'AND target.current_row_flag = 0' in history_sql)
+
+    backend = plan(DIM_TYPE_2, type_1_column_names='first_name', execution_mode='fused')
+    phases = [planned.phase for planned in backend.statements]
+    record_test('dim_type_2:fused', 'Fused SCD2 replaces the expire/update/insert MERGEs with one', phases == ['identify_upserts', 'change_audit', 'scd2_upserts', 'type1_historical_updates', 'cleanup'], str(phases))
+
+
+def check_fact() -> None:
+    backend = plan(FACT)
+    phases = [planned.phase for planned in backend.statements]
+    record_test('fact:phases', 'Staged fact phases in order', phases == ['identify_upserts', 'change_audit', 'table_updates', 'table_inserts', 'cleanup'], str(phases))
+    record_test('fact:staging_join', 'Joined on the composite natural key', 'ON source.employee_id = target.employee_id AND source.pay_period = target.pay_period' in statement(backend, 'identify_upserts'))
+    record_test('fact:inserts', 'Insert MERGE on the composite natural key', 'ON source.employee_id = target.employee_id AND source.pay_period = target.pay_period' in statement(backend, 'table_inserts'))
+
+    backend = plan(FACT, execution_mode='fused')
+    phases = [planned.phase for planned in backend.statements]
+    fused_sql = statement(backend, 'fused_upserts')
+    record_test('fact:fused_phases', 'Fused mode is a single MERGE without staging', phases == ['fused_upserts'], str(phases))
+    record_test('fact:fused_merge', 'MERGE straight from the view with the hash comparison on WHEN MATCHED', fused_sql.startswith('MERGE INTO learning_db.dw.fact_employee_pay as target USING learning_db.etl.vw_fact_employee_pay as source') and 'WHEN MATCHED AND (source.etl_row_hash_value <> target.etl_row_hash_value )' in fused_sql and 'WHEN NOT MATCHED THEN INSERT' in fused_sql)
+
+    backend = plan(FACT, enable_deletes=True)
+    phases = [planned.phase for planned in backend.statements]
+    record_test('fact:deletes', 'Hard deletes planned after the upserts', 'table_deletes' in phases and phases.index('table_deletes') > phases.index('table_inserts'), str(phases))
+
+
+def check_rendering() -> None:
+    backend = plan(DIM_TYPE_1)
+    record_test('render:sql_script', 'One commented block per statement', backend.to_sql_script().count('\n\n-- [') == len(backend.statements) - 1 and backend.to_sql_script().startswith('-- [1] identify_upserts\n'))
+    plan_json = json.loads(backend.to_json())
+    record_test('render:json', 'JSON carries statements and metadata', len(plan_json['statements']) == len(backend.statements) and plan_json['metadata']['natural_keys'] == ['employee_id'], str(plan_json['metadata'].get('natural_keys')))
+    record_test('render:batch_id', 'Batch ID rendered into the audit columns', "'batch_plan' as create_batch_name" in statement(backend, 'identify_upserts'))
+
+
+if __name__ == '__main__':
+    check_dim_type_1()
+    check_dim_type_2()
+    check_fact()
+    check_rendering()
+
+    failed = [result for result in test_results if not result['passed']]
+    print(f'\n{len(test_results) - len(failed)}/{len(test_results)} checks passed')
+    sys.exit(1 if failed else 0)
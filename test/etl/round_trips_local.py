@@ -0,0 +1,178 @@
+"""
+TableUpdater Round Trip Checks (Local)
+
+Runs a dim_type_1 table through main() on a local DuckDB LocalSession wrapped in a session that counts every
+SQL statement and procedure call, and checks the round trip budget of a run:
+
+- Logging: one etl.logging_batch call per log flush, never one etl.logging call per message
+- Metadata: one combined INFORMATION_SCHEMA query (plus SHOW PRIMARY KEYS)
+- Change audit: one aggregate over the staging table, reused for the returned summary
+
+Usage:
+    python test/etl/round_trips_local.py
+"""
+
+import contextlib
+import io
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import src.etl.common.table_updater as table_updater_module
+from src.etl.common.local_session import LocalSession
+from src.etl.common.log_sink import BufferedLogSink
+from src.etl.common.table_updater import main
+
+TABLE_NAME = 'dim_round_trip'
+
+# Round trips of one staged dim_type_1 run through main() with default options: metadata query,
+# SHOW PRIMARY KEYS, staging CTAS, change audit, update MERGE, insert MERGE, DROP of the temporary staging table
+# (no etl_run_metrics INSERT)
+EXPECTED_STATEMENTS = 7
+# Log flushes at the end of staging, updates, inserts and the run, plus one in main() after the summary
+EXPECTED_LOG_CALLS = 5
+
+# (step name, source change applied before the run)
+STEPS = [
+    ('initial_load', "INSERT INTO learning_db.src.source_round_trip SELECT i, 'name_' || i FROM range(100) r(i)"),
+    ('updates_and_inserts', """
+        INSERT INTO learning_db.src.source_round_trip SELECT i, 'name_' || i FROM range(100, 110) r(i);
+        UPDATE learning_db.src.source_round_trip SET employee_name = employee_name || '_v2' WHERE employee_id < 5
+    """),
+    ('idempotency', None)
+]
+
+test_results = []
+
+
+def record_test(test_id: str, test_name: str, passed: bool, details: str = ""):
+    """Record a test result"""
+    status = "PASS" if passed else "FAIL"
+    test_results.append({"test_id": test_id, "test_name": test_name, "passed": passed, "status": status, "details": details})
+    print(f"[{status}] {test_id}: {test_name}" + (f" - {details}" if details else ""))
+
+
+class CountingSession:
+    def __init__(self, session: LocalSession):
+        """Session wrapper that records every statement and procedure call before passing it on.
+
+        Args:
+            session: LocalSession doing the actual work
+        """
+        self.session = session
+        self.statements: list[str] = []
+        self.calls: list[str] = []
+
+    def sql(self, sql_string: str, *args, **kwargs):
+        self.statements.append(' '.join(sql_string.split()))
+        return self.session.sql(sql_string, *args, **kwargs)
+
+    def call(self, proc_name: str, *args):
+        self.calls.append(proc_name)
+        return self.session.call(proc_name, *args)
+
+    def reset(self) -> None:
+        self.statements = []
+        self.calls = []
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+
+class CountingLogSink(BufferedLogSink):
+    """BufferedLogSink that counts the flushes that wrote something."""
+    flush_count = 0
+
+    def flush(self) -> None:
+        if self._buffer:
+            CountingLogSink.flush_count += 1
+        super().flush()
+
+
+def create_objects(session: LocalSession) -> None:
+    """Source table, Type 1 dimension and ETL view."""
+    session.sql("""
+    CREATE TABLE learning_db.src.source_round_trip (
+        employee_id BIGINT,
+        employee_name STRING
+    )""").collect()
+    session.sql(f"""
+    CREATE TABLE learning_db.dw.{TABLE_NAME} (
+        {TABLE_NAME}_key BIGINT AUTOINCREMENT,
+        employee_id BIGINT,
+        employee_name STRING,
+        etl_row_hash_value STRING,
+        create_username STRING,
+        create_datetime TIMESTAMP_NTZ,
+        create_batch_name STRING,
+        last_update_username STRING,
+        last_update_datetime TIMESTAMP_NTZ,
+        last_update_batch_name STRING
+    )""").collect()
+    session.sql(f"ALTER TABLE learning_db.dw.{TABLE_NAME} ADD CONSTRAINT pk_{TABLE_NAME} PRIMARY KEY (employee_id)").collect()
+    session.sql(f"""
+    CREATE OR REPLACE VIEW learning_db.etl.vw_{TABLE_NAME} AS
+    SELECT
+        employee_id,
+        employee_name,
+        SHA1(COALESCE(CAST(employee_name as STRING), '|')) AS etl_row_hash_value
+    FROM learning_db.src.source_round_trip
+    """).collect()
+
+
+def check_round_trips(session: CountingSession, step_name: str, log_record_count: int) -> None:
+    """Round trip budget of one run."""
+    statements = session.statements
+    record_test(f'{step_name}:statements', f'{EXPECTED_STATEMENTS} SQL statements per run', len(statements) == EXPECTED_STATEMENTS, f'{len(statements)}: {[statement[:40] for statement in statements]}')
+
+    record_test(f'{step_name}:log_proc', 'Only batched logging calls', set(session.calls) == {'etl.logging_batch'}, str(sorted(set(session.calls))))
+    record_test(f'{step_name}:log_flushes', 'One logging call per flush', len(session.calls) == CountingLogSink.flush_count == EXPECTED_LOG_CALLS, f'{len(session.calls)} calls, {CountingLogSink.flush_count} flushes')
+    record_test(f'{step_name}:log_batching', 'Fewer logging calls than messages', len(session.calls) < log_record_count, f'{len(session.calls)} calls for {log_record_count} messages')
+
+    metadata_statements = [statement for statement in statements if 'INFORMATION_SCHEMA' in statement.upper()]
+    record_test(f'{step_name}:metadata', 'One combined INFORMATION_SCHEMA query', len(metadata_statements) == 1, str(len(metadata_statements)))
+    record_test(f'{step_name}:primary_keys', 'One SHOW PRIMARY KEYS', sum(statement.upper().startswith('SHOW PRIMARY KEYS') for statement in statements) == 1)
+
+    staging_reads = [statement for statement in statements if statement.upper().startswith('SELECT') and re.search(rf'\bFROM\s+\S*\b{TABLE_NAME}_updates\w*', statement, re.IGNORECASE)]
+    record_test(f'{step_name}:change_audit', 'One aggregate scan of the staging table', len(staging_reads) == 1, str(len(staging_reads)))
+
+
+def check_summary(session: LocalSession, step_name: str, summary: str) -> None:
+    """The summary comes from the change audit, so it must match what actually landed in the table."""
+    expected = {
+        'initial_load': '100 inserts, 0 updates, 0 type2 changes',
+        'updates_and_inserts': '10 inserts, 5 updates, 0 type2 changes',
+        'idempotency': '0 inserts, 0 updates, 0 type2 changes'
+    }[step_name]
+    record_test(f'{step_name}:summary', 'Summary counts from the change audit', summary.endswith(expected), summary)
+    row_count = session.sql(f'SELECT COUNT(*) FROM learning_db.dw.{TABLE_NAME}').collect()[0][0]
+    record_test(f'{step_name}:rows', 'Table row count', row_count == {'initial_load': 100}.get(step_name, 110), str(row_count))
+
+
+if __name__ == '__main__':
+    local_session = LocalSession(current_datetime=datetime(2024, 1, 1, 12))
+    create_objects(local_session)
+    session = CountingSession(local_session)
+    # main() builds its own BufferedLogSink
+    table_updater_module.BufferedLogSink = CountingLogSink
+
+    for step_number, (step_name, change_sql) in enumerate(STEPS):
+        for statement in (change_sql or '').split(';'):
+            if statement.strip():
+                local_session.sql(statement).collect()
+        local_session.current_datetime = datetime(2024, 1, 1, 12) + timedelta(days=step_number)
+        session.reset()
+        CountingLogSink.flush_count = 0
+        log_record_count = len(local_session.log_records)
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = main(session, TABLE_NAME, f'batch_{step_number}')
+        check_round_trips(session, step_name, len(local_session.log_records) - log_record_count)
+        check_summary(local_session, step_name, summary)
+    local_session.close()
+
+    failed = [result for result in test_results if not result['passed']]
+    print(f'\n{len(test_results) - len(failed)}/{len(test_results)} checks passed')
+    sys.exit(1 if failed else 0)
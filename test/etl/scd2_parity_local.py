@@ -0,0 +1,229 @@
+"""
+Type 2 Dimension Parity Checks (Local)
+
+Ports the Type 2 scenarios of test_etl_pattern.ipynb (tests 4.x and 5.x) to a local DuckDB LocalSession
+and runs them once per TableUpdater configuration. Every configuration must pass the notebook's checks,
+and after every step its dimension table must be identical to the staged run (surrogate keys excluded,
+since they depend on insert order).
+
+Usage:
+    python test/etl/scd2_parity_local.py
+"""
+
+import contextlib
+import io
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.etl.common.local_session import LocalSession
+from src.etl.common.table_updater import main
+
+TABLE_NAME = 'dim_employee_profile_type_2'
+TYPE_1_COLUMN_NAMES = 'first_name,last_name'
+
+# Configurations compared against the first one
+CONFIGURATIONS = {
+    'staged': {'execution_mode': 'staged'},
+    'fused': {'execution_mode': 'fused'},
+    'fused_chunked': {'execution_mode': 'fused', 'chunk_count': 3},
+    'staged_chunked': {'execution_mode': 'staged', 'chunk_count': 3},
+    'staged_full_history': {'execution_mode': 'staged', 'type_1_history_full_scan': True},
+    'staged_chunked_full_history': {'execution_mode': 'staged', 'chunk_count': 3, 'type_1_history_full_scan': True},
+    'staged_compare_columns': {'execution_mode': 'staged', 'type_1_compare_columns_only': True},
+    'fused_compare_columns': {'execution_mode': 'fused', 'type_1_compare_columns_only': True}
+}
+
+# (step name, source change applied before the run)
+STEPS = [
+    ('initial_load', """
+        INSERT INTO learning_db.src.source_employee_profile (employee_id, first_name, last_name, department)
+        VALUES (1, 'Jack', 'Smith', 'Finance'), (2, 'Jill', 'Smith', 'Merchandising')
+    """),
+    ('4.1_type_1_change', "UPDATE learning_db.src.source_employee_profile SET first_name = 'Jackson' WHERE employee_id = 1"),
+    ('4.2_idempotency', None),
+    ('4.3_type_2_change', "UPDATE learning_db.src.source_employee_profile SET department = 'Accounting' WHERE department = 'Finance'"),
+    ('4.4_type_1_history', "UPDATE learning_db.src.source_employee_profile SET first_name = 'John' WHERE first_name = 'Jackson'"),
+    ('4.5_simultaneous', "UPDATE learning_db.src.source_employee_profile SET last_name = 'Johnson', department = 'Marketing' WHERE employee_id = 1"),
+    ('4.6_history_chain', "UPDATE learning_db.src.source_employee_profile SET department = 'Executive' WHERE employee_id = 1"),
+    ('5.1_nulls', """
+        INSERT INTO learning_db.src.source_employee_profile (employee_id, first_name, last_name, department)
+        VALUES (99, NULL, 'NullFirst', 'TestDept'), (98, '', 'EmptyFirst', 'TestDept'), (97, 'Normal', NULL, 'TestDept')
+    """),
+    ('bulk_load', """
+        INSERT INTO learning_db.src.source_employee_profile (employee_id, first_name, last_name, department)
+        SELECT i, 'first_' || (i % 37), 'last_' || (i % 41), 'dept_' || (i % 7) FROM range(1000, 3000) r(i)
+    """),
+    ('bulk_mixed_changes', """
+        UPDATE learning_db.src.source_employee_profile
+        SET department = CASE WHEN employee_id % 3 = 0 THEN department || '_moved' ELSE department END,
+            last_name = CASE WHEN employee_id % 5 = 0 THEN last_name || '_renamed' ELSE last_name END
+        WHERE employee_id >= 1000
+    """),
+    ('bulk_type_1_on_history', "UPDATE learning_db.src.source_employee_profile SET first_name = first_name || '_v2' WHERE employee_id % 6 = 0"),
+    ('soft_delete', "DELETE FROM learning_db.src.source_employee_profile WHERE employee_id IN (1, 2)"),
+    ('reactivate_type_1_change', """
+        INSERT INTO learning_db.src.source_employee_profile (employee_id, first_name, last_name, department)
+        VALUES (1, 'Jack', 'Johnson', 'Executive'), (2, 'Jillian', 'Smith', 'Merchandising')
+    """),
+    ('5.2_idempotency', None)
+]
+
+test_results = []
+
+
+def record_test(test_id: str, test_name: str, passed: bool, details: str = ""):
+    """Record a test result"""
+    status = "PASS" if passed else "FAIL"
+    test_results.append({"test_id": test_id, "test_name": test_name, "passed": passed, "status": status, "details": details})
+    print(f"[{status}] {test_id}: {test_name}" + (f" - {details}" if details else ""))
+
+
+def create_objects(session: LocalSession) -> None:
+    """Source table, Type 2 dimension and ETL view as in test_etl_pattern.ipynb."""
+    session.sql("""
+    CREATE TABLE learning_db.src.source_employee_profile (
+        employee_id BIGINT,
+        first_name STRING,
+        last_name STRING,
+        department STRING
+    )""").collect()
+    session.sql(f"""
+    CREATE TABLE learning_db.dw.{TABLE_NAME} (
+        {TABLE_NAME}_key BIGINT AUTOINCREMENT,
+        employee_id BIGINT,
+        first_name STRING,
+        last_name STRING,
+        department STRING,
+        etl_row_hash_value STRING,
+        etl_row_hash_value_2 STRING,
+        row_effective_date DATE,
+        row_expiration_date DATE,
+        current_row_flag INT,
+        is_deleted INT,
+        deleted_batch_name STRING,
+        create_username STRING,
+        create_datetime TIMESTAMP_NTZ,
+        create_batch_name STRING,
+        last_update_username STRING,
+        last_update_datetime TIMESTAMP_NTZ,
+        last_update_batch_name STRING
+    )""").collect()
+    session.sql(f"ALTER TABLE learning_db.dw.{TABLE_NAME} ADD CONSTRAINT pk_dim_employee PRIMARY KEY (employee_id)").collect()
+    session.sql(f"""
+    CREATE OR REPLACE VIEW learning_db.etl.vw_{TABLE_NAME} AS
+    SELECT
+        employee_id,
+        first_name,
+        last_name,
+        department,
+        SHA1(CONCAT_WS('|',
+            COALESCE(CAST(first_name as STRING), '|'),
+            COALESCE(CAST(last_name as STRING), '|')
+        )) AS etl_row_hash_value, --Type 1 changes
+        SHA1(CONCAT_WS('|',
+            COALESCE(CAST(department as STRING), '|')
+        )) AS etl_row_hash_value_2 --Type 2 changes
+    FROM learning_db.src.source_employee_profile
+    """).collect()
+
+
+def count(session: LocalSession, where_clause: str = '1 = 1') -> int:
+    return session.sql(f'SELECT COUNT(*) FROM learning_db.dw.{TABLE_NAME} WHERE {where_clause}').collect()[0][0]
+
+
+def snapshot(session: LocalSession) -> list:
+    """Dimension rows without the surrogate key, in a stable order."""
+    return [tuple(row)[1:] for row in session.sql(f'SELECT * FROM learning_db.dw.{TABLE_NAME} ORDER BY employee_id, row_effective_date, current_row_flag').collect()]
+
+
+def check_invariants(session: LocalSession, configuration_name: str, step_name: str) -> None:
+    """Checks from the notebook that hold after every step."""
+    prefix = f'{configuration_name}:{step_name}'
+    overlaps = session.sql(f"""
+        SELECT a.employee_id
+        FROM learning_db.dw.{TABLE_NAME} a
+        JOIN learning_db.dw.{TABLE_NAME} b
+            ON a.employee_id = b.employee_id
+            AND a.{TABLE_NAME}_key < b.{TABLE_NAME}_key
+            AND a.row_effective_date <= b.row_expiration_date
+            AND b.row_effective_date <= a.row_expiration_date
+            AND a.row_effective_date < a.row_expiration_date
+            AND b.row_effective_date < b.row_expiration_date
+    """).collect()
+    record_test(f'{prefix}:ranges', "Date ranges don't overlap", len(overlaps) == 0, str(overlaps[:5]) if overlaps else '')
+    duplicate_current = session.sql(f"""
+        SELECT employee_id FROM learning_db.dw.{TABLE_NAME} WHERE current_row_flag = 1 GROUP BY employee_id HAVING COUNT(*) > 1
+    """).collect()
+    record_test(f'{prefix}:current', 'Single current row per natural key', len(duplicate_current) == 0)
+    stale_history = session.sql(f"""
+        SELECT history.employee_id
+        FROM learning_db.dw.{TABLE_NAME} history
+        JOIN learning_db.dw.{TABLE_NAME} current_rows
+            ON history.employee_id = current_rows.employee_id AND current_rows.current_row_flag = 1
+        WHERE history.current_row_flag = 0
+        AND (history.first_name IS DISTINCT FROM current_rows.first_name OR history.last_name IS DISTINCT FROM current_rows.last_name)
+    """).collect()
+    record_test(f'{prefix}:type1', 'Type 1 columns propagated to history', len(stale_history) == 0)
+
+
+def check_step(session: LocalSession, configuration_name: str, step_name: str) -> None:
+    """Step-specific checks from the notebook."""
+    prefix = f'{configuration_name}:{step_name}'
+    if step_name == '4.1_type_1_change':
+        record_test(prefix, 'Type 1 change - no historical row created', count(session) == 2)
+    elif step_name == '4.2_idempotency':
+        record_test(prefix, 'Type 2 idempotency - no duplicates on rerun', count(session) == 2)
+    elif step_name == '4.3_type_2_change':
+        record_test(prefix, 'Type 2 change - new row created (3 total)', count(session) == 3 and count(session, 'current_row_flag = 1') == 2)
+    elif step_name == '4.4_type_1_history':
+        record_test(prefix, 'Type 1 historical update - all rows updated', count(session, "first_name = 'John'") == 2)
+    elif step_name == '4.5_simultaneous':
+        record_test(prefix, 'Simultaneous change - Type 1 applied to all rows', count(session, "employee_id = 1 AND last_name = 'Johnson'") == count(session, 'employee_id = 1'))
+        record_test(f'{prefix}b', 'Simultaneous change - Type 2 created new current row', count(session, "employee_id = 1 AND current_row_flag = 1 AND department = 'Marketing'") == 1)
+    elif step_name == '4.6_history_chain':
+        record_test(prefix, 'Multiple Type 2 changes - historical chain created', count(session, 'employee_id = 1 AND current_row_flag = 0') >= 2)
+    elif step_name == '5.1_nulls':
+        record_test(prefix, 'NULL handling - records inserted', count(session, 'employee_id IN (97, 98, 99)') == 3)
+    elif step_name == 'soft_delete':
+        record_test(prefix, 'Soft delete - no current row left', count(session, 'employee_id IN (1, 2) AND current_row_flag = 1') == 0)
+    elif step_name == 'reactivate_type_1_change':
+        record_test(prefix, 'Re-activated key - new current row', count(session, 'employee_id IN (1, 2) AND current_row_flag = 1 AND is_deleted = 0') == 2)
+        record_test(f'{prefix}b', 'Re-activated key - Type 1 change applied to history', count(session, "employee_id = 2 AND first_name = 'Jillian'") == count(session, 'employee_id = 2'))
+
+
+def run_configuration(configuration_name: str, options: dict) -> list:
+    """Run every step with one configuration, one day apart.
+
+    Returns:
+        list: (summary, snapshot) after each step
+    """
+    session = LocalSession(current_datetime=datetime(2024, 1, 1, 12))
+    create_objects(session)
+    results = []
+    for step_number, (step_name, change_sql) in enumerate(STEPS):
+        if change_sql:
+            session.sql(change_sql).collect()
+        session.current_datetime = datetime(2024, 1, 1, 12) + timedelta(days=step_number)
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = main(session, TABLE_NAME, f'batch_{step_number}', type_1_column_names=TYPE_1_COLUMN_NAMES, enable_deletes=True, delete_mode='soft', record_run_metrics=False, **options)
+        check_step(session, configuration_name, step_name)
+        check_invariants(session, configuration_name, step_name)
+        results.append((summary.split(' — ', 1)[1], snapshot(session)))
+    session.close()
+    return results
+
+
+if __name__ == '__main__':
+    baseline_name, *other_names = CONFIGURATIONS
+    baseline_results = run_configuration(baseline_name, CONFIGURATIONS[baseline_name])
+    for configuration_name in other_names:
+        results = run_configuration(configuration_name, CONFIGURATIONS[configuration_name])
+        for (step_name, _), (baseline_summary, baseline_rows), (summary, rows) in zip(STEPS, baseline_results, results):
+            record_test(f'{configuration_name}:{step_name}:parity', f'Same summary and table as {baseline_name}', summary == baseline_summary and rows == baseline_rows, '' if rows == baseline_rows else f'{summary} vs {baseline_summary}')
+
+    failed = [result for result in test_results if not result['passed']]
+    print(f'\n{len(test_results) - len(failed)}/{len(test_results)} checks passed')
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,140 @@
+"""
+Parallel Table Runner Checks (Offline)
+
+Runs run_tables() with a fake session factory and a fake table_runner (a sleep standing in for a TableUpdater
+pipeline), so the scheduling is checked without Snowflake or DuckDB:
+
+- Sessions: one per worker thread, reused for every table that worker picks up, closed at the end
+- Concurrency: up to max_workers tables in flight, and the run takes about tables / workers rounds
+- Results: input order, per-table worker and timings, main() kwargs passed through
+- Errors: a failing table is captured in its result and doesn't stop the others
+
+LocalSession can't back this: it is one DuckDB connection per session, a second session can't attach the same
+database file, and primary keys only live in each session's memory.
+
+Usage:
+    python test/etl/table_runner_local.py
+"""
+
+import contextlib
+import io
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.etl.common.table_runner import run_tables
+
+TABLE_SECONDS = 0.2
+MAX_WORKERS = 4
+TABLES = [f'dim_table_{table_number}' for table_number in range(8)] + [
+    'dim_broken',
+    {'table_name': 'dim_with_options', 'type_1_column_names': 'email'}
+]
+
+test_results = []
+
+
+def record_test(test_id: str, test_name: str, passed: bool, details: str = ""):
+    """Record a test result"""
+    status = "PASS" if passed else "FAIL"
+    test_results.append({"test_id": test_id, "test_name": test_name, "passed": passed, "status": status, "details": details})
+    print(f"[{status}] {test_id}: {test_name}" + (f" - {details}" if details else ""))
+
+
+class FakeSession:
+    created: list['FakeSession'] = []
+    created_lock = threading.Lock()
+
+    def __init__(self):
+        """Stand-in session that remembers which threads used it and whether it was closed."""
+        self.thread_names: set[str] = set()
+        self.closed = False
+        with FakeSession.created_lock:
+            FakeSession.created.append(self)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeTableRunner:
+    def __init__(self):
+        """Stand-in for table_updater.main that sleeps, tracks concurrency and fails for dim_broken."""
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, session: FakeSession, table_name: str, **kwargs) -> str:
+        session.thread_names.add(threading.current_thread().name)
+        with self._lock:
+            self.calls[table_name] = kwargs
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(TABLE_SECONDS)
+            if table_name == 'dim_broken':
+                raise RuntimeError(f'View missing for {table_name}')
+            return f'{table_name} completed — 1 inserts, 0 updates, 0 type2 changes'
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def run(close_sessions: bool = True, use_metadata_cache: bool = False):
+    FakeSession.created = []
+    table_runner = FakeTableRunner()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = run_tables(FakeSession, TABLES, max_workers=MAX_WORKERS, use_metadata_cache=use_metadata_cache, close_sessions=close_sessions, table_runner=table_runner)
+    return result, table_runner
+
+
+def check_sessions() -> None:
+    result, _ = run()
+    sessions = FakeSession.created
+    record_test('sessions:count', f'At most {MAX_WORKERS} sessions (one per worker)', 0 < len(sessions) <= MAX_WORKERS, str(len(sessions)))
+    record_test('sessions:per_worker', 'Each session used by a single worker thread', all(len(session.thread_names) == 1 for session in sessions), str([session.thread_names for session in sessions]))
+    worker_names = [next(iter(session.thread_names)) for session in sessions]
+    record_test('sessions:unique_workers', 'No worker created two sessions', len(worker_names) == len(set(worker_names)))
+    record_test('sessions:reused', 'Sessions reused across tables', len(sessions) < len(TABLES), f'{len(sessions)} sessions for {len(TABLES)} tables')
+    record_test('sessions:closed', 'Sessions closed after the run', all(session.closed for session in sessions))
+    result_workers = {table.worker_name for table in result.results}
+    record_test('sessions:result_workers', 'Result worker names match the session threads', result_workers == set(worker_names), f'{result_workers} vs {set(worker_names)}')
+
+    run(close_sessions=False)
+    record_test('sessions:kept_open', 'close_sessions=False leaves sessions open', not any(session.closed for session in FakeSession.created))
+
+
+def check_concurrency_and_timings() -> None:
+    result, table_runner = run()
+    record_test('concurrency:max_in_flight', f'{MAX_WORKERS} tables in flight at once', table_runner.max_in_flight == MAX_WORKERS, str(table_runner.max_in_flight))
+    rounds = -(-len(TABLES) // MAX_WORKERS)
+    record_test('concurrency:wall_time', f'Run takes about {rounds} rounds, not {len(TABLES)}', result.duration_seconds < (rounds + 1) * TABLE_SECONDS, f'{result.duration_seconds:.2f}s')
+    record_test('timings:durations', 'Per-table duration covers the table run', all(TABLE_SECONDS * 0.9 <= table.duration_seconds < TABLE_SECONDS * 3 for table in result.results), str([round(table.duration_seconds, 2) for table in result.results]))
+    record_test('timings:start_times', 'Start times within the run', all(0 <= table.start_time <= result.duration_seconds for table in result.results))
+    late_starts = [table for table in result.results if table.start_time >= TABLE_SECONDS * 0.9]
+    record_test('timings:queued', 'Tables beyond the first round start after a table finished', len(late_starts) == len(TABLES) - MAX_WORKERS, str(len(late_starts)))
+
+
+def check_results_and_errors() -> None:
+    result, table_runner = run(use_metadata_cache=True)
+    table_names = [table if isinstance(table, str) else table['table_name'] for table in TABLES]
+    record_test('results:order', 'Results in input order', [table.table_name for table in result.results] == table_names)
+    record_test('results:max_workers', 'max_workers recorded', result.max_workers == MAX_WORKERS)
+    failed = result.failed
+    record_test('errors:captured', 'Failing table captured with its error', [table.table_name for table in failed] == ['dim_broken'] and failed[0].error == 'View missing for dim_broken' and failed[0].summary is None, str([(table.table_name, table.error) for table in failed]))
+    record_test('errors:others_succeed', 'Other tables still succeed', len(result.succeeded) == len(TABLES) - 1 and all(table.summary and table.error is None for table in result.succeeded))
+    record_test('results:kwargs', 'Table options passed through to main()', table_runner.calls['dim_with_options'] == {'type_1_column_names': 'email', 'use_metadata_cache': True}, str(table_runner.calls['dim_with_options']))
+    record_test('results:to_dict', 'to_dict() covers every table', len(result.to_dict()['results']) == len(TABLES))
+
+
+if __name__ == '__main__':
+    check_sessions()
+    check_concurrency_and_timings()
+    check_results_and_errors()
+
+    failed = [result for result in test_results if not result['passed']]
+    print(f'\n{len(test_results) - len(failed)}/{len(test_results)} checks passed')
+    sys.exit(1 if failed else 0)
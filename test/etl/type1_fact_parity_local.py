@@ -0,0 +1,256 @@
+"""
+Type 1 Dimension and Fact Parity Checks (Local)
+
+Runs a dim_type_1 table and a fact table (composite natural key) through the same source changes on a local DuckDB
+LocalSession, once per TableUpdater configuration. Configurations are compared within their group: after every step
+each table must be identical to the group's first configuration (surrogate keys excluded, since they depend on insert
+order), and must match the ETL view (every view row loaded; with deletes enabled, nothing else left active).
+
+A resume check interrupts a chunked initial load partway through and re-runs the batch: the resumed run must report
+the same change counts as an uninterrupted one, including the chunks completed by the failed attempt.
+
+Natural keys are deliberately multi-character (employee_id, pay_period): TableUpdater filters insert_columns with a
+substring test against the surrogate key name, which would drop one-letter column names.
+
+Usage:
+    python test/etl/type1_fact_parity_local.py
+"""
+
+import contextlib
+import io
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.etl.common.local_session import LocalSession
+from src.etl.common.table_updater import TableUpdater, main
+
+# Target table -> (natural key columns, business columns)
+TABLES = {
+    'dim_employee_type_1': (['employee_id'], ['first_name', 'department']),
+    'fact_employee_pay': (['employee_id', 'pay_period'], ['pay_amount', 'pay_status'])
+}
+SOURCE_TABLES = {
+    'dim_employee_type_1': 'learning_db.src.source_employee',
+    'fact_employee_pay': 'learning_db.src.source_employee_pay'
+}
+
+# Configurations compared against the first one of their group (deletes change the table, so they get their own group)
+CONFIGURATION_GROUPS = {
+    'upserts': {
+        'staged': {'execution_mode': 'staged'},
+        'fused': {'execution_mode': 'fused'},
+        'staged_chunked': {'execution_mode': 'staged', 'chunk_count': 3},
+        'fused_chunked': {'execution_mode': 'fused', 'chunk_count': 3},
+        'staged_watermark': {'execution_mode': 'staged', 'watermark_column': 'modified_at'},
+        'fused_watermark': {'execution_mode': 'fused', 'watermark_column': 'modified_at'}
+    },
+    'soft_deletes': {
+        'staged_soft_delete': {'execution_mode': 'staged', 'enable_deletes': True, 'delete_mode': 'soft'},
+        'fused_soft_delete': {'execution_mode': 'fused', 'enable_deletes': True, 'delete_mode': 'soft'},
+        'staged_chunked_soft_delete': {'execution_mode': 'staged', 'chunk_count': 3, 'enable_deletes': True, 'delete_mode': 'soft'},
+        'fused_chunked_soft_delete': {'execution_mode': 'fused', 'chunk_count': 3, 'enable_deletes': True, 'delete_mode': 'soft'}
+    }
+}
+
+# (step name, source changes applied before the run) - every change moves modified_at forward for the watermark runs
+STEPS = [
+    ('initial_load', [
+        "INSERT INTO learning_db.src.source_employee SELECT i, 'first_' || i, 'dept_' || (i % 7), TIMESTAMP '2024-01-01' FROM range(1, 301) r(i)",
+        "INSERT INTO learning_db.src.source_employee_pay SELECT i, p, i * 10 + p, 'paid', TIMESTAMP '2024-01-01' FROM range(1, 301) r(i), range(1, 3) q(p)"
+    ]),
+    ('updates', [
+        "UPDATE learning_db.src.source_employee SET first_name = first_name || '_v2', modified_at = TIMESTAMP '2024-01-02' WHERE employee_id % 5 = 0",
+        "UPDATE learning_db.src.source_employee_pay SET pay_amount = pay_amount + 1, modified_at = TIMESTAMP '2024-01-02' WHERE employee_id % 4 = 0 AND pay_period = 2"
+    ]),
+    ('idempotency', []),
+    ('inserts_updates_nulls', [
+        "INSERT INTO learning_db.src.source_employee SELECT i, CASE WHEN i % 2 = 0 THEN NULL ELSE 'first_' || i END, 'dept_new', TIMESTAMP '2024-01-04' FROM range(301, 321) r(i)",
+        "UPDATE learning_db.src.source_employee SET department = NULL, modified_at = TIMESTAMP '2024-01-04' WHERE employee_id % 11 = 0",
+        "INSERT INTO learning_db.src.source_employee_pay SELECT i, 3, i * 10 + 3, NULL, TIMESTAMP '2024-01-04' FROM range(1, 301) r(i) WHERE i % 3 = 0",
+        "UPDATE learning_db.src.source_employee_pay SET pay_status = 'adjusted', modified_at = TIMESTAMP '2024-01-04' WHERE employee_id % 6 = 0 AND pay_period = 1"
+    ]),
+    ('deletes', [
+        "DELETE FROM learning_db.src.source_employee WHERE employee_id % 13 = 0",
+        "DELETE FROM learning_db.src.source_employee_pay WHERE employee_id % 13 = 0 AND pay_period = 1"
+    ]),
+    ('reinserts', [
+        "INSERT INTO learning_db.src.source_employee SELECT i, 'first_' || i || '_back', 'dept_' || (i % 7), TIMESTAMP '2024-01-06' FROM range(13, 301, 26) r(i)",
+        "INSERT INTO learning_db.src.source_employee_pay SELECT i, 1, i * 10 + 1, 'paid', TIMESTAMP '2024-01-06' FROM range(13, 301, 26) r(i)"
+    ]),
+    ('final_idempotency', [])
+]
+
+test_results = []
+
+
+def record_test(test_id: str, test_name: str, passed: bool, details: str = ""):
+    """Record a test result"""
+    status = "PASS" if passed else "FAIL"
+    test_results.append({"test_id": test_id, "test_name": test_name, "passed": passed, "status": status, "details": details})
+    print(f"[{status}] {test_id}: {test_name}" + (f" - {details}" if details else ""))
+
+
+def create_objects(session: LocalSession) -> None:
+    """Source tables, target tables (with soft delete columns) and ETL views."""
+    session.sql("""
+    CREATE TABLE learning_db.src.source_employee (
+        employee_id BIGINT,
+        first_name STRING,
+        department STRING,
+        modified_at TIMESTAMP_NTZ
+    )""").collect()
+    session.sql("""
+    CREATE TABLE learning_db.src.source_employee_pay (
+        employee_id BIGINT,
+        pay_period BIGINT,
+        pay_amount NUMBER(18, 2),
+        pay_status STRING,
+        modified_at TIMESTAMP_NTZ
+    )""").collect()
+    column_types = {'employee_id': 'BIGINT', 'pay_period': 'BIGINT', 'first_name': 'STRING', 'department': 'STRING', 'pay_amount': 'NUMBER(18, 2)', 'pay_status': 'STRING'}
+    for table_name, (natural_keys, business_columns) in TABLES.items():
+        session.sql(f"""
+        CREATE TABLE learning_db.dw.{table_name} (
+            {table_name}_key BIGINT AUTOINCREMENT,
+            {', '.join([f'{column_name} {column_types[column_name]}' for column_name in natural_keys + business_columns])},
+            etl_row_hash_value STRING,
+            is_deleted INT,
+            deleted_batch_name STRING,
+            create_username STRING,
+            create_datetime TIMESTAMP_NTZ,
+            create_batch_name STRING,
+            last_update_username STRING,
+            last_update_datetime TIMESTAMP_NTZ,
+            last_update_batch_name STRING
+        )""").collect()
+        session.sql(f"ALTER TABLE learning_db.dw.{table_name} ADD CONSTRAINT pk_{table_name} PRIMARY KEY ({', '.join(natural_keys)})").collect()
+        hash_inputs = ', '.join([f"COALESCE(CAST({column_name} as STRING), '|')" for column_name in business_columns])
+        session.sql(f"""
+        CREATE OR REPLACE VIEW learning_db.etl.vw_{table_name} AS
+        SELECT
+            {', '.join(natural_keys + business_columns)},
+            modified_at,
+            SHA1(CONCAT_WS('|', {hash_inputs})) AS etl_row_hash_value
+        FROM {SOURCE_TABLES[table_name]}
+        """).collect()
+
+
+def snapshot(session: LocalSession, table_name: str) -> list:
+    """Target rows without the surrogate key, in a stable order."""
+    natural_keys = TABLES[table_name][0]
+    return [tuple(row)[1:] for row in session.sql(f"SELECT * FROM learning_db.dw.{table_name} ORDER BY {', '.join(natural_keys)}").collect()]
+
+
+def check_against_view(session: LocalSession, configuration_name: str, step_name: str, table_name: str, options: dict) -> None:
+    """Checks that hold after every step: unique natural keys, the view fully loaded, and (with deletes) nothing extra active."""
+    prefix = f'{configuration_name}:{step_name}:{table_name}'
+    natural_keys, business_columns = TABLES[table_name]
+    key_list = ', '.join(natural_keys)
+    duplicates = session.sql(f'SELECT {key_list} FROM learning_db.dw.{table_name} GROUP BY {key_list} HAVING COUNT(*) > 1').collect()
+    record_test(f'{prefix}:unique', 'Single row per natural key', len(duplicates) == 0, str(duplicates[:5]) if duplicates else '')
+
+    columns = ', '.join(natural_keys + business_columns + ['etl_row_hash_value'])
+    missing = session.sql(f"""
+        SELECT {columns} FROM learning_db.etl.vw_{table_name}
+        EXCEPT
+        SELECT {columns} FROM learning_db.dw.{table_name} WHERE COALESCE(is_deleted, 0) = 0
+    """).collect()
+    record_test(f'{prefix}:loaded', 'Every view row loaded and active', len(missing) == 0, str(missing[:5]) if missing else '')
+
+    if options.get('enable_deletes'):
+        extra = session.sql(f"""
+            SELECT {columns} FROM learning_db.dw.{table_name} WHERE COALESCE(is_deleted, 0) = 0
+            EXCEPT
+            SELECT {columns} FROM learning_db.etl.vw_{table_name}
+        """).collect()
+        record_test(f'{prefix}:deleted', 'No active rows missing from the view', len(extra) == 0, str(extra[:5]) if extra else '')
+
+
+def run_configuration(configuration_name: str, options: dict) -> list:
+    """Run every step with one configuration, one day apart.
+
+    Returns:
+        list: {table_name: (summary, snapshot)} after each step
+    """
+    session = LocalSession(current_datetime=datetime(2024, 1, 1, 12))
+    create_objects(session)
+    results = []
+    for step_number, (step_name, change_statements) in enumerate(STEPS):
+        for change_sql in change_statements:
+            session.sql(change_sql).collect()
+        session.current_datetime = datetime(2024, 1, 1, 12) + timedelta(days=step_number)
+        step_results = {}
+        for table_name in TABLES:
+            with contextlib.redirect_stdout(io.StringIO()):
+                summary = main(session, table_name, f'batch_{step_number}', **options)
+            check_against_view(session, configuration_name, step_name, table_name, options)
+            step_results[table_name] = (summary.split(' — ', 1)[1], snapshot(session, table_name))
+        results.append(step_results)
+    session.close()
+    return results
+
+
+def check_resumed_counts(execution_mode: str) -> None:
+    """Fail the third chunk of a chunked initial load, then resume the batch and compare with an uninterrupted run."""
+    upsert_phase = 'process_fused_upserts' if execution_mode == 'fused' else 'process_table_inserts'
+    original_phase = getattr(TableUpdater, upsert_phase)
+    options = {'execution_mode': execution_mode, 'chunk_count': 4}
+    for table_name in TABLES:
+        summaries = {}
+        for run_name in ['uninterrupted', 'resumed']:
+            session = LocalSession(current_datetime=datetime(2024, 1, 1, 12))
+            create_objects(session)
+            for change_sql in STEPS[0][1]:
+                session.sql(change_sql).collect()
+            if run_name == 'resumed':
+                phase_calls = []
+
+                def failing_phase(self):
+                    phase_calls.append(self.current_chunk)
+                    if len(phase_calls) == 3:
+                        raise RuntimeError('Injected chunk failure')
+                    return original_phase(self)
+
+                setattr(TableUpdater, upsert_phase, failing_phase)
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        main(session, table_name, 'batch_0', **options)
+                except RuntimeError:
+                    pass
+                finally:
+                    setattr(TableUpdater, upsert_phase, original_phase)
+            with contextlib.redirect_stdout(io.StringIO()):
+                summaries[run_name] = main(session, table_name, 'batch_0', **options).split(' — ', 1)[1]
+            session.close()
+        record_test(
+            f'{execution_mode}_resumed:initial_load:{table_name}:counts',
+            'Resumed batch reports the counts of an uninterrupted run',
+            summaries['resumed'] == summaries['uninterrupted'],
+            f"{summaries['resumed']} vs {summaries['uninterrupted']}"
+        )
+
+
+if __name__ == '__main__':
+    for group_name, configurations in CONFIGURATION_GROUPS.items():
+        baseline_name, *other_names = configurations
+        baseline_results = run_configuration(baseline_name, configurations[baseline_name])
+        for configuration_name in other_names:
+            results = run_configuration(configuration_name, configurations[configuration_name])
+            for (step_name, _), baseline_step, step in zip(STEPS, baseline_results, results):
+                for table_name in TABLES:
+                    (baseline_summary, baseline_rows), (summary, rows) = baseline_step[table_name], step[table_name]
+                    record_test(
+                        f'{configuration_name}:{step_name}:{table_name}:parity',
+                        f'Same summary and table as {baseline_name}',
+                        summary == baseline_summary and rows == baseline_rows,
+                        '' if rows == baseline_rows else f'{summary} vs {baseline_summary}'
+                    )
+    for execution_mode in ['staged', 'fused']:
+        check_resumed_counts(execution_mode)
+
+    failed = [result for result in test_results if not result['passed']]
+    print(f'\n{len(test_results) - len(failed)}/{len(test_results)} checks passed')
+    sys.exit(1 if failed else 0)
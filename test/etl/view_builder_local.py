@@ -0,0 +1,191 @@
+"""
+View Builder Checks (Local)
+
+Checks the ETL view helpers in src/etl/common/view_builder.py against TableMetadata fixtures:
+
+- classify_columns: the natural key / Type 1 / Type 2 split, and the declarations it rejects
+- build_view_sql: hash columns per table type, casts only on non-string inputs, and (on a local DuckDB LocalSession)
+  the same etl_row_hash_value as a hand-written view
+- validate_view_hashes: a correct view passes; a Type 1/Type 2 swap, a hashed natural key and a missing hash are
+  errors; a needless CAST is a warning; implicit aliases (no AS) are recognized
+
+Usage:
+    python test/etl/view_builder_local.py
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.etl.common.local_session import LocalSession
+from src.etl.common.table_metadata import TableMetadata
+from src.etl.common.view_builder import build_view_sql, classify_columns, validate_view_hashes
+
+AUDIT_COLUMNS = ['create_username', 'create_datetime', 'create_batch_name', 'last_update_username', 'last_update_datetime', 'last_update_batch_name']
+COLUMN_TYPES = {'employee_id': 'NUMBER', 'pay_period': 'NUMBER', 'first_name': 'TEXT', 'last_name': 'TEXT', 'department': 'TEXT', 'salary': 'NUMBER', 'pay_amount': 'NUMBER'}
+
+test_results = []
+
+
+def record_test(test_id: str, test_name: str, passed: bool, details: str = ""):
+    """Record a test result"""
+    status = "PASS" if passed else "FAIL"
+    test_results.append({"test_id": test_id, "test_name": test_name, "passed": passed, "status": status, "details": details})
+    print(f"[{status}] {test_id}: {test_name}" + (f" - {details}" if details else ""))
+
+
+def table_metadata(table_name: str, natural_keys: list[str], business_columns: list[str], etl_columns: list[str]) -> TableMetadata:
+    """Fixture for a target table laid out like the ones in the DDL notebooks."""
+    return TableMetadata(
+        database_name='learning_db',
+        schema_name='dw',
+        etl_schema_name='etl',
+        table_name=table_name,
+        current_username='etl_user',
+        current_datetime_cst=datetime(2024, 1, 1, 12),
+        table_exists=True,
+        view_exists=True,
+        table_columns=[f'{table_name}_key'] + natural_keys + business_columns + etl_columns + AUDIT_COLUMNS,
+        natural_keys=natural_keys
+    )
+
+
+DIM_TYPE_1 = table_metadata('dim_employee', ['employee_id'], ['first_name', 'department'], ['etl_row_hash_value'])
+DIM_TYPE_2 = table_metadata(
+    'dim_employee_type_2',
+    ['employee_id'],
+    ['first_name', 'last_name', 'department', 'salary'],
+    ['etl_row_hash_value', 'etl_row_hash_value_2', 'row_effective_date', 'row_expiration_date', 'current_row_flag']
+)
+FACT = table_metadata('fact_employee_pay', ['employee_id', 'pay_period'], ['pay_amount'], ['etl_row_hash_value', 'is_deleted', 'deleted_batch_name'])
+
+
+def raises_assertion(function, *args) -> str | None:
+    """Assertion message of function(*args), or None if it didn't raise AssertionError."""
+    try:
+        function(*args)
+    except AssertionError as e:
+        return str(e)
+    return None
+
+
+def check_classify_columns() -> None:
+    classification = classify_columns(DIM_TYPE_1)
+    record_test('classify:dim_type_1', 'dim_type_1 hashes every business column', classification.table_type == 'dim_type_1' and classification.natural_keys == ['employee_id'] and classification.hash_columns == ['first_name', 'department'] and classification.hash_columns_2 == [], str(classification))
+
+    classification = classify_columns(DIM_TYPE_2, 'department,salary', 'first_name, last_name')
+    record_test('classify:dim_type_2', 'dim_type_2 split into Type 1 and Type 2 hashes', classification.hash_columns == ['first_name', 'last_name'] and classification.hash_columns_2 == ['department', 'salary'], str(classification))
+    record_test('classify:dim_type_2_list', 'Type 2 columns accepted as a list', classify_columns(DIM_TYPE_2, ['Department', 'salary']) == classification)
+    record_test('classify:view_columns', 'View columns in table order', classification.view_columns == ['employee_id', 'first_name', 'last_name', 'department', 'salary'], str(classification.view_columns))
+
+    classification = classify_columns(FACT)
+    record_test('classify:fact', 'Fact hashes exclude the composite natural key and soft delete columns', classification.natural_keys == ['employee_id', 'pay_period'] and classification.hash_columns == ['pay_amount'], str(classification))
+
+    record_test('classify:type_2_required', 'dim_type_2 requires Type 2 columns', raises_assertion(classify_columns, DIM_TYPE_2) is not None)
+    record_test('classify:type_2_on_type_1', 'Type 2 columns rejected for dim_type_1', raises_assertion(classify_columns, DIM_TYPE_1, 'department') is not None)
+    overlap_error = raises_assertion(classify_columns, DIM_TYPE_2, 'department,salary', 'first_name,last_name,salary')
+    record_test('classify:overlap', 'Column declared both Type 1 and Type 2 rejected', overlap_error is not None and "['salary']" in overlap_error, str(overlap_error))
+    unclassified_error = raises_assertion(classify_columns, DIM_TYPE_2, 'department,salary', 'first_name')
+    record_test('classify:unclassified', 'Column neither Type 1 nor Type 2 rejected', unclassified_error is not None and "['last_name']" in unclassified_error, str(unclassified_error))
+    record_test('classify:unknown', 'Natural key declared as Type 2 rejected', raises_assertion(classify_columns, DIM_TYPE_2, 'employee_id') is not None)
+
+
+def check_build_view_sql() -> None:
+    classification = classify_columns(DIM_TYPE_2, 'department,salary')
+    view_sql = build_view_sql(classification, 'learning_db.src.source_employee', COLUMN_TYPES)
+    record_test('build:name', 'View named vw_{table_name} in the ETL schema', view_sql.startswith('CREATE OR REPLACE VIEW learning_db.etl.vw_dim_employee_type_2 AS'))
+    record_test('build:hashes', 'Both hash columns for dim_type_2', 'AS etl_row_hash_value\n' in view_sql and 'AS etl_row_hash_value_2\n' in view_sql)
+    record_test('build:string_casts', 'String columns not cast', 'CAST(first_name' not in view_sql and 'CAST(department' not in view_sql)
+    record_test('build:number_casts', 'Number columns cast to STRING', 'CAST(salary AS STRING)' in view_sql)
+    record_test('build:no_types', 'Every column cast without column types', 'CAST(first_name AS STRING)' in build_view_sql(classification, 'learning_db.src.source_employee'))
+    result = validate_view_hashes(view_sql, classification, COLUMN_TYPES)
+    record_test('build:validates', 'Built view passes validate_view_hashes without warnings', result.is_valid and not result.warnings, str(result))
+
+    hash_sql = build_view_sql(classify_columns(FACT), 'learning_db.src.source_employee_pay', algorithm='hash')
+    record_test('build:hash_algorithm', "algorithm='hash' uses HASH() and no CONCAT_WS", 'HASH(pay_amount) AS etl_row_hash_value' in hash_sql and 'CONCAT_WS' not in hash_sql, hash_sql.splitlines()[-2].strip())
+
+    # Skipping the CAST on string columns must not change the hash of a hand-written view
+    session = LocalSession()
+    session.sql("""
+    CREATE TABLE learning_db.src.source_employee (
+        employee_id BIGINT,
+        first_name STRING,
+        department STRING
+    )""").collect()
+    session.sql("INSERT INTO learning_db.src.source_employee VALUES (1, 'ann', 'sales'), (2, NULL, 'hr'), (3, 'bo', NULL)").collect()
+    session.sql(build_view_sql(classify_columns(DIM_TYPE_1), 'learning_db.src.source_employee', COLUMN_TYPES)).collect()
+    different = session.sql("""
+        SELECT employee_id, etl_row_hash_value FROM learning_db.etl.vw_dim_employee
+        EXCEPT
+        SELECT employee_id, SHA1(CONCAT_WS('|', COALESCE(CAST(first_name as STRING), '|'), COALESCE(CAST(department as STRING), '|')))
+        FROM learning_db.src.source_employee
+    """).collect()
+    record_test('build:hand_written_hash', 'Same etl_row_hash_value as a hand-written view', len(different) == 0, str(different))
+    session.close()
+
+
+def check_validate_view_hashes() -> None:
+    classification = classify_columns(DIM_TYPE_2, 'department,salary', 'first_name,last_name')
+
+    swapped_sql = """
+    SELECT employee_id, first_name, last_name, department, salary,
+        SHA1(CONCAT_WS('|', COALESCE(first_name, '|'), COALESCE(department, '|'))) AS etl_row_hash_value,
+        SHA1(CONCAT_WS('|', COALESCE(last_name, '|'), COALESCE(CAST(salary AS STRING), '|'))) AS etl_row_hash_value_2
+    FROM learning_db.src.source_employee
+    """
+    result = validate_view_hashes(swapped_sql, classification)
+    record_test(
+        'validate:swap',
+        'Type 1/Type 2 swap reported in both hashes',
+        not result.is_valid
+        and "etl_row_hash_value includes 'department', which belongs to etl_row_hash_value_2" in result.errors
+        and "etl_row_hash_value_2 includes 'last_name', which belongs to etl_row_hash_value" in result.errors
+        and "etl_row_hash_value does not include 'last_name'" in result.errors,
+        str(result.errors)
+    )
+
+    natural_key_sql = """
+    SELECT employee_id, pay_period, pay_amount,
+        SHA1(CONCAT_WS('|', COALESCE(CAST(employee_id AS STRING), '|'), COALESCE(CAST(pay_amount AS STRING), '|'))) AS etl_row_hash_value
+    FROM learning_db.src.source_employee_pay
+    """
+    result = validate_view_hashes(natural_key_sql, classify_columns(FACT))
+    record_test('validate:natural_key', 'Hashed natural key reported', result.errors == ["etl_row_hash_value includes natural key 'employee_id'"], str(result.errors))
+
+    cast_sql = """
+    SELECT employee_id, first_name, department,
+        SHA1(CONCAT_WS('|', COALESCE(CAST(first_name AS STRING), '|'), COALESCE(department::VARCHAR, '|'))) AS etl_row_hash_value
+    FROM learning_db.src.source_employee
+    """
+    result = validate_view_hashes(cast_sql, classify_columns(DIM_TYPE_1), COLUMN_TYPES)
+    record_test('validate:needless_cast', 'Needless CASTs are warnings, not errors', result.is_valid and len(result.warnings) == 2 and all('CAST is not needed' in warning for warning in result.warnings), str(result.warnings))
+    record_test('validate:cast_without_types', 'No cast warnings without column types', not validate_view_hashes(cast_sql, classify_columns(DIM_TYPE_1)).warnings)
+
+    implicit_alias_sql = """
+    SELECT employee_id, first_name, last_name, department, salary,
+        SHA1(CONCAT_WS('|', COALESCE(first_name, '|'), COALESCE(last_name, '|'))) etl_row_hash_value,
+        SHA1(CONCAT_WS('|', COALESCE(department, '|'), COALESCE(CAST(salary AS STRING), '|'))) etl_row_hash_value_2
+    FROM learning_db.src.source_employee
+    """
+    result = validate_view_hashes(implicit_alias_sql, classification)
+    record_test('validate:implicit_alias', 'Hashes aliased without AS found', result.is_valid, str(result.errors))
+
+    missing_sql = """
+    SELECT employee_id, first_name, department, salary, etl_row_hash_value_2,
+        SHA1(CONCAT_WS('|', COALESCE(first_name, '|'), COALESCE(last_name, '|'))) AS etl_row_hash_value
+    FROM learning_db.src.source_employee
+    """
+    result = validate_view_hashes(missing_sql, classification)
+    record_test('validate:missing', 'Hash column selected as a plain column is missing', result.errors == ['etl_row_hash_value_2 is missing from the view'], str(result.errors))
+
+
+if __name__ == '__main__':
+    check_classify_columns()
+    check_build_view_sql()
+    check_validate_view_hashes()
+
+    failed = [result for result in test_results if not result['passed']]
+    print(f'\n{len(test_results) - len(failed)}/{len(test_results)} checks passed')
+    sys.exit(1 if failed else 0)
@@ -433,53 +433,66 @@ class TableUpdater:
         self._log(f'table inserts result: {self._format_df_result(execution_results)}')
 
 
-    def process_table_deletes(self):
+    def process_table_deletes(self, max_delete_percentage: float | None = None) -> int:
         """Delete records from fact tables that no longer exist in source view.
 
-        Only runs for fact tables. Creates a staging table of records to delete,
-        then performs correlated subquery delete if any records found.
+        Only runs for fact tables. Detection and deletion happen in one anti-join DELETE
+        (NOT EXISTS against the ETL view) and the count comes from the DELETE result, so no
+        _deletes staging table is needed. With max_delete_percentage, the rows matching the
+        delete predicate are counted first and the delete is aborted if too large a share of the
+        table would be removed.
 
         Fact tables may have records deleted from source systems that should
         be removed from the data warehouse to maintain data accuracy.
+
+        Args:
+            max_delete_percentage: Optional max percentage of target rows to delete (None disables the check)
+
+        Returns:
+            Number of deleted records
+
+        Raises:
+            RuntimeError: If the delete percentage exceeds max_delete_percentage
         """
         # Assert table type is fact - dimensions should not be deleted
         assert self.table_type == 'fact', f"Delete processing only supported for fact tables, not {self.table_type}"
 
-        # Create deletes staging table - records in target but not in source view
-        deletes_table_name = f'{self.database_name}.{self.etl_schema_name}.{self.table_name}_deletes'
-        sql_string = f"""
-        CREATE OR REPLACE TABLE {deletes_table_name} AS
-        SELECT target.{self.table_primary_key_column_name}
-        FROM {self.full_table_name} target
-        LEFT JOIN {self.etl_view_name} source
-            ON {self.natural_key_join_string}
-        WHERE source.etl_row_hash_value IS NULL
+        # Safety check before the destructive statement - the rows to delete are counted with the delete's own
+        # predicate (comparing row counts would hide deletes behind duplicate or NULL natural keys in the view)
+        if max_delete_percentage is not None:
+            target_row_count, expected_delete_count = self.session.sql(f"""
+            SELECT
+                 (SELECT COUNT(*) FROM {self.full_table_name}) AS target_row_count
+                ,(
+                    SELECT COUNT(*) FROM {self.full_table_name} target
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM {self.etl_view_name} source
+                        WHERE {self.natural_key_join_string}
+                    )
+                ) AS delete_row_count
+            """).collect()[0]
+            delete_percentage = 100.0 * expected_delete_count / target_row_count if target_row_count else 0.0
+            self._log(f'Delete threshold check: {expected_delete_count} of {target_row_count} target rows ({delete_percentage:.2f}%, max {max_delete_percentage}%)')
+            if delete_percentage > max_delete_percentage:
+                raise RuntimeError(f'Aborting deletes on {self.full_table_name}: {expected_delete_count} of {target_row_count} rows ({delete_percentage:.2f}%) exceed max_delete_percentage={max_delete_percentage}')
+
+        # Single anti-join delete - DELETE can't alias its target, so the subquery correlates on the full table name
+        delete_sql = f"""
+        DELETE FROM {self.full_table_name}
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {self.etl_view_name} source
+            WHERE {' AND '.join([f'source.{natural_key_column_name} = {self.full_table_name}.{natural_key_column_name}' for natural_key_column_name in self.table_natural_keys_list])}
+        )
         """
-        self._log(f'table deletes identification sql string: {sql_string}')
-        execution_results = self.session.sql(sql_string).collect()
-        self._log(f'table deletes identification result: {self._format_df_result(execution_results)}')
-
-        # Check if any records to delete
-        delete_count = self.session.sql(f"SELECT COUNT(*) as record_count FROM {deletes_table_name}").collect()[0][0]
-        self._log(f'Found {delete_count} records to delete')
-
-        if delete_count > 0:
-            # Perform correlated subquery delete
-            delete_sql = f"""
-            DELETE FROM {self.full_table_name}
-            WHERE EXISTS (
-                SELECT 1 FROM {deletes_table_name} d
-                WHERE d.{self.table_primary_key_column_name} = {self.full_table_name}.{self.table_primary_key_column_name}
-            )
-            """
-            self._log(f'table deletes sql string: {delete_sql}')
-            delete_results = self.session.sql(delete_sql).collect()
-            self._log(f'table deletes result: {self._format_df_result(delete_results)}')
-        else:
-            self._log(f'No records to delete from {self.full_table_name}')
+        self._log(f'table deletes sql string: {delete_sql}')
+        delete_results = self.session.sql(delete_sql).collect()
+        self._log(f'table deletes result: {self._format_df_result(delete_results)}')
+        delete_count = int(delete_results[0].asDict().get('number of rows deleted', 0)) if delete_results else 0
+        self._log(f'Deleted {delete_count} records from {self.full_table_name}')
+        return delete_count
 
 
-def main(session, table_name: str, batch_id: str | None = None, type_1_column_names: str | None = None, enable_deletes: bool = False) -> str:
+def main(session, table_name: str, batch_id: str | None = None, type_1_column_names: str | None = None, enable_deletes: bool = False, max_delete_percentage: float | None = None) -> str:
     """Entry point for Snowflake stored procedure.
 
     Args:
@@ -488,6 +501,7 @@ def main(session, table_name: str, batch_id: str | None = None, type_1_column_na
         batch_id: Optional batch ID for traceability (auto-generated if not provided)
         type_1_column_names: Optional comma-separated Type 1 column names for Type 2 dimensions
         enable_deletes: Optional flag to enable deletion of records that no longer exist in source (fact tables only)
+        max_delete_percentage: Optional max percentage of target rows a delete may remove before the run aborts
 
     Returns:
         Summary string with insert/update/type2_change/delete counts
@@ -523,8 +537,9 @@ def main(session, table_name: str, batch_id: str | None = None, type_1_column_na
             updater.process_type1_historical_updates()
 
         # 6. Delete records that no longer exist in source (optional, fact tables only)
+        deletes_count = None
         if enable_deletes and updater.table_type == 'fact':
-            updater.process_table_deletes()
+            deletes_count = updater.process_table_deletes(max_delete_percentage)
 
         # Return a nice summary
         summary_parts = []
@@ -539,14 +554,9 @@ def main(session, table_name: str, batch_id: str | None = None, type_1_column_na
         """).collect()[0][0]
         summary_parts.append(updates_summary)
 
-        # Add delete count if deletes were enabled
-        if enable_deletes and updater.table_type == 'fact':
-            try:
-                deletes_count = session.sql(f"SELECT COUNT(*) FROM {updater.database_name}.{updater.etl_schema_name}.{table_name}_deletes").collect()[0][0]
-                summary_parts.append(f"{deletes_count} deletes")
-            except:
-                # If deletes table doesn't exist or query fails, just skip
-                pass
+        # Add delete count if deletes were enabled (taken from the DELETE result)
+        if deletes_count is not None:
+            summary_parts.append(f"{deletes_count} deletes")
 
         summary = ', '.join(summary_parts)
         updater._log(f'Completed, summary: {summary}')